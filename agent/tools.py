@@ -5,21 +5,38 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.database import get_all_jobs, search_jobs, get_job_by_id
 from typing import Optional, List
+from datetime import datetime, timedelta, timezone
 from utils.email_service import email_service
 
 @tool
 def search_jobs_tool(
     title: Optional[str] = None,
     location: Optional[str] = None,
-    num_results: int = 2
+    num_results: int = 2,
+    keywords: Optional[str] = None,
+    min_salary: Optional[int] = None,
+    max_years_experience: Optional[int] = None,
+    remote_only: Optional[bool] = None,
+    seniority_level: Optional[str] = None,
+    employment_type: Optional[str] = None,
+    posted_within_days: Optional[int] = None,
+    required_skills: Optional[List[str]] = None
 ) -> str:
     """
-    Search for jobs in the database by title and location. If not specified, search for most relevant jobs
+    Search for jobs in the database by title, location and keywords. Results are ranked by relevance
     
     Args:
         title: Job title to search for (e.g., software engineer)
         location: Location to search in (e.g., San Francisco)
         num_results: Number of jobs to return (default:2)
+        keywords: Free-text terms matched against title, company, description and location (e.g., python spark)
+        min_salary: Only jobs paying at least this much per year (e.g., 120000)
+        max_years_experience: Only jobs open to someone with this many years of experience
+        remote_only: True for remote jobs only, False for on-site only
+        seniority_level: LinkedIn seniority (e.g., Entry level, Associate, Mid-Senior level, Director)
+        employment_type: Employment type (e.g., Full-time, Contract, Part-time, Internship)
+        posted_within_days: Only jobs posted in the last N days
+        required_skills: Only jobs listing every one of these skills (e.g., ["python", "sql"])
 
     Returns:
         Formatted string with job search results
@@ -27,8 +44,19 @@ def search_jobs_tool(
 
     try:
         from data.database import search_jobs as db_search_jobs
-        print(f"🔧 Tool called with: title='{title}', location='{location}', num_results={num_results}")
-        jobs = db_search_jobs(title=title, location=location, num_jobs=num_results)
+        print(f"🔧 Tool called with: title='{title}', location='{location}', keywords='{keywords}', num_results={num_results}")
+        filters = {
+            'salary_min': min_salary,
+            'yoe_max': max_years_experience,
+            'remote': remote_only,
+            'seniority_level': seniority_level,
+            'employment_type': employment_type,
+            'skills': required_skills,
+        }
+        if posted_within_days:
+            filters['posted_since'] = datetime.now(timezone.utc) - timedelta(days=posted_within_days)
+        jobs = db_search_jobs(title=title, location=location, num_jobs=num_results, keywords=keywords,
+                              filters=filters)
         print(f"🔧 Database returned {len(jobs)} jobs")
         if not jobs:
             return f"No jobs found matching your criteria"
@@ -40,7 +68,9 @@ def search_jobs_tool(
             result += f"   Location: {job.get('location', 'N/A')}\n"
             result += f"   Type: {job.get('employment_type', 'N/A')}\n"
             result += f"   Experience: {job.get('yoe_raw', 'N/A')} years\n"
-            result += f"   Description: {job.get('description', 'N/A')[:200]}...\n"
+            if job.get('snippet'):
+                result += f"   Match: {job['snippet']}\n"
+            result += f"   Description: {(job.get('description') or 'N/A')[:200]}...\n"
             result += "-" * 50 + "\n"
 
         print(f"🔧 Tool returning result with {len(jobs)} jobs")
@@ -68,7 +98,7 @@ def get_job_statistics_tool(
         Formatted string with job statistics
     """
     try:
-        from data.database import get_job_statistics
+        from data.database import get_job_statistics, get_tag_frequency
         print(f"📊 Getting job statistics: days_back={days_back}, title_filter='{title_filter}'")
         stats = get_job_statistics(days_back=days_back, title_filter=title_filter)
         
@@ -79,11 +109,22 @@ def get_job_statistics_tool(
         
         result += f"📈 Total Jobs: {stats['total_jobs']}\n"
         result += f"🆕 Recent Jobs: {stats['recent_jobs']}\n"
-        result += f"🏢 Top Companies: {', '.join(stats['top_companies'][:5])}\n"
-        result += f"📍 Top Locations: {', '.join(stats['top_locations'][:5])}\n"
+        result += f"🏢 Top Companies: {', '.join(c['company'] for c in stats['top_companies'][:5])}\n"
+        result += f"📍 Top Locations: {', '.join(l['location'] for l in stats['top_locations'][:5])}\n"
         result += f"💼 Remote Jobs: {stats['remote_jobs']} ({stats['remote_percentage']:.1f}%)\n"
-        result += f"💰 Average Salary: ${stats['avg_salary']:,.0f}\n"
-        result += f"📋 Employment Types: {', '.join(stats['employment_types'])}\n"
+        if stats['avg_salary'] is not None:
+            result += f"💰 Average Salary: ${stats['avg_salary']:,.0f}\n"
+        else:
+            result += "💰 Average Salary: not available\n"
+        result += f"📋 Employment Types: {', '.join(t['type'] for t in stats['employment_types'])}\n"
+        if stats['title_stats']:
+            result += f"🔎 Jobs matching '{title_filter}': {stats['title_stats']['count']}\n"
+        top_skills = get_tag_frequency('skills', limit=10, title=title_filter)
+        if top_skills:
+            result += f"🛠️ Top Skills: {', '.join('{name} ({count})'.format(**s) for s in top_skills)}\n"
+        degrees = get_tag_frequency('education', limit=5, title=title_filter)
+        if degrees:
+            result += f"🎓 Education: {', '.join('{name} ({count})'.format(**d) for d in degrees)}\n"
         
         return result
         
@@ -1,9 +1,52 @@
 from flask import Flask, render_template, jsonify, request
-from data.database import get_all_jobs, search_jobs, get_job_statistics
+from data.database import list_jobs, search_jobs, get_job_by_id, get_job_statistics
 import os
 
 app = Flask(__name__)
 
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+def serialize_job(job):
+    """Convert a Job record from data.database into the API's JSON shape"""
+    description = job.description or ''
+    job_dict = {
+        'id': job.job_id,
+        'url': job.job_url,
+        'source': job.source,
+        'title': job.title,
+        'company': job.company_name,
+        'description': description[:500] + '...' if len(description) > 500 else description,  # Truncate description
+        'location': job.location,
+        'city': job.city,
+        'state': job.state,
+        'country': job.country,
+        'remote': job.remote,
+        'seniority_level': job.seniority_level,
+        'employment_type': job.employment_type,
+        'salary_min': job.salary_min,
+        'salary_max': job.salary_max,
+        'salary_avg': job.salary_avg,
+        'date_posted': job.created_at
+    }
+    if 'snippet' in job:
+        job_dict['snippet'] = job.snippet
+    return job_dict
+
+def job_filters_from_args(args):
+    """Read the structured job filters from query-string arguments"""
+    filters = {}
+    for key in ('salary_min', 'salary_max', 'yoe_min', 'yoe_max', 'posted_since'):
+        if args.get(key):
+            filters[key] = args[key]
+    for key in ('seniority_level', 'employment_type', 'source', 'skills', 'education'):
+        values = [value for value in args.getlist(key) if value]
+        if values:
+            filters[key] = values
+    if args.get('remote'):
+        filters['remote'] = args['remote'].lower() in ('1', 'true', 'yes')
+    return filters
+
 @app.route('/')
 def index():
     """Main job board page"""
@@ -11,36 +54,57 @@ def index():
 
 @app.route('/api/jobs')
 def api_jobs():
-    """API endpoint to get all jobs"""
+    """API endpoint to page through jobs, newest first
+    
+    Accepts the structured filters plus q/title/location text search,
+    sort=newest|oldest, limit (max MAX_PAGE_SIZE) and the cursor returned
+    as next_cursor by the previous page.
+    """
     try:
-        jobs = get_all_jobs()
-        # Convert tuple to dict for JSON serialization
-        jobs_data = []
-        for job in jobs:
-            job_dict = {
-                'id': job[0],
-                'url': job[1],
-                'source': job[2],
-                'title': job[3],
-                'company': job[4],
-                'description': job[5][:500] + '...' if len(job[5]) > 500 else job[5],  # Truncate description
-                'location': job[6],
-                'city': job[7],
-                'state': job[8],
-                'country': job[9],
-                'seniority_level': job[11],
-                'employment_type': job[12],
-                'salary_min': job[14],
-                'salary_max': job[15],
-                'salary_avg': job[16],
-                'date_posted': job[25]
-            }
-            jobs_data.append(job_dict)
+        page_size = min(max(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        jobs, next_cursor = list_jobs(
+            filters=job_filters_from_args(request.args),
+            cursor=request.args.get('cursor') or None,
+            page_size=page_size,
+            order_by=request.args.get('sort') or 'newest',
+            title=request.args.get('title'),
+            location=request.args.get('location'),
+            keywords=request.args.get('q')
+        )
         
         return jsonify({
             'success': True,
-            'jobs': jobs_data,
-            'total': len(jobs_data)
+            'jobs': [serialize_job(job) for job in jobs],
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/jobs/<job_id>')
+def api_job_detail(job_id):
+    """API endpoint to get one job with its full description"""
+    try:
+        job = get_job_by_id(job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': 'Job not found'
+            }), 404
+        
+        job_dict = serialize_job(job)
+        job_dict['description'] = job.description or ''
+        return jsonify({
+            'success': True,
+            'job': job_dict
         })
     except Exception as e:
         return jsonify({
@@ -54,38 +118,25 @@ def api_search_jobs():
     try:
         title = request.args.get('title', '')
         location = request.args.get('location', '')
-        num_jobs = int(request.args.get('limit', 50))
-        
-        jobs = search_jobs(title=title, location=location, num_jobs=num_jobs)
+        keywords = request.args.get('q', '')
+        num_jobs = min(int(request.args.get('limit', 50)), 200)
+        filters = job_filters_from_args(request.args)
+        order_by = request.args.get('sort') or None
         
-        # Convert tuple to dict for JSON serialization
-        jobs_data = []
-        for job in jobs:
-            job_dict = {
-                'id': job[0],
-                'url': job[1],
-                'source': job[2],
-                'title': job[3],
-                'company': job[4],
-                'description': job[5][:500] + '...' if len(job[5]) > 500 else job[5],
-                'location': job[6],
-                'city': job[7],
-                'state': job[8],
-                'country': job[9],
-                'seniority_level': job[11],
-                'employment_type': job[12],
-                'salary_min': job[14],
-                'salary_max': job[15],
-                'salary_avg': job[16],
-                'date_posted': job[25]
-            }
-            jobs_data.append(job_dict)
+        jobs = search_jobs(title=title, location=location, num_jobs=num_jobs, keywords=keywords,
+                           filters=filters, order_by=order_by)
+        jobs_data = [serialize_job(job) for job in jobs]
         
         return jsonify({
             'success': True,
             'jobs': jobs_data,
             'total': len(jobs_data)
         })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
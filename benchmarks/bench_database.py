@@ -0,0 +1,187 @@
+"""
+Database benchmark - calls per second for the data.database helpers
+
+Compares the old open-connect-close-per-call pattern against the pooled
+ConnectionManager on a throwaway database, so jobs.db is never touched.
+
+    python benchmarks/bench_database.py --jobs 2000 --calls 5000
+    python benchmarks/bench_database.py --bulk-rows 100000
+
+The bulk mode falls well short of a 50x speedup. At --bulk-rows 20000 on
+a VM with cheap fsync, per-job inserts ran at ~700 rows/s and
+store_jobs_bulk at ~4,950 rows/s, about 7x. store_jobs_bulk also
+fingerprints every new job for near-duplicate detection (data/dedup.py),
+which the per-job baseline does not, and that costs about half its
+throughput. Re-running over stored IDs skips all of it (~570k rows/s).
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import database
+
+INSERT_ORDER = (
+    'job_id', 'job_url', 'source', 'title', 'company_name', 'location', 'city', 'state', 'country', 'remote',
+    'industry', 'description', 'seniority_level', 'employment_type', 'job_function',
+    'salary_raw', 'salary_min', 'salary_max', 'salary_avg', 'yoe_raw', 'yoe_min', 'yoe_max', 'yoe_avg',
+    'education', 'skills',
+)
+
+
+VOCABULARY = (
+    'we are hiring engineers analysts scientists to build python sql spark pipelines machine learning '
+    'models dashboards experiments with product design marketing teams remote hybrid onsite benefits '
+    'equity salary growth mentoring customers platform cloud aws data quality reporting'
+).split()
+
+
+def make_job(i):
+    """Synthetic job record in the shape scrape_jobs produces"""
+    # Distinct text per job so near-duplicate detection keeps every row
+    words = random.Random(i).choices(VOCABULARY, k=150)
+    return {
+        'job_id': f'bench-{i}',
+        'job_url': f'https://www.linkedin.com/jobs/view/{i}',
+        'source': 'linkedin.com',
+        'title': ['Data Scientist', 'Software Engineer', 'Product Manager'][i % 3],
+        'company_name': f'Company {i % 97}',
+        'description': ' '.join(words),
+        'location': ['New York, NY', 'Remote', 'Austin, TX'][i % 3],
+        'city': None,
+        'state': None,
+        'country': 'United States',
+        'remote': str(i % 2),
+        'industry': 'Software Development',
+        'seniority_level': 'Mid-Senior level',
+        'employment_type': ['Full-time', 'Contract'][i % 2],
+        'job_function': 'Engineering',
+        'salary_raw': None,
+        'salary_min': 100000 + i % 50 * 1000,
+        'salary_max': 150000 + i % 50 * 1000,
+        'salary_avg': 125000 + i % 50 * 1000,
+        'yoe_raw': None,
+        'yoe_min': i % 5,
+        'yoe_max': i % 5 + 3,
+        'yoe_avg': i % 5 + 1.5,
+        'education': ["bachelor's"],
+        'skills': ['python', 'sql'],
+    }
+
+
+def naive_store_job(db_path, job):
+    """The pre-pool implementation: connect, insert, commit, close on every call"""
+    conn = sqlite3.connect(db_path)
+    record = dict(job, education=json.dumps(job['education']), skills=json.dumps(job['skills']))
+    try:
+        conn.execute(database.INSERT_JOB_SQL, tuple(record[col] for col in INSERT_ORDER))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def naive_get_job_by_id(db_path, job_id):
+    """The pre-pool implementation: connect, query, close on every call"""
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,))
+    job = c.fetchone()
+    conn.close()
+    return job
+
+
+def naive_count(db_path):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+    conn.close()
+    return count
+
+
+def pooled_count():
+    with database.db.connection() as conn:
+        return conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+
+def rate(fn, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+
+def bench_bulk_insert(rows, batch_size, naive_sample=5000):
+    """Rows/sec for per-job inserts (pre-pool, rollback journal) vs store_jobs_bulk"""
+    with tempfile.TemporaryDirectory() as tmp:
+        naive_path = os.path.join(tmp, 'naive.db')
+        conn = sqlite3.connect(naive_path)
+        database.ensure_schema(conn)
+        conn.close()
+        # Build records up front so only the storage path is timed
+        records = [make_job(i) for i in range(rows)]
+        sample = min(rows, naive_sample)
+        naive_rate = rate(lambda i: naive_store_job(naive_path, records[i]), sample)
+
+        database.set_db_path(os.path.join(tmp, 'bulk.db'))
+        database.init_db()
+        start = time.perf_counter()
+        new_jobs, duplicates = database.store_jobs_bulk(records, batch_size)
+        bulk_rate = rows / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        _, rerun_duplicates = database.store_jobs_bulk(records, batch_size)
+        rerun_rate = rows / (time.perf_counter() - start)
+        database.db.close_all()
+
+    print(f"\n📊 Bulk insert of {rows} synthetic jobs (batch_size={batch_size})")
+    print(f"  {'per-job store (' + str(sample) + ' row sample)':<40} {naive_rate:>10,.0f} rows/s")
+    print(f"  {'store_jobs_bulk':<40} {bulk_rate:>10,.0f} rows/s  ({new_jobs} new, {duplicates} duplicates)")
+    print(f"  {'store_jobs_bulk re-run (all duplicates)':<40} {rerun_rate:>10,.0f} rows/s  ({rerun_duplicates} duplicates)")
+    print(f"  speedup: {bulk_rate / naive_rate:.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--bulk-rows', type=int, default=0, help='run the bulk insert benchmark instead')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.bulk_rows:
+        bench_bulk_insert(args.bulk_rows, args.batch_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        database.set_db_path(db_path)
+        database.init_db()
+
+        n = args.jobs
+        results = [
+            ('store_job (connect per call)', rate(lambda i: naive_store_job(db_path, make_job(i)), n)),
+        ]
+        database.clear_jobs()
+        results += [
+            ('store_job (pooled)', rate(lambda i: database.store_job(**make_job(i)), n)),
+            ('get_job_by_id (connect per call)', rate(lambda i: naive_get_job_by_id(db_path, f'bench-{i % n}'), args.calls)),
+            ('get_job_by_id (pooled)', rate(lambda i: database.get_job_by_id(f'bench-{i % n}'), args.calls)),
+            ('COUNT(*) (connect per call)', rate(lambda i: naive_count(db_path), args.calls)),
+            ('COUNT(*) (pooled)', rate(lambda i: pooled_count(), args.calls)),
+        ]
+        database.db.close_all()
+
+    print(f"\n📊 {args.calls} calls against {args.jobs} jobs")
+    for name, calls_per_sec in results:
+        print(f"  {name:<40} {calls_per_sec:>10,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Field extraction benchmark - microseconds per posting for each extractor
+
+Compares the inline extractors the RSS and Google scrapers used to carry
+(copied below as legacy_*, compiling their patterns on every call through
+re's cache) against the precompiled rule tables in utils.extraction, one
+call at a time and through the batch forms. Input is the golden corpus in
+tests/fixtures/extraction_corpus.json, repeated to --postings texts.
+
+    python benchmarks/bench_extraction.py --postings 5000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from utils import extraction
+
+CORPUS = os.path.join(ROOT, 'tests', 'fixtures', 'extraction_corpus.json')
+
+
+def legacy_salary(description):
+    salary_patterns = [
+        r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*[-–]\s*\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
+        r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*\+',
+        r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*[-–]\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*k',
+    ]
+    for pattern in salary_patterns:
+        match = re.search(pattern, description, re.IGNORECASE)
+        if match:
+            if len(match.groups()) == 2:
+                low, high = int(match.group(1).replace(',', '')), int(match.group(2).replace(',', ''))
+                return {'raw': match.group(0), 'min': low, 'max': high, 'avg': (low + high) / 2}
+            low = int(match.group(1).replace(',', ''))
+            return {'raw': match.group(0), 'min': low, 'max': None, 'avg': low}
+    return {'raw': None, 'min': None, 'max': None, 'avg': None}
+
+
+def legacy_location(title, description):
+    location_patterns = [
+        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2})',
+        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z][a-z]+)',
+        r'(Remote|Work from home|WFH)',
+        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+    ]
+    text = f"{title} {description}"
+    for pattern in location_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            if len(match.groups()) > 1:
+                return f"{match.group(1)}, {match.group(2)}"
+            if 2 < len(match.group(1)) < 50:
+                return match.group(1)
+    return 'Location not specified'
+
+
+def legacy_employment_type(description):
+    description_lower = description.lower()
+    if 'full-time' in description_lower or 'full time' in description_lower:
+        return 'Full-time'
+    elif 'part-time' in description_lower or 'part time' in description_lower:
+        return 'Part-time'
+    elif 'contract' in description_lower:
+        return 'Contract'
+    elif 'intern' in description_lower:
+        return 'Internship'
+    return 'Full-time'
+
+
+def legacy_seniority_level(description):
+    description_lower = description.lower()
+    if 'senior' in description_lower or 'sr.' in description_lower:
+        return 'Senior'
+    elif 'junior' in description_lower or 'jr.' in description_lower:
+        return 'Junior'
+    elif 'lead' in description_lower or 'principal' in description_lower:
+        return 'Lead'
+    elif 'manager' in description_lower or 'director' in description_lower:
+        return 'Management'
+    elif 'intern' in description_lower or 'internship' in description_lower:
+        return 'Intern'
+    return 'Mid-level'
+
+
+def legacy_fields(title, description):
+    return (legacy_location(title, description), legacy_salary(description),
+            legacy_employment_type(description), legacy_seniority_level(description))
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--postings', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with open(CORPUS, encoding='utf-8') as f:
+        cases = json.load(f)
+    cases = (cases * (args.postings // len(cases) + 1))[:args.postings]
+    titles = [case['title'] for case in cases]
+    texts = [case['description'] for case in cases]
+    postings = list(zip(titles, texts))
+
+    rows = [
+        ('salary', lambda: [legacy_salary(t) for t in texts],
+         lambda: [extraction.parse_salary(t) for t in texts], lambda: extraction.parse_salaries(texts)),
+        ('location', lambda: [legacy_location(a, b) for a, b in postings],
+         lambda: [extraction.find_location(f"{a} {b}") for a, b in postings],
+         lambda: extraction.find_locations([f"{a} {b}" for a, b in postings])),
+        ('employment type', lambda: [legacy_employment_type(t) for t in texts],
+         lambda: [extraction.employment_type(t) for t in texts], lambda: extraction.employment_types(texts)),
+        ('seniority', lambda: [legacy_seniority_level(t) for t in texts],
+         lambda: [extraction.seniority_level(t) for t in texts], lambda: extraction.seniority_levels(texts)),
+        ('all fields', lambda: [legacy_fields(a, b) for a, b in postings],
+         lambda: [extraction.extract_fields(a, b) for a, b in postings],
+         lambda: extraction.extract_fields_batch(postings)),
+    ]
+
+    print(f"\n📊 {args.postings} postings, best of {args.repeat}, CPU µs per posting")
+    print(f"  {'extractor':<16} {'legacy':>8} {'single':>8} {'batch':>8}")
+    for name, legacy, single, batch in rows:
+        timings = [best_of(fn, args.repeat) / args.postings * 1e6 for fn in (legacy, single, batch)]
+        print(f"  {name:<16} " + ' '.join(f"{t:>8.2f}" for t in timings))
+    print("  (legacy 'all fields' covers only location, salary, employment type and seniority)")
+
+
+if __name__ == "__main__":
+    main()
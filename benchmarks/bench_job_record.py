@@ -0,0 +1,89 @@
+"""
+Job record benchmark - CPU and memory to materialize rows per 10k jobs
+
+Compares the old per-row dict mapping (column loop with eager JSON decoding
+of skills/education) against Job records built by job_row_factory, on a
+throwaway database.
+
+    python benchmarks/bench_job_record.py --rows 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import database
+from bench_database import make_job
+
+
+def dict_rows(conn, sql):
+    """The pre-Job mapping: a dict per row with eager JSON decoding"""
+    c = conn.execute(sql)
+    columns = [col[0] for col in c.description]
+    jobs = []
+    for row in c.fetchall():
+        job = {}
+        for i, col in enumerate(columns):
+            if col in ['education', 'skills'] and row[i]:
+                try:
+                    job[col] = json.loads(row[i])
+                except:
+                    job[col] = row[i]
+            else:
+                job[col] = row[i]
+        jobs.append(job)
+    return jobs
+
+
+def tuple_rows(conn, sql):
+    return conn.execute(sql).fetchall()
+
+
+def job_rows(conn, sql):
+    return database._fetch_jobs(conn, sql)
+
+
+def measure(fn, conn, sql, repeat):
+    seconds = min(timeit.repeat(lambda: fn(conn, sql), number=1, repeat=repeat))
+    tracemalloc.start()
+    rows = fn(conn, sql)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return seconds, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_db_path(os.path.join(tmp, 'bench.db'))
+        database.init_db()
+        database.store_jobs_bulk(make_job(i) for i in range(args.rows))
+
+        per_10k = 10000 / args.rows
+        with database.db.connection() as conn:
+            for label, sql in (('SELECT * (detail rows)', 'SELECT * FROM jobs'),
+                               ('LIST_COLUMNS (list rows)', f'SELECT {database.LIST_COLUMNS} FROM jobs')):
+                base_seconds, base_bytes = measure(tuple_rows, conn, sql, args.repeat)
+                print(f"\n📊 {label}, per 10k rows (mapping cost = total - raw tuple fetch)")
+                print(f"  {'raw tuples':<22} {base_seconds * per_10k * 1000:>8.1f} ms {base_bytes * per_10k / 2**20:>8.2f} MiB")
+                for name, fn in (('dict per row', dict_rows), ('Job records', job_rows)):
+                    seconds, retained = measure(fn, conn, sql, args.repeat)
+                    print(f"  {name:<22} {seconds * per_10k * 1000:>8.1f} ms {retained * per_10k / 2**20:>8.2f} MiB"
+                          f"   mapping: {(seconds - base_seconds) * per_10k * 1000:>6.1f} ms"
+                          f" {(retained - base_bytes) * per_10k / 2**20:>6.2f} MiB")
+        database.db.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+LinkedIn page parse benchmark - pages per second per core for each parser backend
+
+Times parse_job_page over the recorded jobPosting corpus in
+tests/fixtures/linkedin_jobs, and the listing-page card parse over
+tests/fixtures/linkedin_listing.html, once per available backend. The
+"full html.parser" row is the pre-backend behaviour: a complete
+html.parser tree. Timings are CPU time on one core (best of --repeat).
+
+    python benchmarks/bench_parse.py --repeat 50
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from bs4 import BeautifulSoup
+
+from data.scrapers import html_parsing, scraper
+
+CORPUS = os.path.join(ROOT, 'tests', 'fixtures', 'linkedin_jobs')
+LISTING = os.path.join(ROOT, 'tests', 'fixtures', 'linkedin_listing.html')
+
+
+def load_corpus(path=CORPUS):
+    pages = {}
+    for filename in sorted(glob.glob(os.path.join(path, '*.html'))):
+        with open(filename, encoding='utf-8') as f:
+            pages[os.path.basename(filename)[:-5]] = f.read()
+    return pages
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=CORPUS)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    with open(LISTING, encoding='utf-8') as f:
+        listing = f.read()
+    kib = sum(len(html) for html in pages.values()) / len(pages) / 1024
+    print(f"\n📊 {len(pages)} jobPosting pages (mean {kib:.1f} KiB) and 1 listing page, "
+          f"best of {args.repeat}, CPU time on one core")
+    print(f"  {'backend':<20} {'soup ms':>9} {'parse ms':>9} {'pages/s':>9} {'listing ms':>11}")
+
+    for backend in ['full html.parser'] + html_parsing.available_backends():
+        if backend == 'full html.parser':
+            soup_fn = lambda html: BeautifulSoup(html, 'html.parser')
+            page_fn = lambda name, html: scraper.extract_job_fields(name, BeautifulSoup(html, 'html.parser'))
+            listing_fn = lambda html: BeautifulSoup(html, 'html.parser').find_all('li')
+        else:
+            soup_fn = lambda html, backend=backend: html_parsing.detail_soup(html, backend)
+            page_fn = lambda name, html, backend=backend: scraper.parse_job_page(name, html, backend=backend)
+            listing_fn = lambda html, backend=backend: scraper.parse_listing_page(html, backend=backend)
+
+        soup = sum(best_of(lambda: soup_fn(html), args.repeat) for html in pages.values()) / len(pages)
+        total = sum(best_of(lambda: page_fn(name, html), args.repeat) for name, html in pages.items()) / len(pages)
+        listing_time = best_of(lambda: listing_fn(listing), args.repeat)
+        print(f"  {backend:<20} {soup * 1000:>9.2f} {total * 1000:>9.2f} {1 / total:>9.0f} {listing_time * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Re-extraction benchmark - archived pages per second by worker count
+
+Archives the recorded jobPosting corpus (tests/fixtures/linkedin_jobs)
+under --pages job IDs in a throwaway database, then replays the whole
+archive with page_archive.reextract once per worker count. Each copy of a
+page gets a numbered title, so it is a new opening rather than a
+near-duplicate skipped at ingest. Speedup is relative to one worker; it
+tracks the number of physical cores.
+
+    python benchmarks/bench_reextract.py --pages 4000 --workers 1 2 4 8
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from data import database, page_archive
+from data.scrapers import scraper
+
+CORPUS = os.path.join(ROOT, 'tests', 'fixtures', 'linkedin_jobs')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument('--batch-size', type=int, default=page_archive.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(CORPUS, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        corpus.append((html, scraper.parse_job_page('', html)['title']))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_db_path(os.path.join(tmp, 'jobs.db'))
+        database.init_db()
+        jobs, pages = [], []
+        for i in range(args.pages):
+            html, title = corpus[i % len(corpus)]
+            html = html.replace(title, f'{title} {i}')
+            job_id = f'bench-{i:07d}'
+            jobs.append(scraper.parse_job_page(job_id, html))
+            pages.append((job_id, *page_archive.compress_page(html)))
+        database.store_jobs_bulk(jobs)
+        database.store_job_pages(pages)
+
+        with database.db.connection() as conn:
+            s = page_archive.archive_stats(conn)
+            print(f"\n📊 {s['pages']} archived pages ({s['ratio']:.1f}x compression), "
+                  f"batches of {args.batch_size}, {os.cpu_count()} CPUs")
+            print(f"  {'workers':>7} {'seconds':>8} {'pages/s':>9} {'speedup':>8}")
+            baseline = None
+            for workers in args.workers:
+                result = page_archive.reextract(conn, workers=workers, batch_size=args.batch_size,
+                                                restart=True, progress=False)
+                baseline = baseline or result['pages_per_second']
+                print(f"  {workers:>7} {result['elapsed']:>8.2f} {result['pages_per_second']:>9.0f} "
+                      f"{result['pages_per_second'] / baseline:>7.2f}x")
+        database.db.close_all()
+
+
+if __name__ == "__main__":
+    main()
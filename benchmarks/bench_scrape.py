@@ -0,0 +1,129 @@
+"""
+End-to-end scrape benchmark - jobs/s, CPU per job and peak RSS per source
+
+Starts the fixture replay server (benchmarks/fixture_server.py) in its own
+process, then runs each scenario in a fresh child process against a
+throwaway database, through the full scrape -> extract -> store path:
+
+- linkedin: the frontier crawl into a JobSink with the raw page archive,
+  as job_pipeline runs it
+- rss / google: JobScraperManager.scrape_all_sources for that source
+
+CPU per job is the user + system time of the scraping process (the
+server's is excluded); peak RSS is its ru_maxrss high-water mark.
+
+    python benchmarks/bench_scrape.py --jobs 300 --latency 0.05 --throttle-rate 0.02
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+SCENARIOS = ('linkedin', 'rss', 'google')
+
+
+def run_scenario(name, netloc, jobs, workers, rate):
+    """Scrape one source through the replay server; runs in the child process"""
+    from benchmarks.fixture_server import install
+    from data import database
+    from data.frontier import CrawlFrontier
+    from data.job_sink import JobSink
+    from data.page_archive import compress_page
+    from data.scrapers.scraper import iter_crawl_jobs
+    from scrapers.job_scraper_manager import JobScraperManager
+    from utils.http_client import get_session
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_db_path(os.path.join(tmp, 'jobs.db'))
+        database.init_db()
+        install(get_session(), netloc)
+        before = resource.getrusage(resource.RUSAGE_SELF)
+        start = time.perf_counter()
+        if name == 'linkedin':
+            with database.db.connection() as conn, JobSink(on_commit=database.complete_crawled_jobs) as sink:
+                archive = lambda job_id, html: sink.put_page((job_id, *compress_page(html)))
+                for job in iter_crawl_jobs(CrawlFrontier(conn), num_jobs=jobs, workers=workers, rate=rate,
+                                           burst=workers, archive=archive, defer_complete=True):
+                    sink.put(job)
+            stored = sink.summary()['new_jobs']
+        else:
+            manager = JobScraperManager()
+            manager.scrapers['google'].api_key = manager.scrapers['google'].search_engine_id = 'replay'
+            results = manager.scrape_all_sources(rss_enabled=name == 'rss', google_enabled=name == 'google',
+                                                 max_jobs_per_source=jobs)
+            stored = results['summary']['total_new_jobs']
+        elapsed = time.perf_counter() - start
+        after = resource.getrusage(resource.RUSAGE_SELF)
+        database.db.close_all()
+
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    return {
+        'jobs': stored,
+        'seconds': elapsed,
+        'jobs_per_second': stored / elapsed if elapsed else 0.0,
+        'cpu_ms_per_job': cpu * 1000 / stored if stored else None,
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_mib': after.ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=50.0, help='requests per second per host')
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--child', choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument('--server', help=argparse.SUPPRESS)
+    parser.add_argument('--verbose', action='store_true', help="show the scrapers' own output")
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_scenario(args.child, args.server, args.jobs, args.workers, args.rate)
+        print(json.dumps(result))
+        return
+
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'benchmarks', 'fixture_server.py'),
+         '--latency', str(args.latency), '--jitter', str(args.jitter), '--error-rate', str(args.error_rate),
+         '--throttle-rate', str(args.throttle_rate), '--retry-after', '0', '--pages', str(args.jobs // 10 + 5)],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        netloc = server.stdout.readline().strip().split('://', 1)[1]
+        print(f"\n📊 Scrape -> extract -> store through the fixture server "
+              f"(latency {args.latency * 1000:.0f}±{args.jitter * 1000:.0f}ms, "
+              f"{args.error_rate:.0%} errors, {args.throttle_rate:.0%} throttled)")
+        print(f"  {'source':<9} {'jobs':>5} {'seconds':>8} {'jobs/s':>8} {'CPU ms/job':>11} {'peak RSS MiB':>13}")
+        for name in args.scenarios:
+            child = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', name, '--server', netloc,
+                 '--jobs', str(args.jobs), '--workers', str(args.workers), '--rate', str(args.rate)],
+                stdout=subprocess.PIPE, stderr=None if args.verbose else subprocess.DEVNULL, text=True, check=True,
+            )
+            lines = child.stdout.strip().splitlines()
+            if args.verbose:
+                print('\n'.join(lines[:-1]))
+            r = json.loads(lines[-1])
+            cpu = f"{r['cpu_ms_per_job']:.1f}" if r['cpu_ms_per_job'] is not None else '-'
+            print(f"  {name:<9} {r['jobs']:>5} {r['seconds']:>8.2f} {r['jobs_per_second']:>8.1f} "
+                  f"{cpu:>11} {r['peak_rss_mib']:>13.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Streaming persistence benchmark - peak memory and time to first stored row
+
+Feeds synthetic jobs (with a description the size of a real posting)
+into a throwaway database two ways, at each run size:
+
+- list: collect every job, then store_jobs_bulk once (the old pipeline)
+- stream: put each job into a JobSink as it is produced
+
+Peak memory is the tracemalloc high-water mark of Python allocations
+during the run; it grows with run size for list and stays flat for stream.
+
+    python benchmarks/bench_streaming.py --jobs 1000 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import database
+from data.job_sink import JobSink
+
+VOCABULARY = (
+    'we are hiring engineers analysts scientists to build python sql spark pipelines machine learning '
+    'models dashboards experiments with product design marketing teams remote hybrid onsite benefits'
+).split()
+
+
+def iter_jobs(count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'job_id': f'{seed}-{i}',
+            'title': f'Data Scientist {i}',
+            'company_name': f'Company {i % 97}',
+            'description': ' '.join(rng.choices(VOCABULARY, k=600)),
+            'location': 'New York, NY',
+        }
+
+
+def run(mode, count, seed):
+    start = time.perf_counter()
+    tracemalloc.start()
+    if mode == 'list':
+        jobs = list(iter_jobs(count, seed))
+        database.store_jobs_bulk(jobs)
+        first = time.perf_counter() - start
+    else:
+        with JobSink() as sink:
+            for job in iter_jobs(count, seed):
+                sink.put(job)
+        first = sink.summary()['first_commit_seconds']
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1000, 4000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_db_path(os.path.join(tmp, 'jobs.db'))
+        database.init_db()
+        print(f"\n📊 Peak traced memory and time to first committed row")
+        print(f"  {'jobs':>6} {'mode':<7} {'peak MiB':>9} {'first row s':>12} {'total s':>8}")
+        for seed, count in enumerate(args.jobs):
+            for mode in ('list', 'stream'):
+                peak, first, total = run(mode, count, f'{mode}{seed}')
+                print(f"  {count:>6} {mode:<7} {peak / 2**20:>9.1f} {first:>12.2f} {total:>8.2f}")
+        database.db.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Fixture replay server - the scraping stack without live sites
+
+Serves the recorded pages under tests/fixtures for every endpoint the
+scrapers call, keyed on the host the request was meant for:
+
+- www.linkedin.com seeMoreJobPostings: the recorded listing page, with
+  its job IDs renumbered per search and start offset (newest first,
+  --pages pages per search, fewer for the day and week windows)
+- www.linkedin.com jobPosting/<id>: one of the recorded detail pages,
+  varied per job ID
+- www.googleapis.com/customsearch/v1: the recorded CSE response, links
+  tagged with the query so each query yields its own results
+- any other host: the recorded RSS feed (FixtureServer.feed, which
+  tests may replace to publish new entries)
+
+Every 200 carries an ETag of its body and a matching If-None-Match gets a
+304, as conditional feed polls expect. Responses come with configurable
+latency, 5xx error rate and 429 injection (with a Retry-After). install() points an HttpSession at the server: requests keep
+their real URLs - so per-host pools, rate limits and caches behave as in
+production - and are rewritten to the server just before they are sent.
+
+    with FixtureServer(latency=0.05, throttle_rate=0.05) as server:
+        uninstall = server.install(get_session())
+        jobs = scrape_jobs(100)
+
+    python benchmarks/fixture_server.py --port 8800 --latency 0.1 --error-rate 0.02
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures')
+
+REPLAY_HOST_HEADER = 'X-Replay-Host'
+# Job IDs of the first listing page; later pages count down from here
+TOP_JOB_ID = 4200000000
+LISTING_ID = re.compile(r'40123457(\d\d)')
+# Share of a month's postings in the narrower f_TPR windows
+WINDOW_SHARE = {'r86400': 1 / 30, 'r604800': 1 / 4}
+DESCRIPTION_START = '<div class="description__text description__text--rich">'
+# Words for the paragraph that makes each replayed posting distinct
+VOCABULARY = (
+    'analytics platform customers pipelines experiments forecasting dashboards stakeholders roadmap latency '
+    'reliability migration warehouse streaming onboarding pricing retention fraud search ranking recommendations '
+    'compliance payments logistics inventory marketplace mobile growth infrastructure observability security'
+).split()
+
+
+def _read(*parts):
+    with open(os.path.join(FIXTURES, *parts), 'rb') as f:
+        return f.read()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter sending every request to the replay server, tagged with its real host"""
+
+    def __init__(self, netloc, **kwargs):
+        super().__init__(**kwargs)
+        self.netloc = netloc
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.headers[REPLAY_HOST_HEADER] = parts.netloc
+        request.url = urlunsplit(('http', self.netloc, parts.path or '/', parts.query, ''))
+        return super().send(request, **kwargs)
+
+
+def install(session, netloc):
+    """Route every request of an HttpSession to the replay server at netloc
+
+    Returns:
+        Function restoring the session's own adapters
+    """
+    saved = dict(session.adapters)
+    adapter = ReplayAdapter(netloc, pool_connections=4, pool_maxsize=32, max_retries=session.retry)
+    for prefix in saved:
+        session.mount(prefix, adapter)
+
+    def uninstall():
+        session.adapters.clear()
+        session.adapters.update(saved)
+        adapter.close()
+    return uninstall
+
+
+class FixtureServer:
+    """Threaded HTTP server replaying recorded fixtures with injected latency and failures
+
+    Args:
+        latency: Seconds added to every response
+        jitter: Up to this many seconds more, uniformly at random
+        error_rate: Fraction of requests answered 500
+        throttle_rate: Fraction of requests answered 429
+        retry_after: Retry-After seconds sent with each 429
+        pages: Listing pages before an empty one ends the listing
+        seed: Seed for the injected failures and jitter
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0,
+                 retry_after=1, pages=100, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.pages = pages
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._listing = _read('linkedin_listing.html').decode('utf-8')
+        self._details = [_read(path).decode('utf-8')
+                         for path in sorted(glob.glob(os.path.join(FIXTURES, 'linkedin_jobs', '*.html')))]
+        self.feed = _read('feeds', 'remote_jobs.xml')
+        self._cse = json.loads(_read('google_cse.json'))
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def netloc(self):
+        host, port = self._server.server_address[:2]
+        return f'{host}:{port}'
+
+    @property
+    def url(self):
+        return f'http://{self.netloc}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def install(self, session):
+        """Route every request of an HttpSession to this server (see install)"""
+        return install(session, self.netloc)
+
+    def summary(self):
+        """Request counts by route and status"""
+        with self._lock:
+            return {f'{route} {status}': count for (route, status), count in sorted(self.requests.items())}
+
+    def _draw(self):
+        """Fault to inject (None, 500 or 429) and extra latency for one request"""
+        with self._lock:
+            roll = self._random.random()
+            delay = self.latency + self._random.uniform(0, self.jitter) if self.jitter else self.latency
+        if roll < self.error_rate:
+            return 500, delay
+        if roll < self.error_rate + self.throttle_rate:
+            return 429, delay
+        return None, delay
+
+    def listing_page(self, start, keywords='', location='', window='r2592000'):
+        """The recorded listing with IDs for this search and offset; empty past the last page
+
+        Each keywords/location search has postings of its own (its own ID
+        range); a narrower window is the first pages of the month's.
+        """
+        pages = self.pages
+        if window in WINDOW_SHARE:
+            pages = max(1, round(pages * WINDOW_SHARE[window]))
+        page = start // 10
+        if page >= pages:
+            return b''
+        search = zlib.crc32(f'{keywords}|{location}'.encode()) % 1000 if keywords or location else 0
+        first = TOP_JOB_ID - search * 1000000 - page * 10
+        return LISTING_ID.sub(lambda m: str(first - int(m.group(1))), self._listing).encode('utf-8')
+
+    def detail_page(self, job_id):
+        """A recorded detail page, given its own company and team paragraph per job ID
+
+        Without the variation every replayed posting would be a
+        near-duplicate of one of the four recordings and never stored.
+        """
+        number = int(job_id) if job_id.isdigit() else 0
+        rng = random.Random(number)
+        paragraph = f"<p>Team {number % 9973}: {' '.join(rng.choices(VOCABULARY, k=80))}.</p>"
+        page = self._details[number % len(self._details)]
+        page = page.replace('Acme', f'Acme {number % 9973}', 2)
+        return page.replace(DESCRIPTION_START, DESCRIPTION_START + paragraph, 1)
+
+    def search_results(self, query, num=10):
+        tag = re.sub(r'\W+', '-', query.lower()).strip('-')
+        items = [dict(item, link=f"{item['link']}?q={tag}") for item in self._cse['items'][:num]]
+        return json.dumps(dict(self._cse, items=items)).encode('utf-8')
+
+    def route(self, host, path, query):
+        """(route name, content type, body) for a request, or None for a 404"""
+        if host == 'www.linkedin.com':
+            if path.endswith('/seeMoreJobPostings/search'):
+                param = lambda name, default='': query.get(name, [default])[0]
+                body = self.listing_page(int(param('start', '0')), param('keywords'), param('location'),
+                                         param('f_TPR', 'r2592000'))
+                return 'linkedin-listing', 'text/html; charset=utf-8', body
+            if '/jobPosting/' in path:
+                body = self.detail_page(path.rsplit('/', 1)[1]).encode('utf-8')
+                return 'linkedin-detail', 'text/html; charset=utf-8', body
+        if host == 'www.googleapis.com':
+            if path == '/customsearch/v1':
+                body = self.search_results(query.get('q', [''])[0], int(query.get('num', ['10'])[0]))
+                return 'google-cse', 'application/json', body
+            return None
+        return 'rss', 'application/rss+xml', self.feed
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                host = self.headers.get(REPLAY_HOST_HEADER) or self.headers.get('Host', '')
+                routed = server.route(host, parts.path, parse_qs(parts.query))
+                fault, delay = server._draw()
+                if delay:
+                    time.sleep(delay)
+                route = routed[0] if routed else 'unknown'
+                status = fault or (200 if routed else 404)
+                etag = f'"{zlib.crc32(routed[2]):08x}"' if routed else None
+                if status == 200 and etag in self.headers.get('If-None-Match', ''):
+                    status = 304
+                with server._lock:
+                    server.requests[(route, status)] += 1
+                if status != 200:
+                    self.send_response(status)
+                    if status == 429:
+                        self.send_header('Retry-After', str(server.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                _, content_type, body = routed
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = FixtureServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                           retry_after=args.retry_after, pages=args.pages, seed=args.seed)
+    # First line of output is the address, for scripts that start the server
+    print(server.url, flush=True)
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.summary()), file=sys.stderr)
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
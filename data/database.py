@@ -1,68 +1,187 @@
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timezone
+from contextlib import contextmanager
+from itertools import batched
+import threading
+import atexit
+import base64
 import json
+import os
+import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.job_stats import remote_expr
+from data.job_tags import TAGS, normalize_sql
+from data.job_record import Job, job_row_factory
+from data.dedup import NearDuplicateIndex, job_match_key, job_simhash, unlinked_expr
+from data.known_jobs import load_known_job_ids
+from data.feed_state import load_feed_state, mark_entries_seen, record_poll, store_validators, unseen_entries
+from data.source_schedule import load_schedule, record_run, record_start, schedule_source
+from data.page_archive import archive_pages
+from data.frontier import complete_jobs
+from data.migrations import migrate
+
+DB_PATH = os.getenv('JOBS_DB_PATH') or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.db')
+
+
+class ConnectionManager:
+    """
+    Pool of long-lived SQLite connections shared by every database helper.
+
+    Connections are opened once, tuned with the pragmas below and handed back
+    to an idle stack after each call, so repeated calls reuse both the open
+    file handle and sqlite3's per-connection prepared statement cache.
+    """
+
+    PRAGMAS = (
+        ('journal_mode', 'WAL'),        # readers no longer block the writer
+        ('synchronous', 'NORMAL'),      # fsync on checkpoint instead of every commit
+        ('cache_size', -64000),         # 64MB page cache
+        ('mmap_size', 268435456),       # 256MB memory-mapped reads
+        ('temp_store', 'MEMORY'),
+        ('foreign_keys', 'ON'),
+    )
+
+    def __init__(self, db_path, max_idle=8, cached_statements=256, timeout=30.0, setup=None):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self.setup = setup
+        self._ready = setup is None
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,
+        )
+        for pragma, value in self.PRAGMAS:
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        if not self._ready:
+            # First connection to this file brings the schema up to date
+            with self._lock:
+                if not self._ready:
+                    self.setup(conn)
+                    self._ready = True
+        return conn
+
+    def acquire(self):
+        """Take an idle connection from the pool or open a new one"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def release(self, conn):
+        """Return a connection to the pool, closing it if the pool is full"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of a with-block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Borrow a pooled connection and commit (or roll back) on exit"""
+        with self.connection() as conn:
+            with conn:
+                yield conn
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def reset(self, db_path):
+        """Close idle connections and point the pool at another file"""
+        self.close_all()
+        self.db_path = db_path
+        self._ready = self.setup is None
+
+
+def set_db_path(db_path):
+    """Point the shared connection pool at a different database file"""
+    global DB_PATH
+    DB_PATH = db_path
+    db.reset(db_path)
+
 
 def init_db():
-    """Initialize the database and create tables if they don't exist"""
-    import os
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.db')
-    print(f"📁 Initializing database: {db_path}")
+    """Initialize the database, migrating the schema if needed - existing jobs are kept"""
+    print(f"📁 Initializing database: {db.db_path}")
     
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
+    with db.connection() as conn:
+        ensure_schema(conn)
 
-    # Drop existing table if it exists
-    c.execute('DROP TABLE IF EXISTS jobs')
-
-    # Create table with current schema
-    c.execute('''
-        CREATE TABLE jobs(
-            job_id TEXT PRIMARY KEY,
-            job_url TEXT,
-            source TEXT,
-            title TEXT,
-            company_name TEXT,
-            description TEXT,
-            location TEXT,
-            city TEXT,
-            state TEXT,
-            country TEXT,
-            remote TEXT,
-            industry TEXT,
-            seniority_level TEXT,
-            employment_type TEXT,
-            job_function TEXT,
-            salary_raw TEXT,
-            salary_min INTEGER,
-            salary_max INTEGER,
-            salary_avg DECIMAL,
-            yoe_raw TEXT,
-            yoe_min INTEGER,
-            yoe_max INTEGER,
-            yoe_avg DECIMAL,
-            education TEXT,
-            skills TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
 
-    # Add indexes for common queries
-    c.execute('CREATE INDEX IF NOT EXISTS idx_company ON jobs(company_name)')
-    c.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON jobs(created_at)')
+INSERT_JOB_SQL = '''
+    INSERT INTO jobs (job_id, job_url, source, title, company_name, location, city, state, country, remote,
+                    industry, description, seniority_level, employment_type, job_function, 
+                    salary_raw, salary_min, salary_max, salary_avg, yoe_raw, yoe_min, yoe_max, yoe_avg, 
+                    education, skills) 
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Column order used by the bulk ingest path; created_at falls back to now
+BULK_JOB_COLUMNS = (
+    'job_id', 'job_url', 'source', 'title', 'company_name', 'location', 'city', 'state', 'country', 'remote',
+    'industry', 'description', 'seniority_level', 'employment_type', 'job_function',
+    'salary_raw', 'salary_min', 'salary_max', 'salary_avg', 'yoe_raw', 'yoe_min', 'yoe_max', 'yoe_avg',
+    'education', 'skills', 'created_at',
+)
+
+UPSERT_JOB_SQL = f'''
+    INSERT INTO jobs ({', '.join(BULK_JOB_COLUMNS)})
+    VALUES ({', '.join('?' * (len(BULK_JOB_COLUMNS) - 1))}, COALESCE(?, CURRENT_TIMESTAMP))
+    ON CONFLICT(job_id) DO NOTHING
+'''
 
-    conn.commit()
-    conn.close()
+
+SNIPPET_OPEN = '<mark>'
+SNIPPET_CLOSE = '</mark>'
+
+
+def ensure_schema(conn):
+    """Apply any pending schema migrations without touching existing data"""
+    applied = migrate(conn)
+    if applied:
+        print(f"🔧 Applied schema migrations: {', '.join(map(str, applied))}")
+
+db = ConnectionManager(DB_PATH, setup=ensure_schema)
+atexit.register(db.close_all)
+
+
+def _index_fingerprint(conn, job):
+    """Make a stored job findable by near-duplicate checks (single-row helpers don't skip any)"""
+    fingerprint = job_simhash(job)
+    if fingerprint is not None:
+        index = NearDuplicateIndex(conn)
+        index.add(job['job_id'], fingerprint, job_match_key(job))
+        index.flush()
 
 def store_job(job_id, job_url, source, title, company_name, description, location, city, state, country, 
               remote, industry, seniority_level, employment_type, job_function, salary_raw, salary_min, 
               salary_max, salary_avg, yoe_raw, yoe_min, yoe_max, yoe_avg, education, skills):
     """Store a single job in the database"""
-    import os
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.db')
-    
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-
     try:
         # Convert lists to JSON strings if they are lists
         if isinstance(education, list):
@@ -70,20 +189,16 @@ def store_job(job_id, job_url, source, title, company_name, description, locatio
         if isinstance(skills, list):
             skills = json.dumps(skills)
         
-        c.execute('''
-            INSERT INTO jobs (job_id, job_url, source, title, company_name, location, city, state, country, remote,
-                            industry, description, seniority_level, employment_type, job_function, 
-                            salary_raw, salary_min, salary_max, salary_avg, yoe_raw, yoe_min, yoe_max, yoe_avg, 
-                            education, skills) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            job_id, job_url, source, title, company_name, location, city, state, country, remote,
-            industry, description, seniority_level, employment_type, job_function,
-            salary_raw, salary_min, salary_max, salary_avg, yoe_raw, yoe_min, yoe_max, yoe_avg,
-            education, skills
-        ))
-        
-        conn.commit()
+        with db.transaction() as conn:
+            conn.execute(INSERT_JOB_SQL, (
+                job_id, job_url, source, title, company_name, location, city, state, country, remote,
+                industry, description, seniority_level, employment_type, job_function,
+                salary_raw, salary_min, salary_max, salary_avg, yoe_raw, yoe_min, yoe_max, yoe_avg,
+                education, skills
+            ))
+            _index_fingerprint(conn, {'job_id': job_id, 'title': title, 'company_name': company_name,
+                                      'description': description, 'location': location, 'city': city,
+                                      'state': state, 'remote': remote})
         return True
         
     except sqlite3.IntegrityError:
@@ -92,8 +207,6 @@ def store_job(job_id, job_url, source, title, company_name, description, locatio
     except Exception as e:
         print(f"Error storing job: {e}")
         return False
-    finally:
-        conn.close()
 
 def store_jobs(job_data):
     """Store a job in the database
@@ -101,249 +214,525 @@ def store_jobs(job_data):
     Args:
         job_data (dict): Dictionary containing job information
     """
-    import os
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.db')
-    
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-
     try:
         # Convert lists to JSON strings
         education = json.dumps(job_data.get('education', []))
         skills = json.dumps(job_data.get('skills', []))
         
-        c.execute('''
-            INSERT INTO jobs (job_id, job_url, source, title, company_name, location, city, state, country, remote,
-                            industry, description, seniority_level, employment_type, job_function, 
-                            salary_raw, salary_min, salary_max, salary_avg, yoe_raw, yoe_min, yoe_max, yoe_avg, 
-                            education, skills) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            job_data.get('job_id'),
-            job_data.get('job_url'),
-            job_data.get('source'),
-            job_data.get('title'),
-            job_data.get('company_name'),
-            job_data.get('location'),
-            job_data.get('city'),
-            job_data.get('state'),
-            job_data.get('country'),
-            job_data.get('remote'),
-            job_data.get('industry'),
-            job_data.get('description'),
-            job_data.get('seniority_level'),
-            job_data.get('employment_type'),
-            job_data.get('job_function'),
-            job_data.get('salary_raw'),
-            job_data.get('salary_min'),
-            job_data.get('salary_max'),
-            job_data.get('salary_avg'),
-            job_data.get('yoe_raw'),
-            job_data.get('yoe_min'),
-            job_data.get('yoe_max'),
-            job_data.get('yoe_avg'),
-            education,  # Now using JSON string
-            skills     # Now using JSON string
-        ))
-        conn.commit()
+        with db.transaction() as conn:
+            conn.execute(INSERT_JOB_SQL, (
+                job_data.get('job_id'),
+                job_data.get('job_url'),
+                job_data.get('source'),
+                job_data.get('title'),
+                job_data.get('company_name'),
+                job_data.get('location'),
+                job_data.get('city'),
+                job_data.get('state'),
+                job_data.get('country'),
+                job_data.get('remote'),
+                job_data.get('industry'),
+                job_data.get('description'),
+                job_data.get('seniority_level'),
+                job_data.get('employment_type'),
+                job_data.get('job_function'),
+                job_data.get('salary_raw'),
+                job_data.get('salary_min'),
+                job_data.get('salary_max'),
+                job_data.get('salary_avg'),
+                job_data.get('yoe_raw'),
+                job_data.get('yoe_min'),
+                job_data.get('yoe_max'),
+                job_data.get('yoe_avg'),
+                education,  # Now using JSON string
+                skills     # Now using JSON string
+            ))
+            _index_fingerprint(conn, job_data)
         print(f"Successfully stored job {job_data.get('job_id')}")
     except sqlite3.IntegrityError:
         print(f"Job {job_data.get('job_id')} already exists in database")
     except Exception as e:
         print(f"Error storing job {job_data.get('job_id')}: {str(e)}")
-    finally:
-        conn.close()
 
-def clear_jobs():
-    """Delete all jobs from the database."""
-    import os
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.db')
+_JSON_COLUMN_POSITIONS = (BULK_JOB_COLUMNS.index('education'), BULK_JOB_COLUMNS.index('skills'))
+_encode_json = json.JSONEncoder().encode
+
+def _bulk_job_row(job_data):
+    row = list(map(job_data.get, BULK_JOB_COLUMNS))
+    for i in _JSON_COLUMN_POSITIONS:
+        value = row[i]
+        if not isinstance(value, str):
+            row[i] = _encode_json(value) if value else '[]'
+    return row
+
+def _stored_job_ids(conn, jobs):
+    return {row[0] for row in conn.execute(
+        'SELECT job_id FROM jobs WHERE job_id IN (SELECT value FROM json_each(?))',
+        (json.dumps([job.get('job_id') for job in jobs]),)
+    )}
+
+def store_jobs_bulk(records, batch_size=500, skip_near_duplicates=True):
+    """Store many jobs with executemany, one transaction per batch
     
-    conn = sqlite3.connect(db_path)
+    Existing job_ids are skipped rather than raising, so the whole batch
+    commits with a single fsync. Each new job is also fingerprinted (see
+    data/dedup.py); a near-duplicate of a stored job - the same posting
+    from another source, with the same title and a matching place - is
+    recorded in job_duplicates and not stored itself.
+    
+    Args:
+        records (iterable): Job dicts keyed by jobs column name
+        batch_size (int): Number of rows written per transaction
+        skip_near_duplicates (bool): False stores near-duplicates too; they
+            stay linked, and hidden from listings, search and statistics
+        
+    Returns:
+        Tuple of (new_jobs_count, duplicate_jobs_count); duplicates include
+        skipped near-duplicates
+    """
+    new_jobs = 0
+    duplicates = 0
+    near_duplicates = 0
+    
+    with db.connection() as conn:
+        for batch in batched(records, batch_size):
+            # Fingerprint jobs not stored yet, before taking the write lock
+            stored = _stored_job_ids(conn, batch)
+            fingerprints = {job.get('job_id'): job_simhash(job) for job in batch if job.get('job_id') not in stored}
+            rows = []
+            conn.execute('BEGIN IMMEDIATE')
+            with conn:
+                # Stored IDs are exact duplicates: neither stored again nor linked
+                existing = _stored_job_ids(conn, batch)
+                index = NearDuplicateIndex(conn)
+                index.load(fingerprints.values())
+                for job in batch:
+                    job_id = job.get('job_id')
+                    if job_id in existing:
+                        continue
+                    # A job deleted since the first look wasn't fingerprinted
+                    fingerprint = fingerprints[job_id] if job_id in fingerprints else job_simhash(job)
+                    if fingerprint is not None:
+                        match_key = job_match_key(job)
+                        match = index.find(job_id, fingerprint, match_key)
+                        if match:
+                            index.link(job, *match)
+                            near_duplicates += 1
+                            if skip_near_duplicates:
+                                continue
+                        index.add(job_id, fingerprint, match_key)
+                    rows.append(_bulk_job_row(job))
+                # Links first, so the statistics triggers see a stored duplicate as hidden
+                index.flush()
+                inserted = conn.executemany(UPSERT_JOB_SQL, rows).rowcount if rows else 0
+            new_jobs += inserted
+            duplicates += len(batch) - inserted
+    
+    if near_duplicates:
+        action = 'skipped' if skip_near_duplicates else 'linked'
+        print(f"🔁 {action.capitalize()} {near_duplicates} near-duplicate jobs")
+    return new_jobs, duplicates
+
+def store_job_pages(pages):
+    """Archive compressed raw pages (see data/page_archive.py) in one transaction
+
+    Args:
+        pages: (job_id, codec, blob, raw_size) tuples
+
+    Returns:
+        Number of pages archived
+    """
+    with db.transaction() as conn:
+        return archive_pages(conn, pages)
+
+def complete_crawled_jobs(jobs):
+    """Mark the crawl frontier pages of stored jobs done; a JobSink on_commit (see data/frontier.py)"""
+    with db.transaction() as conn:
+        complete_jobs(conn, [job['job_id'] for job in jobs])
+
+def clear_jobs():
+    """Delete all jobs from the database, and the crawl frontier that fetched them."""
+    with db.transaction() as conn:
+        conn.execute('DELETE FROM jobs')
+        conn.execute('DELETE FROM job_duplicates')
+        conn.execute('DELETE FROM crawl_frontier')
+        conn.execute('DELETE FROM crawl_runs')
+
+def _fetch_jobs(conn, sql, params=()):
+    """Run a SELECT over jobs and return its rows as Job records"""
     c = conn.cursor()
-    c.execute('DELETE FROM jobs')
-    conn.commit()
-    conn.close()
+    c.row_factory = job_row_factory
+    return c.execute(sql, params).fetchall()
 
 def get_all_jobs():
-    """Retrieve all jobs from the database."""
-    import os
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.db')
-    
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    
-    c.execute('SELECT * FROM jobs')
-    jobs = c.fetchall()
-    
-    conn.close()
-    return jobs
+    """Retrieve all jobs from the database, less linked near-duplicates."""
+    with db.connection() as conn:
+        return _fetch_jobs(conn, f'SELECT * FROM jobs WHERE {unlinked_expr()}')
 
 def get_job_by_id(job_id):
     """Retrieve a specific job by its ID."""
-    import os
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.db')
-    
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    
-    c.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,))
-    job = c.fetchone()
+    with db.connection() as conn:
+        jobs = _fetch_jobs(conn, 'SELECT * FROM jobs WHERE job_id = ?', (job_id,))
+    return jobs[0] if jobs else None
+
+def get_known_job_ids(bloom=False):
+    """IDs of every stored or near-duplicate job, for incremental scraping (see data/known_jobs.py)"""
+    with db.connection() as conn:
+        return load_known_job_ids(conn, bloom=bloom)
+
+def get_feed_state(feed_url):
+    """Stored ETag/Last-Modified and poll counters of an RSS feed, or None (see data/feed_state.py)"""
+    with db.connection() as conn:
+        return load_feed_state(conn, feed_url)
+
+def record_feed_poll(feed_url, status, etag=None, last_modified=None):
+    """Store the outcome and validators of an RSS feed poll"""
+    with db.transaction() as conn:
+        record_poll(conn, feed_url, status, etag, last_modified)
+
+def set_feed_validators(feed_url, etag, last_modified):
+    with db.transaction() as conn:
+        store_validators(conn, feed_url, etag, last_modified)
+
+def get_unseen_feed_entries(feed_url, guids):
+    """The guids of a feed not seen in an earlier poll"""
+    with db.connection() as conn:
+        return unseen_entries(conn, feed_url, guids)
+
+def mark_feed_entries_seen(feed_url, guids):
+    with db.transaction() as conn:
+        mark_entries_seen(conn, feed_url, guids)
+
+def get_source_schedule():
+    """Next run and last-run outcome of every scheduled scrape source (see data/source_schedule.py)"""
+    with db.connection() as conn:
+        return load_schedule(conn)
+
+def set_source_next_run(name, kind, interval, next_run_at, skipped=0):
+    with db.transaction() as conn:
+        schedule_source(conn, name, kind, interval, next_run_at, skipped)
+
+def record_source_start(name):
+    with db.transaction() as conn:
+        record_start(conn, name)
+
+def record_source_run(name, status, duration, jobs=None, new_jobs=None, error=None):
+    """Store how a scheduled source run ended"""
+    with db.transaction() as conn:
+        record_run(conn, name, status, duration, jobs, new_jobs, error)
+
+def _match_terms(text):
+    """Turn free text into quoted FTS5 prefix terms (punctuation can't become query syntax)"""
+    return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', text.lower()))
+
+def build_match_query(title=None, location=None, keywords=None):
+    """Compile search inputs into an FTS5 MATCH expression, or None for no text filter"""
+    parts = []
+    for column, value in (('title', title), ('location', location), (None, keywords)):
+        # The agent sometimes passes the literal string 'None'
+        if not value or value == 'None':
+            continue
+        terms = _match_terms(value)
+        if terms:
+            parts.append(f'{column} : ({terms})' if column else f'({terms})')
+    return ' AND '.join(parts) or None
+
+def _since_timestamp(value):
+    # created_at is stored in UTC
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+# Range filters overlap the job's own min/max, e.g. salary_min=150000 keeps
+# jobs that pay up to at least 150k and yoe_max=3 keeps jobs open to 3 years
+RANGE_FILTERS = {
+    'salary_min': ('jobs.salary_max >= ?', int),
+    'salary_max': ('jobs.salary_min <= ?', int),
+    'yoe_min': ('jobs.yoe_max >= ?', int),
+    'yoe_max': ('jobs.yoe_min <= ?', int),
+    'posted_since': ('jobs.created_at >= ?', _since_timestamp),
+}
+CHOICE_FILTERS = ('seniority_level', 'employment_type', 'source')
+# skills keeps jobs listing every given skill, education jobs listing any given degree
+TAG_FILTERS = {'skills': 'all', 'education': 'any'}
+
+ORDERINGS = {
+    'newest': 'jobs.created_at DESC, jobs.job_id DESC',
+    'oldest': 'jobs.created_at ASC, jobs.job_id ASC',
+    'salary': 'jobs.salary_max DESC, jobs.job_id DESC',
+    'relevance': 'jobs_fts.rank',
+}
+
+# Orderings that can be paged with a (created_at, job_id) keyset cursor
+KEYSET_ORDERINGS = {'newest': '<', 'oldest': '>'}
+
+# salary/yoe are sparse, so walking created_at until LIMIT rows match can read
+# the whole table; the unary + stops the planner from preferring that index
+# over the range index when one of these filters is present
+SPARSE_RANGE_FILTERS = ('salary_min', 'salary_max', 'yoe_min', 'yoe_max')
+UNINDEXED_ORDERINGS = {
+    'newest': '+jobs.created_at DESC, +jobs.job_id DESC',
+    'oldest': '+jobs.created_at ASC, +jobs.job_id ASC',
+}
+
+# Columns the job list renders; the full description comes from get_job_by_id
+LIST_COLUMNS = (
+    'jobs.job_id, jobs.job_url, jobs.source, jobs.title, jobs.company_name, jobs.location, '
+    'jobs.city, jobs.state, jobs.country, jobs.remote, jobs.seniority_level, jobs.employment_type, '
+    'jobs.salary_min, jobs.salary_max, jobs.salary_avg, jobs.created_at, '
+    'substr(jobs.description, 1, 300) AS description'
+)
+
+def _clean_filters(filters):
+    return {k: v for k, v in (filters or {}).items() if v is not None and v != '' and v != []}
+
+def _tag_clause(column, names):
+    table, id_col, link_table, _ = TAGS[column]
+    return (
+        f'jobs.job_id IN (SELECT {link_table}.job_id FROM {link_table} JOIN {table} USING ({id_col}) '
+        f'WHERE {table}.name IN ({", ".join([normalize_sql(column)] * len(names))}))'
+    )
+
+def _filter_clauses(filters):
+    """WHERE clauses and params for a cleaned filter spec"""
+    clauses = []
+    params = []
+    for key, value in filters.items():
+        if key in RANGE_FILTERS:
+            clause, convert = RANGE_FILTERS[key]
+            try:
+                params.append(convert(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid value for {key}: {value!r}")
+            clauses.append(clause)
+        elif key in CHOICE_FILTERS:
+            values = [value] if isinstance(value, str) else list(value)
+            clauses.append(f"jobs.{key} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        elif key in TAG_FILTERS:
+            values = [value] if isinstance(value, str) else [str(v) for v in value]
+            if TAG_FILTERS[key] == 'all':
+                # One semi-join per name, each a lookup on the link table's primary key
+                for name in values:
+                    clauses.append(_tag_clause(key, [name]))
+                    params.append(name)
+            else:
+                clauses.append(_tag_clause(key, values))
+                params.extend(values)
+        elif key == 'remote':
+            clauses.append(f"{remote_expr('jobs.')} = ?")
+            params.append(1 if value else 0)
+        else:
+            raise ValueError(f"Unknown filter '{key}'")
+    return clauses, params
+
+def _select_jobs(columns, clauses, params, match=None):
+    """SELECT over jobs (joined to the FTS index when matching) with the given WHERE clauses
+
+    Linked near-duplicates are always left out.
+    """
+    clauses = [*clauses, unlinked_expr()]
+    if match:
+        sql = f'SELECT {columns} FROM jobs_fts JOIN jobs ON jobs.rowid = jobs_fts.rowid'
+        clauses = ['jobs_fts MATCH ?', *clauses]
+        params = [match, *params]
+    else:
+        sql = f'SELECT {columns} FROM jobs'
+    sql += ' WHERE ' + ' AND '.join(clauses)
+    return sql, params
+
+def compile_job_query(filters=None, match=None, order_by=None, limit=50, columns='jobs.*', after=None):
+    """Compile a filter spec into parameterized SQL
     
-    if job:
-        # Get column names
-        c.execute("PRAGMA table_info(jobs)")
-        columns = [col[1] for col in c.fetchall()]
+    Args:
+        filters (dict): Any of salary_min, salary_max, yoe_min, yoe_max (ints),
+            remote (bool), seniority_level, employment_type, source, skills,
+            education (str or list) and posted_since (datetime or 'YYYY-MM-DD[ HH:MM:SS]')
+        match (str): Optional FTS5 MATCH expression from build_match_query
+        order_by (str): One of ORDERINGS; defaults to relevance when matching, else newest
+        limit (int): Maximum rows returned
+        columns (str): Select list
+        after (tuple): (created_at, job_id) of the last row already seen;
+            only valid with the newest/oldest orderings
         
-        # Convert to dictionary
-        job_dict = {}
-        for i, col in enumerate(columns):
-            # Convert JSON strings back to Python objects
-            if col in ['education', 'skills'] and job[i]:
-                try:
-                    job_dict[col] = json.loads(job[i])
-                except:
-                    job_dict[col] = job[i]
-            else:
-                job_dict[col] = job[i]
+    Returns:
+        Tuple of (sql, params)
         
-        conn.close()
-        return job_dict
-    
-    conn.close()
-    return None
+    Raises:
+        ValueError: On an unknown filter, ordering or malformed value
+    """
+    filters = _clean_filters(filters)
+    order_by = order_by or ('relevance' if match else 'newest')
+    if order_by not in ORDERINGS or (order_by == 'relevance' and not match):
+        raise ValueError(f"Unknown ordering '{order_by}'")
+    
+    clauses, params = _filter_clauses(filters)
+    
+    if after is not None:
+        if order_by not in KEYSET_ORDERINGS:
+            raise ValueError(f"Ordering '{order_by}' does not support cursors")
+        clauses.append(f'(jobs.created_at, jobs.job_id) {KEYSET_ORDERINGS[order_by]} (?, ?)')
+        params.extend(after)
+    
+    sql, params = _select_jobs(columns, clauses, params, match)
+    ordering = ORDERINGS[order_by]
+    if order_by in UNINDEXED_ORDERINGS and any(key in filters for key in SPARSE_RANGE_FILTERS):
+        ordering = UNINDEXED_ORDERINGS[order_by]
+    sql += f' ORDER BY {ordering} LIMIT ?'
+    params.append(int(limit))
+    return sql, params
 
-def search_jobs(title=None, location=None, num_jobs=5):
-    """Search jobs in the database by title and location"""
-    print(f"🔍 search_jobs called with: title='{title}', location='{location}', num_jobs={num_jobs}")
+def search_jobs(title=None, location=None, num_jobs=5, keywords=None, filters=None, order_by=None):
+    """Search jobs by title, location, free-text keywords and structured filters
     
-    # Get the absolute path to the database file
-    import os
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.db')
-    print(f"📁 Using database: {db_path}")
-    
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
+    Text matches are ranked by BM25 and carry a 'snippet' with the matched
+    terms wrapped in SNIPPET_OPEN/SNIPPET_CLOSE. See compile_job_query for
+    the filter spec. Only the top num_jobs rows are read.
     
-    # Get all jobs
-    c.execute('SELECT * FROM jobs')
-    jobs = c.fetchall()
-    print(f"📊 Total jobs in database: {len(jobs)}")
-    
-    # Get column names
-    c.execute("PRAGMA table_info(jobs)")
-    columns = [col[1] for col in c.fetchall()]
+    Returns:
+        List of Job records
+    """
+    print(f"🔍 search_jobs called with: title='{title}', location='{location}', keywords='{keywords}', filters={filters}, num_jobs={num_jobs}")
     
-    # Convert to list of dictionaries
-    job_dicts = []
-    for row in jobs:
-        job = {}
-        for i, col in enumerate(columns):
-            # Convert JSON strings back to Python objects
-            if col in ['education', 'skills'] and row[i]:
-                try:
-                    job[col] = json.loads(row[i])
-                except:
-                    job[col] = row[i]
-            else:
-                job[col] = row[i]
-        job_dicts.append(job)
+    match = build_match_query(title, location, keywords)
+    columns = 'jobs.*'
+    params = []
+    if match:
+        columns += ", snippet(jobs_fts, -1, ?, ?, '…', 24) AS snippet"
+        params = [SNIPPET_OPEN, SNIPPET_CLOSE]
+    sql, filter_params = compile_job_query(filters, match, order_by, num_jobs, columns)
     
-    # Filter jobs based on title and location
-    filtered_jobs = []
+    with db.connection() as conn:
+        jobs = _fetch_jobs(conn, sql, params + filter_params)
     
-    for job in job_dicts:
-        job_title = job.get('title', '').lower()
-        job_location = job.get('location', '').lower()
-        
-        # Check title match (if title is provided, it must match)
-        title_match = not title or title == 'None' or (title and title.lower() in job_title)
-        
-        # Check location match (if location is provided, it must match)
-        location_match = not location or location == 'None' or (location and location.lower() in job_location)
-        
-        if title_match and location_match:
-            filtered_jobs.append(job)
-            if len(filtered_jobs) >= num_jobs:
-                break
-    
-    conn.close()
-    return filtered_jobs
+    print(f"📊 Matched {len(jobs)} jobs")
+    return jobs
 
-def get_job_statistics(days_back=7, title_filter=None):
-    """Get comprehensive statistics about jobs in the database"""
-    import os
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jobs.db')
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    
-    # Get total job count
-    c.execute('SELECT COUNT(*) FROM jobs')
-    total_jobs = c.fetchone()[0]
-    
-    # Get recent jobs (last X days)
-    c.execute('''
-        SELECT COUNT(*) FROM jobs 
-        WHERE created_at >= datetime('now', '-{} days')
-    '''.format(days_back))
-    recent_jobs = c.fetchone()[0]
+def encode_cursor(job):
+    """Opaque page cursor pointing just past the given job"""
+    key = json.dumps([job['created_at'], job['job_id']])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        created_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(created_at), str(job_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def list_jobs(filters=None, cursor=None, page_size=25, order_by='newest', title=None, location=None, keywords=None):
+    """Fetch one page of list-view Job records (LIST_COLUMNS) using keyset pagination
     
-    # Get top companies
-    c.execute('''
-        SELECT company_name, COUNT(*) as job_count 
-        FROM jobs 
-        GROUP BY company_name 
-        ORDER BY job_count DESC 
-        LIMIT 10
-    ''')
-    top_companies = c.fetchall()
+    Pages are addressed by the (created_at, job_id) of the last job seen,
+    so deep pages cost the same as the first one. Other orderings return a
+    single page.
     
-    # Get top locations
-    c.execute('''
-        SELECT location, COUNT(*) as job_count 
-        FROM jobs 
-        WHERE location IS NOT NULL AND location != ''
-        GROUP BY location 
-        ORDER BY job_count DESC 
-        LIMIT 10
-    ''')
-    top_locations = c.fetchall()
+    Returns:
+        Tuple of (jobs, next_cursor); next_cursor is None on the last page
+    """
+    after = decode_cursor(cursor) if cursor else None
+    match = build_match_query(title, location, keywords)
+    # Read one extra row to learn whether another page exists
+    sql, params = compile_job_query(filters, match, order_by, page_size + 1, LIST_COLUMNS, after)
+    
+    with db.connection() as conn:
+        rows = _fetch_jobs(conn, sql, params)
+    
+    jobs = rows[:page_size]
+    has_more = len(rows) > page_size and order_by in KEYSET_ORDERINGS
+    next_cursor = encode_cursor(jobs[-1]) if has_more else None
+    return jobs, next_cursor
+
+def get_tag_frequency(column='skills', limit=20, filters=None, title=None, location=None, keywords=None):
+    """Most common skills (column='skills') or degrees (column='education') among matching jobs
     
-    # Get employment types
-    c.execute('''
-        SELECT employment_type, COUNT(*) as job_count 
-        FROM jobs 
-        WHERE employment_type IS NOT NULL AND employment_type != ''
-        GROUP BY employment_type 
-        ORDER BY job_count DESC
-    ''')
-    employment_types = c.fetchall()
+    Counts are GROUP BYs over the job_skills/job_education link tables, so no
+    JSON is decoded. Takes the same filters and text search as search_jobs.
     
-    # Get remote vs onsite
-    c.execute('''
-        SELECT 
-            CASE 
-                WHEN remote = '1' OR LOWER(location) LIKE '%remote%' THEN 'Remote'
-                ELSE 'On-site'
-            END as work_type,
-            COUNT(*) as job_count
-        FROM jobs 
-        GROUP BY work_type
-    ''')
-    work_types = c.fetchall()
+    Returns:
+        List of {'name': ..., 'count': ...} dicts, most common first
+    """
+    if column not in TAGS:
+        raise ValueError(f"Unknown tag column '{column}'")
+    table, id_col, link_table, _ = TAGS[column]
+    
+    clauses, params = _filter_clauses(_clean_filters(filters))
+    match = build_match_query(title, location, keywords)
+    sql = f'SELECT {table}.name, COUNT(*) AS job_count FROM {link_table} JOIN {table} USING ({id_col})'
+    if clauses or match:
+        jobs_sql, params = _select_jobs('jobs.job_id', clauses, params, match)
+        sql += f' WHERE {link_table}.job_id IN ({jobs_sql})'
+    else:
+        sql += f' WHERE {link_table}.job_id NOT IN (SELECT job_id FROM job_duplicates)'
+    sql += f' GROUP BY {link_table}.{id_col} ORDER BY job_count DESC, {table}.name LIMIT ?'
+    params.append(int(limit))
+    
+    with db.connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [{'name': name, 'count': count} for name, count in rows]
+
+def get_job_statistics(days_back=7, title_filter=None):
+    """Get comprehensive statistics about jobs in the database
     
-    # Get jobs by title filter if provided
-    title_stats = {}
-    if title_filter:
+    Reads the job_stats_* rollup tables, so the cost is proportional to the
+    number of groups rather than jobs. recent_jobs counts whole days: jobs
+    created on or after the date days_back days ago.
+    """
+    with db.connection() as conn:
+        c = conn.cursor()
+
+        # Totals, recent jobs and salary come from the per-day rollup
         c.execute('''
-            SELECT COUNT(*) FROM jobs 
-            WHERE LOWER(title) LIKE LOWER(?)
-        ''', (f'%{title_filter}%',))
-        title_stats['count'] = c.fetchone()[0]
-        title_stats['filter'] = title_filter
-    
-    conn.close()
-    
+            SELECT IFNULL(SUM(job_count), 0),
+                   IFNULL(SUM(CASE WHEN day >= date('now', ?) THEN job_count END), 0),
+                   IFNULL(SUM(salary_count), 0),
+                   SUM(salary_sum)
+            FROM job_stats_day
+        ''', (f'-{int(days_back)} days',))
+        total_jobs, recent_jobs, salary_count, salary_sum = c.fetchone()
+
+        # Get top companies
+        c.execute('''
+            SELECT company_name, job_count 
+            FROM job_stats_company 
+            ORDER BY job_count DESC 
+            LIMIT 10
+        ''')
+        top_companies = c.fetchall()
+
+        # Get top locations
+        c.execute('''
+            SELECT location, job_count 
+            FROM job_stats_location 
+            ORDER BY job_count DESC 
+            LIMIT 10
+        ''')
+        top_locations = c.fetchall()
+
+        # Get employment types
+        c.execute('''
+            SELECT employment_type, job_count 
+            FROM job_stats_employment_type 
+            ORDER BY job_count DESC
+        ''')
+        employment_types = c.fetchall()
+
+        # Get remote vs onsite
+        c.execute('SELECT work_type, job_count FROM job_stats_work_type ORDER BY work_type')
+        work_types = c.fetchall()
+
+        # Get jobs by title filter if provided
+        title_stats = {}
+        match = build_match_query(title=title_filter)
+        if match:
+            sql, params = _select_jobs('COUNT(*)', [], [], match)
+            c.execute(sql, params)
+            title_stats['count'] = c.fetchone()[0]
+            title_stats['filter'] = title_filter
+
+    remote_jobs = dict(work_types).get('Remote', 0)
     return {
         'total_jobs': total_jobs,
         'recent_jobs': recent_jobs,
@@ -352,6 +741,9 @@ def get_job_statistics(days_back=7, title_filter=None):
         'top_locations': [{'location': location, 'count': count} for location, count in top_locations],
         'employment_types': [{'type': emp_type, 'count': count} for emp_type, count in employment_types],
         'work_types': [{'type': work_type, 'count': count} for work_type, count in work_types],
+        'remote_jobs': remote_jobs,
+        'remote_percentage': remote_jobs / total_jobs * 100 if total_jobs else 0.0,
+        'avg_salary': salary_sum / salary_count if salary_count else None,
         'title_stats': title_stats
     }
 
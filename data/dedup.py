@@ -0,0 +1,442 @@
+"""
+Near-duplicate job detection - SimHash fingerprints with banded LSH lookup
+
+The same role reaches us from LinkedIn, RSS feeds and Google results under
+different IDs, often with small edits. Each stored job gets a 64-bit
+SimHash of its normalized title, company and description. The fingerprint
+is split into BANDS bands, and each band value is indexed in SQLite. Two
+fingerprints within MAX_DISTANCE bits of each other (MAX_DISTANCE < BANDS)
+must agree on at least one band, so finding near-duplicates of a new job
+is a handful of index lookups plus a Hamming check on the few candidates,
+whatever the size of the corpus.
+
+Similar text is not enough on its own: templated postings (the same role
+hired in many cities, or sibling roles sharing a boilerplate description)
+hash within a few bits of each other. A candidate only counts as a
+near-duplicate if its match key agrees too: the normalized title must be
+equal, and the place must not conflict. Sources describe places
+differently (LinkedIn gives city and state, RSS and Google a free-text
+location that is often missing), so places are compared only when both
+jobs have one, by city and, where both give it, state.
+
+Near-duplicates found at ingest are recorded in job_duplicates against the
+job they duplicate, keeping the alternate URL and source, and are not
+stored as jobs. One stored all the same on request stays linked and is
+hidden from listings, search and statistics (unlinked_expr).
+
+    python data/dedup.py backfill   # fingerprint jobs stored before dedup existed
+"""
+
+import argparse
+from array import array
+import hashlib
+import json
+import os
+import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.extraction import split_location
+
+
+SIMHASH_BITS = 64
+# MAX_DISTANCE + 1 bands of 12-13 bits: a lookup reads about
+# BANDS / 2**12 of the corpus as candidates (~100 rows per 100k jobs)
+MAX_DISTANCE = 4
+BANDS = MAX_DISTANCE + 1
+BAND_WIDTHS = [SIMHASH_BITS // BANDS + (band < SIMHASH_BITS % BANDS) for band in range(BANDS)]
+# Postings with fewer (weighted) features than this are too short to compare safely
+MIN_FEATURES = 12
+# Title and company tokens count several times so short postings that
+# share them still hash close together
+TITLE_WEIGHT = 4
+COMPANY_WEIGHT = 4
+
+# Normalized cities that name no place
+UNKNOWN_PLACES = {'', 'location not specified', 'remote', 'united states'}
+
+_MASK = 2 ** SIMHASH_BITS - 1
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+')
+# ASCII characters \w doesn't match, mapped to spaces: for ASCII text
+# translate + split finds the same words as _WORD_RE, about 3x faster
+_ASCII_NON_WORD = {i: ' ' for i in range(128) if not (chr(i).isalnum() or chr(i) == '_')}
+# _BIT_TABLES[b] maps a byte to its bit b, for counting set bits column-wise
+_BIT_TABLES = [bytes((value >> bit) & 1 for value in range(256)) for bit in range(8)]
+# Words summed at once: each byte of the sum counts up to 255 set bits
+_SUM_WORDS = 255
+_EVEN_BYTES = 0x00FF00FF00FF00FF
+# word -> its hash rotated by 0, 21 and 42 bits; job text reuses a small vocabulary
+_word_hashes = {}
+MAX_CACHED_WORDS = 200000
+
+
+def _words(text):
+    text = _TAG_RE.sub(' ', text or '').lower()
+    if text.isascii():
+        return text.translate(_ASCII_NON_WORD).split()
+    return _WORD_RE.findall(text)
+
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little')
+
+
+def _rotate(value, bits):
+    return (value << bits | value >> (SIMHASH_BITS - bits)) & _MASK
+
+
+def _word_hash(word):
+    hashes = _word_hashes.get(word)
+    if hashes is None:
+        if len(_word_hashes) >= MAX_CACHED_WORDS:
+            _word_hashes.clear()
+        value = _token_hash(word)
+        hashes = _word_hashes[word] = (value, _rotate(value, 21), _rotate(value, 42))
+    return hashes
+
+
+def feature_hashes(title, company_name, description):
+    """64-bit hashes of a posting's features, each repeated by its weight
+
+    Features are the distinct title and company tokens plus the distinct
+    3-word shingles of the description. A shingle's hash XORs its words'
+    cached hashes rotated by position (a cyclic-polynomial / buzhash
+    n-gram hash), so each word is hashed once rather than every shingle.
+    """
+    hashes = []
+    for prefix, text, weight in (('t', title, TITLE_WEIGHT), ('c', company_name, COMPANY_WEIGHT)):
+        for word in set(_words(text)):
+            hashes.extend([_token_hash(f'{prefix}:{word}')] * weight)
+    cache = _word_hashes
+    words = [cache[word] if word in cache else _word_hash(word) for word in _words(description)]
+    hashes.extend({a[0] ^ b[1] ^ c[2] for a, b, c in zip(words, words[1:], words[2:])})
+    return hashes
+
+
+def simhash(hashes):
+    """64-bit SimHash of a list of 64-bit feature hashes
+
+    Rather than looping over 64 bits per feature, the hashes are packed into
+    a byte string and bit b of every byte is kept with bytes.translate.
+    Summing the resulting words (as native integers, so byte order cancels
+    out) counts bit b for all eight byte positions at once; the byte-wide
+    counts are widened to 16 bits before they can overflow.
+    """
+    packed = array('Q', hashes).tobytes()
+    total = len(hashes)
+    chunk = _SUM_WORDS * 8
+    fingerprint = 0
+    for bit in range(8):
+        column = packed.translate(_BIT_TABLES[bit])
+        even = odd = 0
+        for start in range(0, len(column), chunk):
+            counts = sum(array('Q', column[start:start + chunk]))
+            even += counts & _EVEN_BYTES
+            odd += counts >> 8 & _EVEN_BYTES
+        for lane in range(4):
+            if (even >> 16 * lane & 0xFFFF) * 2 > total:
+                fingerprint |= 1 << (16 * lane + bit)
+            if (odd >> 16 * lane & 0xFFFF) * 2 > total:
+                fingerprint |= 1 << (16 * lane + 8 + bit)
+    return fingerprint
+
+
+def job_simhash(job):
+    """SimHash of a job dict keyed by jobs column name, or None if it has too little text"""
+    hashes = feature_hashes(job.get('title'), job.get('company_name'), job.get('description'))
+    if len(hashes) < MIN_FEATURES:
+        return None
+    return simhash(hashes)
+
+
+def _normalize(text):
+    return ' '.join(_words(text))
+
+
+def job_place(job):
+    """Normalized "city,state" (or "city"), from city/state or the location text; '' if unknown"""
+    city, state = job.get('city'), job.get('state')
+    if not city:
+        parts = split_location(job.get('location'))
+        city, state = parts['city'], parts['state']
+    city = _normalize(city)
+    if city in UNKNOWN_PLACES:
+        return ''
+    state = _normalize(state)
+    return f'{city},{state}' if state else city
+
+
+def job_match_key(job):
+    """Normalized title and place, as 'title|place'"""
+    return f"{_normalize(job.get('title'))}|{job_place(job)}"
+
+
+def keys_match(a, b):
+    """True if two match keys may belong to the same posting: equal titles, places not in conflict"""
+    title_a, _, place_a = a.partition('|')
+    title_b, _, place_b = b.partition('|')
+    if title_a != title_b:
+        return False
+    if not place_a or not place_b:
+        return True
+    city_a, _, state_a = place_a.partition(',')
+    city_b, _, state_b = place_b.partition(',')
+    return city_a == city_b and (not state_a or not state_b or state_a == state_b)
+
+
+def unlinked_expr(row='jobs'):
+    """SQL condition: the {row} job is not a linked near-duplicate
+
+    Near-duplicates are normally not stored; one stored all the same
+    (skip_near_duplicates=False) is hidden from listings and statistics.
+    """
+    return f'NOT EXISTS (SELECT 1 FROM job_duplicates WHERE job_duplicates.job_id = {row}.job_id)'
+
+
+def hamming_distance(a, b):
+    return ((a ^ b) & _MASK).bit_count()
+
+
+def band_keys(fingerprint):
+    """One integer per band: band index in the high bits, band value in the low 32"""
+    keys = []
+    for band, width in enumerate(BAND_WIDTHS):
+        keys.append(band << 32 | fingerprint & (2 ** width - 1))
+        fingerprint >>= width
+    return keys
+
+
+def _to_sqlite(fingerprint):
+    # SQLite integers are signed 64-bit
+    return fingerprint - 2 ** 64 if fingerprint >= 2 ** 63 else fingerprint
+
+
+def ensure_dedup_schema(c):
+    """Create the fingerprint, band and duplicate tables"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS job_fingerprints (
+            job_id TEXT PRIMARY KEY,
+            simhash INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS job_simhash_bands (
+            band_key INTEGER NOT NULL,
+            job_id TEXT NOT NULL,
+            PRIMARY KEY (band_key, job_id)
+        ) WITHOUT ROWID
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_job_simhash_bands_job ON job_simhash_bands(job_id)')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS job_duplicates (
+            job_id TEXT PRIMARY KEY,
+            duplicate_of TEXT NOT NULL,
+            distance INTEGER NOT NULL,
+            source TEXT,
+            job_url TEXT,
+            seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_job_duplicates_of ON job_duplicates(duplicate_of)')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS job_fingerprints_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM job_fingerprints WHERE job_id = old.job_id;
+            DELETE FROM job_simhash_bands WHERE job_id = old.job_id;
+        END
+    ''')
+
+
+class NearDuplicateIndex:
+    """Finds and records near-duplicates for one batch of jobs
+
+    load() pulls every stored fingerprint sharing a band with the batch in
+    one query; find() and add() then work in memory, so jobs earlier in the
+    batch are candidates too, and flush() writes the new rows with
+    executemany. Use it inside the write transaction that stores the jobs so
+    concurrent writers can't race between check and insert.
+
+    With keyed=False the index neither reads nor writes match keys, for
+    databases migrated only as far as the fingerprint tables (migration 7).
+    """
+
+    def __init__(self, conn, max_distance=MAX_DISTANCE, keyed=True):
+        self.conn = conn
+        self.max_distance = max_distance
+        self.keyed = keyed
+        self._bands = {}  # band_key -> [(job_id, fingerprint, match_key)]
+        self._fingerprints = []
+        self._band_rows = []
+        self._links = []
+
+    def load(self, fingerprints):
+        """Fetch stored candidates for a batch of fingerprints (None entries are ignored)"""
+        keys = {key for fingerprint in fingerprints if fingerprint is not None for key in band_keys(fingerprint)}
+        if not keys:
+            return
+        rows = self.conn.execute(
+            f"SELECT b.band_key, f.job_id, f.simhash, {'f.match_key' if self.keyed else 'NULL'} "
+            'FROM job_simhash_bands b '
+            'JOIN job_fingerprints f USING (job_id) '
+            'WHERE b.band_key IN (SELECT value FROM json_each(?))',
+            (json.dumps(list(keys)),)
+        )
+        for key, job_id, fingerprint, match_key in rows:
+            self._bands.setdefault(key, []).append((job_id, fingerprint & _MASK, match_key))
+
+    def find(self, job_id, fingerprint, match_key):
+        """(job_id, distance) of the closest known near-duplicate with a matching key, or None"""
+        best = None
+        for key in band_keys(fingerprint):
+            for other_id, other, other_key in self._bands.get(key, ()):
+                if other_id == job_id:
+                    # Same ID is an exact duplicate, handled by the jobs primary key
+                    continue
+                distance = hamming_distance(fingerprint, other)
+                if distance > self.max_distance or (best is not None and distance >= best[1]):
+                    continue
+                if other_key is None or not keys_match(match_key, other_key):
+                    # Same template, but another role or place
+                    continue
+                best = (other_id, distance)
+        return best
+
+    def add(self, job_id, fingerprint, match_key):
+        """Index a job's fingerprint (ignored on flush for a job_id that already has one)"""
+        self._fingerprints.append((job_id, _to_sqlite(fingerprint), match_key))
+        for key in band_keys(fingerprint):
+            self._bands.setdefault(key, []).append((job_id, fingerprint, match_key))
+            self._band_rows.append((key, job_id))
+
+    def link(self, job, duplicate_of, distance):
+        """Record a near-duplicate posting against the job it duplicates"""
+        self._links.append((job.get('job_id'), duplicate_of, distance, job.get('source'), job.get('job_url')))
+
+    def flush(self):
+        """Write the fingerprints, bands and links added so far"""
+        if self.keyed:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO job_fingerprints (job_id, simhash, match_key) VALUES (?, ?, ?)',
+                self._fingerprints
+            )
+        else:
+            self.conn.executemany('INSERT OR IGNORE INTO job_fingerprints (job_id, simhash) VALUES (?, ?)',
+                                  [row[:2] for row in self._fingerprints])
+        self.conn.executemany('INSERT OR IGNORE INTO job_simhash_bands (band_key, job_id) VALUES (?, ?)',
+                              self._band_rows)
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO job_duplicates (job_id, duplicate_of, distance, source, job_url) '
+            'VALUES (?, ?, ?, ?, ?)',
+            self._links
+        )
+        self._fingerprints, self._band_rows, self._links = [], [], []
+
+
+def refresh_fingerprints(conn, jobs):
+    """Recompute the fingerprints, bands and match keys of rewritten jobs; the caller commits
+
+    For jobs whose text or place changed after they were stored, e.g. by
+    re-extraction (data/page_archive.py). Only fingerprints that differ are
+    rewritten; a job left with too little text loses its fingerprint.
+
+    Returns:
+        Number of jobs whose fingerprint changed
+    """
+    jobs = list(jobs)
+    stored = {job_id: (fingerprint, match_key) for job_id, fingerprint, match_key in conn.execute(
+        'SELECT job_id, simhash, match_key FROM job_fingerprints WHERE job_id IN (SELECT value FROM json_each(?))',
+        (json.dumps([job['job_id'] for job in jobs]),)
+    )}
+    stale, fresh = [], []
+    for job in jobs:
+        fingerprint = job_simhash(job)
+        current = None if fingerprint is None else (_to_sqlite(fingerprint), job_match_key(job))
+        if stored.get(job['job_id']) == current:
+            continue
+        stale.append((job['job_id'],))
+        if fingerprint is not None:
+            fresh.append((job['job_id'], fingerprint, current[1]))
+    conn.executemany('DELETE FROM job_fingerprints WHERE job_id = ?', stale)
+    conn.executemany('DELETE FROM job_simhash_bands WHERE job_id = ?', stale)
+    conn.executemany('INSERT INTO job_fingerprints (job_id, simhash, match_key) VALUES (?, ?, ?)',
+                     [(job_id, _to_sqlite(fingerprint), match_key) for job_id, fingerprint, match_key in fresh])
+    conn.executemany('INSERT OR IGNORE INTO job_simhash_bands (band_key, job_id) VALUES (?, ?)',
+                     [(key, job_id) for job_id, fingerprint, _ in fresh for key in band_keys(fingerprint)])
+    return len(stale)
+
+
+# jobs columns a fingerprint and its match key are computed from
+FINGERPRINT_COLUMNS = ('job_id', 'title', 'company_name', 'description', 'city', 'state', 'location', 'remote')
+
+
+def backfill_match_keys(conn, batch_size=500):
+    """Key fingerprints stored before match keys existed, committing each batch
+
+    Keys in the old "title|place|remote" form, written before places became
+    a soft signal, are recomputed too.
+
+    Returns:
+        Number of fingerprints keyed
+    """
+    done = 0
+    while True:
+        rows = conn.execute(f'''
+            SELECT {', '.join('jobs.' + column for column in FINGERPRINT_COLUMNS)}
+            FROM job_fingerprints f JOIN jobs USING (job_id)
+            WHERE f.match_key IS NULL OR f.match_key LIKE '%|%|%' LIMIT ?
+        ''', (batch_size,)).fetchall()
+        if not rows:
+            return done
+        with conn:
+            conn.executemany('UPDATE job_fingerprints SET match_key = ? WHERE job_id = ?',
+                             [(job_match_key(dict(zip(FINGERPRINT_COLUMNS, row))), row[0]) for row in rows])
+        done += len(rows)
+
+
+def backfill_fingerprints(conn, batch_size=500, keyed=True):
+    """Fingerprint stored jobs that have none yet, committing each batch
+
+    Jobs already stored are indexed as-is; they are not deduplicated against
+    each other. keyed=False leaves match keys to backfill_match_keys, for a
+    database whose job_fingerprints has no match_key column yet.
+
+    Returns:
+        Number of jobs fingerprinted
+    """
+    done = 0
+    last_rowid = 0
+    while True:
+        rows = conn.execute(f'''
+            SELECT jobs.rowid, {', '.join('jobs.' + column for column in FINGERPRINT_COLUMNS)} FROM jobs
+            WHERE jobs.rowid > ? AND NOT EXISTS (SELECT 1 FROM job_fingerprints f WHERE f.job_id = jobs.job_id)
+            ORDER BY jobs.rowid LIMIT ?
+        ''', (last_rowid, batch_size)).fetchall()
+        if not rows:
+            return done
+        index = NearDuplicateIndex(conn, keyed=keyed)
+        for row in rows:
+            job = dict(zip(FINGERPRINT_COLUMNS, row[1:]))
+            fingerprint = job_simhash(job)
+            if fingerprint is not None:
+                index.add(job['job_id'], fingerprint, job_match_key(job))
+        with conn:
+            index.flush()
+        done += len(rows)
+        last_rowid = rows[-1][0]
+
+
+def main():
+    from data.database import db
+
+    parser = argparse.ArgumentParser(description='Maintain near-duplicate fingerprints')
+    parser.add_argument('command', choices=['backfill'])
+    parser.parse_args()
+
+    with db.connection() as conn:
+        count = backfill_fingerprints(conn)
+    print(f"✅ Fingerprinted {count} jobs")
+
+
+if __name__ == "__main__":
+    main()
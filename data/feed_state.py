@@ -0,0 +1,102 @@
+"""
+RSS feed poll state - conditional GET validators and seen entries per feed
+
+Every poll used to download and parse each whole feed again, and run every
+entry through the parser even when it had been stored the time before.
+Two tables let RSSJobScraper skip both:
+
+- feed_state: the ETag and Last-Modified of each feed's last response,
+  sent back as If-None-Match / If-Modified-Since so an unchanged feed
+  costs one 304 round trip, plus poll counters
+- feed_entries: the guids already seen per feed, so entries from earlier
+  polls are dropped before they are parsed
+"""
+
+import time
+
+
+def ensure_feed_schema(c):
+    """Create the feed poll state and seen-entry tables"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS feed_state (
+            feed_url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            last_status INTEGER,
+            polls INTEGER NOT NULL DEFAULT 0,
+            not_modified INTEGER NOT NULL DEFAULT 0,
+            last_polled_at REAL
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS feed_entries (
+            feed_url TEXT NOT NULL,
+            guid TEXT NOT NULL,
+            first_seen REAL NOT NULL,
+            PRIMARY KEY (feed_url, guid)
+        ) WITHOUT ROWID
+    ''')
+
+
+def load_feed_state(conn, feed_url):
+    """{'etag', 'last_modified', 'last_status', 'polls', 'not_modified'} of a feed, or None if never polled"""
+    row = conn.execute(
+        'SELECT etag, last_modified, last_status, polls, not_modified FROM feed_state WHERE feed_url = ?',
+        (feed_url,)
+    ).fetchone()
+    if row is None:
+        return None
+    return dict(zip(('etag', 'last_modified', 'last_status', 'polls', 'not_modified'), row))
+
+
+def conditional_headers(state):
+    """If-None-Match / If-Modified-Since for a feed's stored validators"""
+    headers = {}
+    if state and state['etag']:
+        headers['If-None-Match'] = state['etag']
+    if state and state['last_modified']:
+        headers['If-Modified-Since'] = state['last_modified']
+    return headers
+
+
+def record_poll(conn, feed_url, status, etag=None, last_modified=None, now=None):
+    """Store a poll's outcome; a 304 or failed poll keeps the validators it had"""
+    now = time.time() if now is None else now
+    if status != 200:
+        etag = last_modified = None
+    conn.execute('''
+        INSERT INTO feed_state (feed_url, etag, last_modified, last_status, polls, not_modified, last_polled_at)
+        VALUES (?, ?, ?, ?, 1, ?, ?)
+        ON CONFLICT(feed_url) DO UPDATE SET
+            etag = CASE WHEN excluded.last_status = 200 THEN excluded.etag ELSE etag END,
+            last_modified = CASE WHEN excluded.last_status = 200 THEN excluded.last_modified ELSE last_modified END,
+            last_status = excluded.last_status,
+            polls = polls + 1,
+            not_modified = not_modified + excluded.not_modified,
+            last_polled_at = excluded.last_polled_at
+    ''', (feed_url, etag, last_modified, status, int(status == 304), now))
+
+
+def store_validators(conn, feed_url, etag, last_modified):
+    """Keep the validators of a feed's last 200 once all its entries are stored"""
+    conn.execute('UPDATE feed_state SET etag = ?, last_modified = ? WHERE feed_url = ?',
+                 (etag, last_modified, feed_url))
+
+
+def unseen_entries(conn, feed_url, guids):
+    """The guids not seen in an earlier poll of the feed, in their original order"""
+    guids = list(guids)
+    seen = set()
+    for i in range(0, len(guids), 500):
+        chunk = guids[i:i + 500]
+        seen.update(guid for guid, in conn.execute(
+            f"SELECT guid FROM feed_entries WHERE feed_url = ? AND guid IN ({','.join('?' * len(chunk))})",
+            [feed_url, *chunk]
+        ))
+    return [guid for guid in guids if guid not in seen]
+
+
+def mark_entries_seen(conn, feed_url, guids, now=None):
+    now = time.time() if now is None else now
+    conn.executemany('INSERT OR IGNORE INTO feed_entries (feed_url, guid, first_seen) VALUES (?, ?, ?)',
+                     [(feed_url, guid, now) for guid in guids])
@@ -0,0 +1,348 @@
+"""
+Persistent crawl frontier - resumable, prioritized LinkedIn crawl state
+
+A long scrape used to keep its listing offset, retry delay and pending job
+IDs in local variables, so an interruption restarted the crawl from zero
+and refetched everything. The frontier keeps that state in jobs.db:
+
+- crawl_runs: one row per crawl, with its target job count; a crawl that
+  never finished is resumed by the next one with the same name
+- crawl_frontier: one row per URL to fetch - listing pages (with their
+  start offset) and jobPosting detail pages - with status (pending,
+  claimed, done, failed), attempts, priority and the time it may next be
+  tried
+
+Crawls with different names (one per source in the scheduler) share the
+tables but only claim, wait for and reset the items their own runs
+queued. Workers claim items atomically, highest priority first; detail
+pages are prioritized by job ID, so the newest postings are fetched first. A claim
+left behind by a crashed worker expires after `lease` seconds and is
+claimed again. Detail URLs are only ever inserted once, so a posting
+queued by any earlier crawl, of any name, is never fetched again, unless
+a crawl is started with refetch. A detail page stays claimed until its job is
+committed (complete_jobs, called by the JobSink the jobs go to); one
+fetched but lost before that is fetched again.
+
+    python data/frontier.py status
+    python data/frontier.py reset --name linkedin    # forget its unfinished runs, retry its failed pages
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+LISTING = 'listing'
+DETAIL = 'detail'
+PENDING, CLAIMED, DONE, FAILED = 'pending', 'claimed', 'done', 'failed'
+
+DEFAULT_LEASE = 300        # seconds before an unfinished claim may be taken over
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 30         # seconds before the first retry, doubling per attempt
+
+# Items queued by any run of the named crawl
+IN_CRAWL = 'run_id IN (SELECT run_id FROM crawl_runs WHERE name = ?)'
+
+
+def ensure_frontier_schema(c):
+    """Create the crawl run and frontier tables"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS crawl_runs (
+            run_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            target INTEGER,
+            started_at REAL NOT NULL,
+            finished_at REAL
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS crawl_frontier (
+            url TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            run_id INTEGER NOT NULL,
+            job_id TEXT,
+            cursor INTEGER,
+            priority INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            available_at REAL NOT NULL DEFAULT 0,
+            claimed_by TEXT,
+            claimed_at REAL,
+            last_error TEXT
+        )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_crawl_frontier_claim ON crawl_frontier(kind, status, priority DESC)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_crawl_frontier_run ON crawl_frontier(run_id, kind)')
+    ensure_frontier_job_index(c)
+
+
+def ensure_frontier_job_index(c):
+    """Index detail pages by job ID, for complete_jobs"""
+    c.execute('CREATE INDEX IF NOT EXISTS idx_crawl_frontier_job ON crawl_frontier(job_id)')
+
+
+def complete_jobs(conn, job_ids):
+    """Mark the detail pages of stored jobs done; the caller commits
+
+    Run from a JobSink's on_commit on a connection of its own, after the
+    batch holding these jobs is committed.
+    """
+    conn.executemany('UPDATE crawl_frontier SET status = ?, last_error = NULL WHERE job_id = ? AND kind = ?',
+                     [(DONE, job_id, DETAIL) for job_id in job_ids])
+
+
+def job_priority(job_id):
+    """LinkedIn job IDs grow over time, so a higher ID is a newer posting"""
+    return int(job_id) if str(job_id).isdigit() else 0
+
+
+class CrawlFrontier:
+    """Claimable queue of listing and detail URLs for one named crawl, stored in SQLite
+
+    Every method commits its own change, so the frontier on disk is always
+    what a resumed crawl should pick up.
+    """
+
+    def __init__(self, conn, name='linkedin', lease=DEFAULT_LEASE, max_attempts=MAX_ATTEMPTS,
+                 backoff=RETRY_BACKOFF, clock=time.time):
+        self.conn = conn
+        self.name = name
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.clock = clock
+        self.run_id = None
+
+    def start(self, target=None, worker=None, refetch=False):
+        """Resume this crawl's unfinished run, or start a new one
+
+        Items still claimed by `worker` were in flight, or fetched but not
+        yet stored, when its previous process stopped; they are released at
+        once rather than after the lease. A new run drops the previous
+        runs' listing pages, so paging starts again from the top; finished
+        detail pages are kept.
+
+        With refetch, an unfinished run is closed instead of resumed, and
+        its queued detail pages and every finished one are forgotten, so
+        the new run fetches every posting it lists again.
+
+        Returns:
+            True if an unfinished run was resumed
+        """
+        with self.conn:
+            if worker is not None:
+                self.conn.execute(
+                    f'UPDATE crawl_frontier SET status = ?, attempts = attempts - 1 '
+                    f'WHERE status = ? AND claimed_by = ? AND {IN_CRAWL}', (PENDING, CLAIMED, worker, self.name)
+                )
+            if refetch:
+                self.conn.execute('''
+                    DELETE FROM crawl_frontier WHERE kind = ? AND (status = ? OR (status != ?
+                    AND run_id IN (SELECT run_id FROM crawl_runs WHERE name = ? AND finished_at IS NULL)))
+                ''', (DETAIL, DONE, CLAIMED, self.name))
+                self.conn.execute('UPDATE crawl_runs SET finished_at = ? WHERE name = ? AND finished_at IS NULL',
+                                  (self.clock(), self.name))
+            row = self.conn.execute(
+                'SELECT run_id FROM crawl_runs WHERE name = ? AND finished_at IS NULL ORDER BY run_id DESC LIMIT 1',
+                (self.name,)
+            ).fetchone()
+            if row:
+                self.run_id = row[0]
+                return True
+            self.conn.execute(f'DELETE FROM crawl_frontier WHERE kind = ? AND {IN_CRAWL}', (LISTING, self.name))
+            self.run_id = self.conn.execute('INSERT INTO crawl_runs (name, target, started_at) VALUES (?, ?, ?)',
+                                            (self.name, target, self.clock())).lastrowid
+        return False
+
+    def finish(self):
+        with self.conn:
+            self.conn.execute('UPDATE crawl_runs SET finished_at = ? WHERE run_id = ?', (self.clock(), self.run_id))
+
+    def _insert(self, kind, items):
+        rows = [(url, kind, self.run_id, job_id, cursor, priority) for url, job_id, cursor, priority in items]
+        return self.conn.executemany(
+            'INSERT OR IGNORE INTO crawl_frontier (url, kind, run_id, job_id, cursor, priority) '
+            'VALUES (?, ?, ?, ?, ?, ?)', rows
+        ).rowcount if rows else 0
+
+    def add(self, kind, items):
+        """Queue (url, job_id, cursor, priority) items; URLs already in the frontier are skipped
+
+        Returns:
+            Number of URLs added
+        """
+        with self.conn:
+            return self._insert(kind, items)
+
+    @staticmethod
+    def _listing_item(url, cursor):
+        # Shallow pages first, across shards
+        return url, None, cursor, -cursor
+
+    @staticmethod
+    def _detail_items(items):
+        return [(url, job_id, None, job_priority(job_id)) for url, job_id in items]
+
+    def add_listing(self, url, cursor):
+        return self.add(LISTING, [self._listing_item(url, cursor)])
+
+    def add_details(self, items):
+        """Queue jobPosting pages from (url, job_id) pairs, newest job first"""
+        return self.add(DETAIL, self._detail_items(items))
+
+    def expand(self, listing_url, details, next_listing=None):
+        """Mark a fetched listing page done together with what it found, in one transaction
+
+        A crash can't leave the page done with its jobs unqueued, or its
+        jobs queued with the page still pending (and processed twice).
+
+        Args:
+            details: (url, job_id) pairs to queue
+            next_listing: (url, cursor) of the next page, if paging goes on
+
+        Returns:
+            Number of detail URLs added
+        """
+        with self.conn:
+            added = self._insert(DETAIL, self._detail_items(details))
+            if next_listing is not None:
+                self._insert(LISTING, [self._listing_item(*next_listing)])
+            self.conn.execute('UPDATE crawl_frontier SET status = ?, last_error = NULL WHERE url = ?',
+                              (DONE, listing_url))
+        return added
+
+    def lookup(self, urls):
+        """Which of urls are already in the frontier
+
+        Returns:
+            {url: True if the current run added it, False if an earlier one did}
+        """
+        found = {}
+        urls = list(urls)
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            found.update(self.conn.execute(
+                f"SELECT url, run_id = ? FROM crawl_frontier WHERE url IN ({','.join('?' * len(chunk))})",
+                [self.run_id, *chunk]
+            ))
+        return {url: bool(current) for url, current in found.items()}
+
+    def claim(self, kind, worker, limit=1):
+        """Atomically claim up to `limit` due items of a kind queued by this crawl, highest priority first
+
+        Returns:
+            List of dicts with url, kind, job_id, cursor, priority and
+            attempts (including this one)
+        """
+        now = self.clock()
+        with self.conn:
+            rows = self.conn.execute(f'''
+                UPDATE crawl_frontier
+                SET status = ?, claimed_by = ?, claimed_at = ?, attempts = attempts + 1
+                WHERE url IN (
+                    SELECT url FROM crawl_frontier
+                    WHERE kind = ? AND ((status = ? AND available_at <= ?) OR (status = ? AND claimed_at < ?))
+                    AND {IN_CRAWL}
+                    ORDER BY priority DESC LIMIT ?
+                )
+                RETURNING url, kind, job_id, cursor, priority, attempts
+            ''', (CLAIMED, worker, now, kind, PENDING, now, CLAIMED, now - self.lease, self.name, limit)).fetchall()
+        items = [dict(zip(('url', 'kind', 'job_id', 'cursor', 'priority', 'attempts'), row)) for row in rows]
+        return sorted(items, key=lambda item: -item['priority'])
+
+    def complete(self, urls):
+        with self.conn:
+            self.conn.executemany('UPDATE crawl_frontier SET status = ?, last_error = NULL WHERE url = ?',
+                                  [(DONE, url) for url in urls])
+
+    def fail(self, url, error, retry_after=None, permanent=False):
+        """Put a claimed item back for a later retry, or mark it failed after max_attempts
+
+        Args:
+            retry_after: Seconds to wait (e.g. from a Retry-After header);
+                defaults to exponential backoff on the attempt count
+            permanent: Don't retry (e.g. the page parsed but is unusable)
+        """
+        now = self.clock()
+        with self.conn:
+            attempts = self.conn.execute('SELECT attempts FROM crawl_frontier WHERE url = ?', (url,)).fetchone()[0]
+            if permanent or attempts >= self.max_attempts:
+                self.conn.execute('UPDATE crawl_frontier SET status = ?, last_error = ? WHERE url = ?',
+                                  (FAILED, error, url))
+                return
+            delay = retry_after if retry_after is not None else self.backoff * 2 ** (attempts - 1)
+            self.conn.execute(
+                'UPDATE crawl_frontier SET status = ?, available_at = ?, last_error = ? WHERE url = ?',
+                (PENDING, now + delay, error, url)
+            )
+
+    def release(self, urls):
+        """Return claimed items unprocessed, without counting the attempt"""
+        with self.conn:
+            self.conn.executemany(
+                'UPDATE crawl_frontier SET status = ?, attempts = attempts - 1 WHERE url = ? AND status = ?',
+                [(PENDING, url, CLAIMED) for url in urls]
+            )
+
+    def enqueued(self, kind=DETAIL):
+        """Items of a kind added by the current run"""
+        return self.conn.execute('SELECT COUNT(*) FROM crawl_frontier WHERE run_id = ? AND kind = ?',
+                                 (self.run_id, kind)).fetchone()[0]
+
+    def next_due(self, worker=None):
+        """Seconds until the earliest waiting item of this crawl may be claimed; None if nothing is left
+
+        Items `worker` itself holds (fetched, waiting to be stored) are not
+        waited for.
+        """
+        row = self.conn.execute(
+            'SELECT MIN(CASE WHEN status = ? THEN available_at ELSE claimed_at + ? END) FROM crawl_frontier '
+            f'WHERE (status = ? OR (status = ? AND claimed_by IS NOT ?)) AND {IN_CRAWL}',
+            (PENDING, self.lease, PENDING, CLAIMED, worker, self.name)
+        ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - self.clock())
+
+    def counts(self):
+        """{kind: {status: count}} over the items this crawl queued"""
+        counts = {}
+        for kind, status, count in self.conn.execute(
+                f'SELECT kind, status, COUNT(*) FROM crawl_frontier WHERE {IN_CRAWL} GROUP BY kind, status',
+                (self.name,)):
+            counts.setdefault(kind, {})[status] = count
+        return counts
+
+
+def main():
+    from data.database import db
+
+    parser = argparse.ArgumentParser(description='Inspect or reset the crawl frontier')
+    parser.add_argument('command', choices=['status', 'reset'])
+    parser.add_argument('--name', default='linkedin')
+    args = parser.parse_args()
+
+    with db.connection() as conn:
+        if args.command == 'reset':
+            with conn:
+                conn.execute('UPDATE crawl_runs SET finished_at = ? WHERE name = ? AND finished_at IS NULL',
+                             (time.time(), args.name))
+                conn.execute(f'DELETE FROM crawl_frontier WHERE kind = ? AND {IN_CRAWL}', (LISTING, args.name))
+                retried = conn.execute(f'UPDATE crawl_frontier SET status = ?, attempts = 0, available_at = 0 '
+                                       f'WHERE status = ? AND {IN_CRAWL}', (PENDING, FAILED, args.name)).rowcount
+            print(f"✅ Closed unfinished '{args.name}' crawls; {retried} failed pages queued again")
+            return
+        run = conn.execute('SELECT run_id, target, started_at, finished_at FROM crawl_runs WHERE name = ? '
+                           'ORDER BY run_id DESC LIMIT 1', (args.name,)).fetchone()
+        if run is None:
+            print(f"📭 No '{args.name}' crawl yet")
+            return
+        state = 'finished' if run[3] else 'unfinished (will resume)'
+        print(f"🕸️ Crawl '{args.name}' run {run[0]}: target {run[1]}, {state}")
+        for kind, statuses in sorted(CrawlFrontier(conn, args.name).counts().items()):
+            print(f"   {kind}: " + ', '.join(f"{count} {status}" for status, count in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
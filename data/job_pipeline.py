@@ -1,12 +1,29 @@
-from scrapers.scraper import scrape_jobs
-from database import init_db, store_jobs, clear_jobs
+import os
+import sys
 import time
 
-def main(clear_existing=False):
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.scrapers.scraper import iter_crawl_jobs
+from data.database import db, init_db, clear_jobs, complete_crawled_jobs, get_known_job_ids
+from data.frontier import CrawlFrontier
+from data.job_sink import JobSink
+from data.page_archive import compress_page
+
+def main(clear_existing=False, incremental=True, shards=None):
+    """Scrape LinkedIn into jobs.db
+
+    Args:
+        clear_existing: Delete stored jobs (and crawl state) first
+        incremental: Resume an interrupted crawl and fetch only jobs not
+            stored yet; False starts a fresh crawl that fetches every listed
+            job again, stored or not
+        shards: Listing searches to fan out over (data/scrapers/shards.py)
+    """
     start_time = time.time()
     
     try:
-        # Initialize database
+        # Create or migrate the schema; stored jobs survive restarts
         print("Initializing database...")
         init_db()
         
@@ -17,32 +34,39 @@ def main(clear_existing=False):
         else:
             print("Keeping existing jobs...")
         
-        # Scrape recent jobs from LinkedIn
+        # Scrape recent jobs from LinkedIn, skipping the ones already stored
         print("Scraping recent jobs from LinkedIn...")
-        jobs = scrape_jobs(num_jobs=1000)  # Increased to 50 jobs
+        known = get_known_job_ids() if incremental and not clear_existing else None
+        if known is not None:
+            print(f"Incremental run: {len(known)} job IDs already stored")
+        # Jobs are stored in micro-batches as they are parsed; raw pages are
+        # compressed as they arrive and archived for re-extraction. Crawl
+        # state lives in the frontier, so an interrupted run resumes here;
+        # a page only counts as done once the sink has committed its job
+        with db.connection() as conn, JobSink(on_commit=complete_crawled_jobs) as sink:
+            archive = lambda job_id, html: sink.put_page((job_id, *compress_page(html)))
+            frontier = CrawlFrontier(conn)
+            # shards: listing searches to fan out over (data/scrapers/shards.py); one search by default
+            for job in iter_crawl_jobs(frontier, num_jobs=1000, known=known, archive=archive,
+                                       shards=shards, defer_complete=True,
+                                       refetch=not incremental):  # new jobs only when incremental
+                sink.put(job)
+        summary = sink.summary()
         
-        if not jobs:
-            print("No jobs were scraped. Check if LinkedIn is blocking the requests.")
+        if not summary['received']:
+            if known:
+                print("No new jobs since the last run.")
+            else:
+                print("No jobs were scraped. Check if LinkedIn is blocking the requests.")
             return
             
-        # Store jobs in database
-        print(f"Storing {len(jobs)} jobs in database...")
-        successful_stores = 0
-        failed_stores = 0
-        
-        for job in jobs:
-            try:
-                store_jobs(job)
-                successful_stores += 1
-                #print(f"Successfully stored job {job.get('job_id')} - {job.get('title')}")
-            except Exception as e:
-                failed_stores += 1
-                #print(f"Failed to store job {job.get('job_id')}: {str(e)}")
         end_time = time.time()
         print(f"\nPipeline completed!")
-        print(f"Total jobs scraped: {len(jobs)}")
-        print(f"Successfully stored: {successful_stores}")
-        print(f"Failed to store: {failed_stores}")
+        print(f"Total jobs scraped: {summary['received']}")
+        print(f"Successfully stored: {summary['new_jobs']}")
+        print(f"Already in database: {summary['duplicates']}")
+        print(f"Raw pages archived: {summary['pages']}")
+        print(f"Committed in {summary['batches']} batches, first after {summary['first_commit_seconds']:.1f} seconds")
         print(f"Time taken: {end_time - start_time:.2f} seconds")
         
     except Exception as e:
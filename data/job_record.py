@@ -0,0 +1,145 @@
+"""
+Job record - the one in-memory shape of a jobs row
+
+Job is a __slots__ class filled straight from a cursor by job_row_factory,
+so a row costs one small object instead of a 26-key dict. skills and
+education stay as the stored JSON text until first read. Existing callers
+that treat jobs as dicts keep working through get(), [] and `in`.
+
+Only the columns a query selected are set: job.salary_raw on a list-view
+row raises AttributeError, while job.get('salary_raw') returns None.
+"""
+
+import json
+
+
+JOB_COLUMNS = (
+    'job_id', 'job_url', 'source', 'title', 'company_name', 'description', 'location', 'city', 'state',
+    'country', 'remote', 'industry', 'seniority_level', 'employment_type', 'job_function',
+    'salary_raw', 'salary_min', 'salary_max', 'salary_avg', 'yoe_raw', 'yoe_min', 'yoe_max', 'yoe_avg',
+    'education', 'skills', 'created_at',
+)
+# Columns stored as JSON lists, decoded lazily
+JSON_COLUMNS = ('education', 'skills')
+# Computed columns some queries add
+EXTRA_COLUMNS = ('snippet',)
+
+_decode_json = json.JSONDecoder().decode
+_encode_json = json.JSONEncoder(default=str).encode
+
+
+def _decode_list(raw):
+    if not raw:
+        return raw
+    try:
+        return _decode_json(raw)
+    except ValueError:
+        # Rows written before the JSON convention hold plain text
+        return raw
+
+
+class Job:
+    """One row of the jobs table (or the subset of columns a query selected)"""
+
+    __slots__ = (
+        *(col for col in JOB_COLUMNS + EXTRA_COLUMNS if col not in JSON_COLUMNS),
+        *(f'_{col}_raw' for col in JSON_COLUMNS),
+        *(f'_{col}' for col in JSON_COLUMNS),
+        '_fields',
+        '_extra',
+    )
+
+    @property
+    def skills(self):
+        try:
+            return self._skills
+        except AttributeError:
+            self._skills = _decode_list(self._skills_raw)
+            return self._skills
+
+    @property
+    def education(self):
+        try:
+            return self._education
+        except AttributeError:
+            self._education = _decode_list(self._education_raw)
+            return self._education
+
+    def keys(self):
+        """Names of the columns this row was read with"""
+        return self._fields
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __getitem__(self, name):
+        if name in self._fields:
+            if name in self._extra:
+                return self._extra[name]
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        return name in self._fields
+
+    def to_dict(self):
+        """Plain dict of the selected columns, with JSON lists decoded"""
+        return {name: self[name] for name in self._fields}
+
+    def to_json(self):
+        return _encode_json(self.to_dict())
+
+    def __repr__(self):
+        return f"Job({self.get('job_id')!r}, {self.get('title')!r})"
+
+
+def _compile_builder(fields):
+    """Build a function that fills a Job from a row with one tuple-unpacking assignment
+
+    Same approach as collections.namedtuple: the generated code assigns every
+    slot in a single statement instead of a per-column setattr loop.
+    """
+    targets = []
+    extras = []
+    for i, col in enumerate(fields):
+        slot = f'_{col}_raw' if col in JSON_COLUMNS else col
+        if slot in Job.__slots__:
+            targets.append(f'job.{slot}')
+        else:
+            targets.append('_')
+            extras.append(f'{col!r}: row[{i}]')
+    extra = f'{{{", ".join(extras)}}}' if extras else 'NO_EXTRA'
+    source = (
+        'def build(row):\n'
+        '    job = new(Job)\n'
+        f'    {", ".join(targets)}, = row\n'
+        '    job._fields = fields\n'
+        f'    job._extra = {extra}\n'
+        '    return job\n'
+    )
+    namespace = {'new': Job.__new__, 'Job': Job, 'fields': fields, 'NO_EXTRA': _NO_EXTRA}
+    exec(source, namespace)
+    return namespace['build']
+
+
+_NO_EXTRA = {}
+_builders = {}
+# (cursor.description, builder) of the last query; description is one object per statement
+_last_builder = (None, None)
+
+
+def job_row_factory(cursor, row):
+    """sqlite3 row_factory that builds a Job from any SELECT over jobs"""
+    global _last_builder
+    description, build = _last_builder
+    if cursor.description is not description:
+        description = cursor.description
+        fields = tuple(col[0] for col in description)
+        build = _builders.get(fields)
+        if build is None:
+            build = _builders[fields] = _compile_builder(fields)
+        _last_builder = (description, build)
+    return build(row)
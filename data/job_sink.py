@@ -0,0 +1,163 @@
+"""
+Streaming job persistence - a bounded queue drained in micro-batches
+
+Scrapers used to return every job of a run in one list, stored only once
+scraping finished: a crash near the end lost the whole run, and memory
+grew with run size. JobSink stores jobs while they are still arriving:
+
+- put() hands a job (or an archived page) to a bounded queue, blocking the
+  scraper when the writer falls behind, so at most queue_size records are
+  held in memory
+- a writer thread commits whatever has queued up as soon as batch_size
+  records are waiting or max_delay seconds have passed since the first,
+  through store_jobs_bulk / store_job_pages
+- close() (or leaving the with-block, even on an exception) flushes the
+  rest, so a crash loses at most the records not yet flushed
+- once a batch fails to commit, later batches are dropped rather than
+  stored out of order; summary() counts the dropped jobs, and the error
+  is raised from the next put() or from close()
+- on_commit, if given, is called with each batch of jobs once it is
+  committed, so a scraper can record its progress (a crawl page done, a
+  feed entry seen) only for jobs that are really stored
+
+    with JobSink() as sink:
+        for job in iter_scrape_jobs(1000):
+            sink.put(job)
+    print(sink.summary())
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.database import store_job_pages, store_jobs_bulk
+
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_DELAY = 2.0
+DEFAULT_QUEUE_SIZE = 500
+
+_JOB, _PAGE, _STOP = 'job', 'page', 'stop'
+
+
+class JobSink:
+    """Background writer persisting jobs and raw pages in micro-batches as they arrive"""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, max_delay=DEFAULT_MAX_DELAY, queue_size=DEFAULT_QUEUE_SIZE,
+                 store_jobs=store_jobs_bulk, store_pages=store_job_pages, on_commit=None):
+        """
+        Args:
+            on_commit: Called on the writer thread with the list of job
+                dicts of every committed batch
+        """
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.store_jobs = store_jobs
+        self.store_pages = store_pages
+        self.on_commit = on_commit
+        self.new_jobs = 0
+        self.duplicates = 0
+        self.pages = 0
+        self.batches = 0
+        self.received = 0
+        self.dropped = 0
+        self.error = None
+        self.started = time.perf_counter()
+        self.first_commit = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = threading.Thread(target=self._run, name='job-sink', daemon=True)
+        self._writer.start()
+
+    def put(self, job):
+        """Queue a job dict for storage, blocking while the queue is full"""
+        self._check()
+        self.received += 1
+        self._queue.put((_JOB, job))
+
+    def put_page(self, page):
+        """Queue an archived page: (job_id, codec, blob, raw_size)"""
+        self._check()
+        self._queue.put((_PAGE, page))
+
+    def close(self):
+        """Flush everything queued and stop the writer; re-raises a writer error"""
+        if self._writer.is_alive():
+            self._queue.put((_STOP, None))
+            self._writer.join()
+        self._check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _check(self):
+        if self.error is not None:
+            raise RuntimeError(f"job sink writer failed, {self.dropped} jobs not stored: {self.error}") from self.error
+
+    def _run(self):
+        jobs, pages = [], []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                kind, item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                kind = None
+            if kind == _JOB:
+                jobs.append(item)
+            elif kind == _PAGE:
+                pages.append(item)
+            if (jobs or pages) and deadline is None:
+                deadline = time.monotonic() + self.max_delay
+            full = len(jobs) + len(pages) >= self.batch_size
+            if (jobs or pages) and (kind in (None, _STOP) or full):
+                try:
+                    self._flush(jobs, pages)
+                except Exception as e:
+                    # Keep draining so put() never blocks forever; the error
+                    # surfaces on the next put() or on close()
+                    self.error = e
+                jobs, pages, deadline = [], [], None
+            if kind == _STOP:
+                return
+
+    def _flush(self, jobs, pages):
+        if self.error is not None:
+            self.dropped += len(jobs)
+            return
+        if jobs:
+            try:
+                new_jobs, duplicates = self.store_jobs(jobs)
+            except Exception:
+                self.dropped += len(jobs)
+                raise
+            self.new_jobs += new_jobs
+            self.duplicates += duplicates
+            if self.on_commit is not None:
+                self.on_commit(jobs)
+        if pages:
+            # A page may be committed a batch before its job; reextract only
+            # reads pages whose job is stored
+            self.pages += self.store_pages(pages)
+        self.batches += 1
+        if self.first_commit is None:
+            self.first_commit = time.perf_counter() - self.started
+
+    def summary(self):
+        return {
+            'received': self.received,
+            'new_jobs': self.new_jobs,
+            'dropped': self.dropped,
+            'duplicates': self.duplicates,
+            'pages': self.pages,
+            'batches': self.batches,
+            'first_commit_seconds': self.first_commit,
+            'elapsed': time.perf_counter() - self.started,
+        }
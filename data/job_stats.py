@@ -0,0 +1,196 @@
+"""
+Job statistics rollups - per-group counters kept in sync with the jobs table
+
+Each rollup table holds one row per group (company, location, employment
+type, work type, day). Triggers on jobs add or subtract a row's contribution
+as it is inserted, updated or deleted, so reading statistics costs
+O(groups) instead of a full-table GROUP BY. Since migration 15 the
+triggers leave out linked near-duplicates (see data/dedup.py).
+
+    python data/job_stats.py check     # compare rollups with a full scan
+    python data/job_stats.py rebuild   # recompute rollups from jobs
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.dedup import unlinked_expr
+
+
+def remote_expr(prefix=''):
+    """Shared definition of a remote job, used by the rollups, filters and their index"""
+    return f"({prefix}remote = '1' OR instr(lower({prefix}location), 'remote') > 0)"
+
+
+# table -> (key column, key expression, condition, {measure: per-row expression})
+# Expressions use {row} for the jobs row (new/old in triggers, jobs in rebuilds)
+ROLLUPS = {
+    'job_stats_company': (
+        'company_name', '{row}.company_name', "IFNULL({row}.company_name, '') != ''",
+        {'job_count': '1'},
+    ),
+    'job_stats_location': (
+        'location', '{row}.location', "IFNULL({row}.location, '') != ''",
+        {'job_count': '1'},
+    ),
+    'job_stats_employment_type': (
+        'employment_type', '{row}.employment_type', "IFNULL({row}.employment_type, '') != ''",
+        {'job_count': '1'},
+    ),
+    'job_stats_work_type': (
+        'work_type', f"CASE WHEN {remote_expr('{row}.')} THEN 'Remote' ELSE 'On-site' END", '1',
+        {'job_count': '1'},
+    ),
+    'job_stats_day': (
+        'day', "IFNULL(date({row}.created_at), '')", '1',
+        {
+            'job_count': '1',
+            'salary_count': '({row}.salary_avg IS NOT NULL)',
+            'salary_sum': 'IFNULL({row}.salary_avg, 0)',
+        },
+    ),
+}
+
+# Columns whose change can move a job between groups
+TRACKED_COLUMNS = ('company_name', 'location', 'employment_type', 'remote', 'created_at', 'salary_avg')
+
+
+def _add_sql(table, row):
+    key_col, key_expr, condition, measures = ROLLUPS[table]
+    columns = ', '.join([key_col, *measures])
+    values = ', '.join([key_expr, *measures.values()]).replace('{row}', row)
+    updates = ', '.join(f'{m} = {m} + excluded.{m}' for m in measures)
+    return (
+        f'INSERT INTO {table} ({columns}) SELECT {values} WHERE {condition.replace("{row}", row)} '
+        f'ON CONFLICT({key_col}) DO UPDATE SET {updates};'
+    )
+
+
+def _remove_sql(table, row):
+    key_col, key_expr, _, measures = ROLLUPS[table]
+    key = key_expr.replace('{row}', row)
+    updates = ', '.join(f'{m} = {m} - {expr}' for m, expr in measures.items()).replace('{row}', row)
+    return (
+        f'UPDATE {table} SET {updates} WHERE {key_col} = {key};\n'
+        f'DELETE FROM {table} WHERE {key_col} = {key} AND job_count <= 0;'
+    )
+
+
+def ensure_stats_schema(c):
+    """Create the rollup tables and the triggers that maintain them"""
+    for table, (key_col, _, _, measures) in ROLLUPS.items():
+        measure_cols = ', '.join(f'{m} NUMERIC NOT NULL DEFAULT 0' for m in measures)
+        c.execute(f'CREATE TABLE IF NOT EXISTS {table} ({key_col} TEXT PRIMARY KEY, {measure_cols})')
+    _create_triggers(c)
+
+
+def hide_linked_duplicates(c):
+    """Recreate the triggers so linked near-duplicates are not counted, and recount
+
+    Needs the job_duplicates table (migration 7). Links are written before
+    the jobs they hide, so the insert trigger already sees them.
+    """
+    for name in ('job_stats_insert', 'job_stats_delete', 'job_stats_update'):
+        c.execute(f'DROP TRIGGER IF EXISTS {name}')
+    _create_triggers(c, hide_linked=True)
+    rebuild_job_statistics(c)
+
+
+def _create_triggers(c, hide_linked=False):
+    inserts = '\n'.join(_add_sql(table, 'new') for table in ROLLUPS)
+    deletes = '\n'.join(_remove_sql(table, 'old') for table in ROLLUPS)
+    # One visibility check per row rather than one per rollup; job_id is not tracked, so new and old agree
+    new_visible = f' WHEN {unlinked_expr("new")}' if hide_linked else ''
+    old_visible = f' WHEN {unlinked_expr("old")}' if hide_linked else ''
+    c.execute(f'CREATE TRIGGER IF NOT EXISTS job_stats_insert AFTER INSERT ON jobs{new_visible} BEGIN\n{inserts}\nEND')
+    c.execute(f'CREATE TRIGGER IF NOT EXISTS job_stats_delete AFTER DELETE ON jobs{old_visible} BEGIN\n{deletes}\nEND')
+    c.execute(
+        f'CREATE TRIGGER IF NOT EXISTS job_stats_update AFTER UPDATE OF {", ".join(TRACKED_COLUMNS)} ON jobs'
+        f'{new_visible} BEGIN\n{deletes}\n{inserts}\nEND'
+    )
+
+
+def _hides_linked(conn):
+    """True once the triggers leave out linked near-duplicates, so full scans must too"""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'job_stats_insert'").fetchone()
+    return bool(row) and 'job_duplicates' in row[0]
+
+
+def _full_scan_sql(table, hide_linked=False):
+    key_col, key_expr, condition, measures = ROLLUPS[table]
+    if hide_linked:
+        condition = f"({condition}) AND {unlinked_expr('{row}')}"
+    sums = ', '.join(f'SUM({expr})' for expr in measures.values())
+    return (
+        f'SELECT {key_expr}, {sums} FROM jobs WHERE {condition} GROUP BY 1'.replace('{row}', 'jobs')
+    )
+
+
+def rebuild_job_statistics(conn):
+    """Recompute every rollup table from a full scan of jobs (run inside a transaction)"""
+    hide_linked = _hides_linked(conn)
+    for table, (key_col, _, _, measures) in ROLLUPS.items():
+        conn.execute(f'DELETE FROM {table}')
+        conn.execute(
+            f'INSERT INTO {table} ({", ".join([key_col, *measures])}) {_full_scan_sql(table, hide_linked)}'
+        )
+
+
+def check_job_statistics(conn):
+    """Compare each rollup with a full-scan aggregate
+
+    Returns:
+        Dict of table -> list of (key, rollup_values, full_scan_values) mismatches
+    """
+    def values(row):
+        # Salary sums accumulate in a different order than SUM(), so compare rounded
+        return tuple(round(v, 2) if isinstance(v, float) else v for v in row[1:])
+
+    hide_linked = _hides_linked(conn)
+    mismatches = {}
+    for table, (key_col, _, _, measures) in ROLLUPS.items():
+        stored = {
+            row[0]: values(row)
+            for row in conn.execute(f'SELECT {key_col}, {", ".join(measures)} FROM {table}')
+        }
+        scanned = {row[0]: values(row) for row in conn.execute(_full_scan_sql(table, hide_linked))}
+        problems = [
+            (key, stored.get(key), scanned.get(key))
+            for key in stored.keys() | scanned.keys()
+            if stored.get(key) != scanned.get(key)
+        ]
+        if problems:
+            mismatches[table] = problems
+    return mismatches
+
+
+def main():
+    from data.database import db
+
+    parser = argparse.ArgumentParser(description='Maintain the job statistics rollup tables')
+    parser.add_argument('command', choices=['check', 'rebuild'])
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        with db.transaction() as conn:
+            rebuild_job_statistics(conn)
+        print("✅ Job statistics rebuilt")
+        return
+
+    with db.connection() as conn:
+        mismatches = check_job_statistics(conn)
+    if not mismatches:
+        print("✅ Job statistics match the jobs table")
+        return
+    for table, problems in mismatches.items():
+        print(f"❌ {table}: {len(problems)} mismatched groups")
+        for key, stored, scanned in problems[:10]:
+            print(f"   {key!r}: rollup={stored} full scan={scanned}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
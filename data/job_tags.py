@@ -0,0 +1,114 @@
+"""
+Job tags - skills and education normalized into indexed side tables
+
+The jobs table keeps skills and education as JSON lists. Triggers on jobs
+mirror each list into a dictionary table (one integer id per distinct,
+normalized name) and a link table of (tag id, job_id) pairs, so "jobs
+requiring Python" or "top skills for data scientists" are index lookups
+and GROUP BYs instead of decoding every row.
+
+    python data/job_tags.py rebuild   # recompute the side tables from jobs
+"""
+
+import argparse
+import os
+import sys
+
+
+# jobs column -> (dictionary table, id column, link table, name normalization)
+# Normalizations use {value} for the raw list element (or a ? placeholder)
+TAGS = {
+    'skills': ('skills', 'skill_id', 'job_skills', 'lower(trim({value}))'),
+    # bachelor's / Bachelors / B.S. variants collapse to one spelling
+    'education': ('degrees', 'degree_id', 'job_education',
+                  "replace(replace(lower(trim({value})), '''', ''), '.', '')"),
+}
+
+
+def normalize_sql(column, value='?'):
+    """SQL expression normalizing a tag name the same way the triggers do"""
+    return TAGS[column][3].format(value=value)
+
+
+def _json_list(column, row):
+    # Malformed JSON or non-list values contribute no tags instead of failing the insert
+    return f"json_each(CASE WHEN json_valid({row}.{column}) THEN {row}.{column} ELSE '[]' END)"
+
+
+def _elements_sql(column, row):
+    name = normalize_sql(column, 'value')
+    return (
+        f"SELECT DISTINCT {name} AS name FROM {_json_list(column, row)} "
+        f"WHERE type = 'text' AND {name} != ''"
+    )
+
+
+def _link_sql(column, row):
+    table, id_col, link_table, _ = TAGS[column]
+    elements = _elements_sql(column, row)
+    return (
+        f'INSERT OR IGNORE INTO {table} (name) {elements};\n'
+        f'INSERT OR IGNORE INTO {link_table} ({id_col}, job_id) '
+        f'SELECT {id_col}, {row}.job_id FROM {table} WHERE name IN ({elements});'
+    )
+
+
+def _unlink_sql(column, row):
+    link_table = TAGS[column][2]
+    return f'DELETE FROM {link_table} WHERE job_id = {row}.job_id;'
+
+
+def ensure_tag_schema(c):
+    """Create the dictionary and link tables and the triggers that fill them"""
+    for column, (table, id_col, link_table, _) in TAGS.items():
+        c.execute(f'CREATE TABLE IF NOT EXISTS {table} ({id_col} INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)')
+        # (tag, job) primary key covers tag filters and per-tag counts;
+        # (job, tag) covers per-job lookups and the delete triggers
+        c.execute(f'''
+            CREATE TABLE IF NOT EXISTS {link_table} (
+                {id_col} INTEGER NOT NULL REFERENCES {table}({id_col}),
+                job_id TEXT NOT NULL,
+                PRIMARY KEY ({id_col}, job_id)
+            ) WITHOUT ROWID
+        ''')
+        c.execute(f'CREATE INDEX IF NOT EXISTS idx_{link_table}_job ON {link_table}(job_id, {id_col})')
+
+        c.execute(f'CREATE TRIGGER IF NOT EXISTS {link_table}_insert AFTER INSERT ON jobs BEGIN\n'
+                  f'{_link_sql(column, "new")}\nEND')
+        c.execute(f'CREATE TRIGGER IF NOT EXISTS {link_table}_delete AFTER DELETE ON jobs BEGIN\n'
+                  f'{_unlink_sql(column, "old")}\nEND')
+        c.execute(f'CREATE TRIGGER IF NOT EXISTS {link_table}_update AFTER UPDATE OF job_id, {column} ON jobs BEGIN\n'
+                  f'{_unlink_sql(column, "old")}\n{_link_sql(column, "new")}\nEND')
+
+
+def rebuild_job_tags(conn):
+    """Recompute the side tables from the jobs JSON columns (run inside a transaction)"""
+    for column, (table, id_col, link_table, _) in TAGS.items():
+        name = normalize_sql(column, 'value')
+        pairs = (
+            f"SELECT DISTINCT jobs.job_id, {name} AS name FROM jobs, {_json_list(column, 'jobs')} "
+            f"WHERE type = 'text' AND {name} != ''"
+        )
+        conn.execute(f'DELETE FROM {link_table}')
+        conn.execute(f'INSERT OR IGNORE INTO {table} (name) SELECT name FROM ({pairs})')
+        conn.execute(
+            f'INSERT INTO {link_table} ({id_col}, job_id) '
+            f'SELECT {table}.{id_col}, pairs.job_id FROM ({pairs}) AS pairs JOIN {table} USING (name)'
+        )
+
+
+def main():
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from data.database import db
+
+    parser = argparse.ArgumentParser(description='Maintain the skills and education side tables')
+    parser.add_argument('command', choices=['rebuild'])
+    parser.parse_args()
+
+    with db.transaction() as conn:
+        rebuild_job_tags(conn)
+    print("✅ Skills and education tables rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Known job IDs for incremental scraping
+
+A daily run mostly sees postings that are already in jobs.db, and every
+one of them used to cost a rate-limited detail fetch. load_known_job_ids
+reads the IDs we already hold - stored jobs plus near-duplicates recorded
+in job_duplicates, which are not stored when ingest skips them - so the
+scraper can drop them before fetching, and stop paging the listing once a
+page is mostly known jobs (the high-water mark: the listing is requested
+newest first, so everything past it was seen on an earlier run).
+
+IDs are held in a set by default. For very large tables a BloomFilter
+bounds memory at ~1.8 bytes per ID (0.1% false positives); a false
+positive means one new posting is skipped until its ID is seen again in a
+later run, never that a known posting is refetched.
+"""
+
+import hashlib
+import math
+import threading
+
+
+DEFAULT_ERROR_RATE = 0.001
+# Stop paging once this fraction of a listing page's job IDs are known
+HIGH_WATER = 0.8
+
+KNOWN_IDS_SQL = 'SELECT job_id FROM jobs UNION SELECT job_id FROM job_duplicates'
+
+
+class BloomFilter:
+    """Fixed-size set membership with a bounded false-positive rate and no false negatives"""
+
+    def __init__(self, capacity, error_rate=DEFAULT_ERROR_RATE):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: position i is h1 + i * h2, from one 128-bit digest
+        digest = hashlib.blake2b(str(key).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, keys):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+def load_known_job_ids(conn, bloom=False, error_rate=DEFAULT_ERROR_RATE, headroom=2.0):
+    """IDs of stored and near-duplicate jobs
+
+    Args:
+        conn: SQLite connection to jobs.db
+        bloom: Return a BloomFilter instead of a set
+        error_rate: Bloom filter false-positive rate
+        headroom: Bloom filter capacity as a multiple of the stored count,
+            leaving room for the IDs added during the run
+
+    Returns:
+        A set or BloomFilter supporting `in` and add()
+    """
+    if not bloom:
+        return {job_id for (job_id,) in conn.execute(KNOWN_IDS_SQL)}
+    stored = conn.execute(f'SELECT COUNT(*) FROM ({KNOWN_IDS_SQL})').fetchone()[0]
+    known = BloomFilter(max(stored * headroom, 1024), error_rate)
+    known.update(job_id for (job_id,) in conn.execute(KNOWN_IDS_SQL))
+    return known
+
+
+class IncrementalStats:
+    """What an incremental run skipped: known IDs dropped and listing pages not paged"""
+
+    def __init__(self):
+        self.listing_pages = 0
+        self.listed_ids = 0
+        self.known_ids = 0
+        self.new_ids = 0
+        self.stopped_at = None
+        self._lock = threading.Lock()
+
+    def record_page(self, listed, known):
+        """Record one listing page with `listed` job IDs, `known` of them already held"""
+        with self._lock:
+            self.listing_pages += 1
+            self.listed_ids += listed
+            self.known_ids += known
+            self.new_ids += listed - known
+
+    def summary(self):
+        return {
+            'listing_pages': self.listing_pages,
+            'listed_ids': self.listed_ids,
+            'known_ids': self.known_ids,
+            'new_ids': self.new_ids,
+            # Each known ID would have been one detail page request
+            'fetches_avoided': self.known_ids,
+            'known_ratio': self.known_ids / self.listed_ids if self.listed_ids else 0.0,
+            'stopped_at': self.stopped_at,
+        }
+
+    def report(self):
+        s = self.summary()
+        print(f"♻️ Incremental: {s['listed_ids']} listed IDs on {s['listing_pages']} pages, "
+              f"{s['known_ids']} already stored ({s['known_ratio']:.0%}), {s['new_ids']} new; "
+              f"{s['fetches_avoided']} detail fetches avoided")
+        if s['stopped_at'] is not None:
+            print(f"   stopped paging at start={s['stopped_at']} (high-water mark)")
@@ -0,0 +1,324 @@
+"""
+Schema migrations - ordered, versioned changes to the jobs database
+
+Each migration runs once per database file and is recorded in the
+schema_version table. Migrations are written to be idempotent (IF NOT
+EXISTS, add_column, backfill over rows that still need it), so re-running
+one after a crash part way through is safe and existing data is never
+dropped.
+
+Add new schema changes by appending to MIGRATIONS - never edit or reorder
+a migration that has already shipped.
+
+    python data/migrations.py            # apply pending migrations
+    python data/migrations.py status     # show applied and pending versions
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.job_stats import remote_expr, ensure_stats_schema, hide_linked_duplicates, rebuild_job_statistics
+from data.job_tags import ensure_tag_schema, rebuild_job_tags
+from data.dedup import ensure_dedup_schema, backfill_fingerprints, backfill_match_keys
+from data.page_archive import ensure_archive_schema
+from data.frontier import ensure_frontier_job_index, ensure_frontier_schema
+from data.feed_state import ensure_feed_schema
+from data.source_schedule import ensure_schedule_schema
+
+
+def table_columns(conn, table):
+    """Column names of a table, in order"""
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def add_column(conn, table, column, definition):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists
+
+    SQLite adds a column by rewriting only the schema, not the rows, so this
+    is instant on any table size. Returns True if the column was added.
+    """
+    if column in table_columns(conn, table):
+        return False
+    conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return True
+
+
+def backfill(conn, table, assignments, where='1', params=(), where_params=(), batch_size=1000):
+    """Run an UPDATE over a table in rowid-ordered batches, committing each batch
+
+    Short transactions keep the write lock free between batches, so the
+    scraper and web app carry on while a large table is backfilled. Use a
+    `where` clause that excludes already-processed rows (e.g. "col IS NULL")
+    so an interrupted backfill picks up where it stopped.
+
+    Args:
+        assignments: SET clause, e.g. "salary_avg = (salary_min + salary_max) / 2"
+        where: Condition selecting rows that still need the update
+        params: Parameters for the placeholders in assignments
+        where_params: Parameters for the placeholders in where
+
+    Returns:
+        Number of rows updated
+    """
+    last_rowid = conn.execute(f'SELECT IFNULL(MAX(rowid), 0) FROM {table}').fetchone()[0]
+    updated = 0
+    start = 0
+    while start < last_rowid:
+        end = start + batch_size
+        with conn:
+            updated += conn.execute(
+                f'UPDATE {table} SET {assignments} WHERE rowid > ? AND rowid <= ? AND ({where})',
+                (*params, start, end, *where_params)
+            ).rowcount
+        start = end
+    return updated
+
+
+def _create_jobs_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs(
+            job_id TEXT PRIMARY KEY,
+            job_url TEXT,
+            source TEXT,
+            title TEXT,
+            company_name TEXT,
+            description TEXT,
+            location TEXT,
+            city TEXT,
+            state TEXT,
+            country TEXT,
+            remote TEXT,
+            industry TEXT,
+            seniority_level TEXT,
+            employment_type TEXT,
+            job_function TEXT,
+            salary_raw TEXT,
+            salary_min INTEGER,
+            salary_max INTEGER,
+            salary_avg DECIMAL,
+            yoe_raw TEXT,
+            yoe_min INTEGER,
+            yoe_max INTEGER,
+            yoe_avg DECIMAL,
+            education TEXT,
+            skills TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_company ON jobs(company_name)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON jobs(created_at)')
+
+
+def _create_filter_indexes(conn):
+    # Every structured filter leads at least one index, so any combination can SEARCH
+    indexes = (
+        ('idx_jobs_salary_max', 'salary_max, salary_min'),
+        ('idx_jobs_salary_min', 'salary_min, salary_max'),
+        ('idx_jobs_yoe_max', 'yoe_max, yoe_min'),
+        ('idx_jobs_yoe_min', 'yoe_min, yoe_max'),
+        ('idx_jobs_remote', f'{remote_expr()}, created_at, job_id'),
+        ('idx_jobs_seniority', 'seniority_level, created_at, job_id'),
+        ('idx_jobs_employment_type', 'employment_type, created_at, job_id'),
+        ('idx_jobs_source', 'source, created_at, job_id'),
+        ('idx_jobs_created_at_id', 'created_at, job_id'),
+    )
+    for name, columns in indexes:
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON jobs({columns})')
+
+
+def _create_search_index(conn):
+    """FTS5 index over the searchable text columns, kept in sync by triggers"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+    ).fetchone()
+
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, company_name, description, location,
+            content='jobs', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, title, company_name, description, location)
+            VALUES (new.rowid, new.title, new.company_name, new.description, new.location);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, company_name, description, location)
+            VALUES ('delete', old.rowid, old.title, old.company_name, old.description, old.location);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+        AFTER UPDATE OF title, company_name, description, location ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, company_name, description, location)
+            VALUES ('delete', old.rowid, old.title, old.company_name, old.description, old.location);
+            INSERT INTO jobs_fts(rowid, title, company_name, description, location)
+            VALUES (new.rowid, new.title, new.company_name, new.description, new.location);
+        END
+    ''')
+
+    if not exists:
+        # Relative bm25 weights for title, company_name, description, location
+        conn.execute("INSERT INTO jobs_fts(jobs_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 2.0)')")
+        # Index rows stored before the search table existed
+        conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+
+
+def _create_stats_rollups(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'job_stats_insert'"
+    ).fetchone()
+    ensure_stats_schema(conn)
+    if not exists:
+        # Count rows stored before the rollups existed
+        rebuild_job_statistics(conn)
+
+
+def _drop_created_at_index(conn):
+    # idx_jobs_created_at_id covers every query idx_created_at served
+    conn.execute('DROP INDEX IF EXISTS idx_created_at')
+
+
+def _create_tag_tables(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'job_skills_insert'"
+    ).fetchone()
+    ensure_tag_schema(conn)
+    if not exists:
+        # Split the JSON lists of rows stored before the side tables existed
+        rebuild_job_tags(conn)
+
+
+def _create_dedup_tables(conn):
+    with conn:
+        ensure_dedup_schema(conn)
+    # Online: fingerprints are computed in Python, one committed batch at a time
+    backfill_fingerprints(conn, keyed=False)
+
+
+def _add_match_keys(conn):
+    with conn:
+        add_column(conn, 'job_fingerprints', 'match_key', 'TEXT')
+    # Online: keys are computed in Python, one committed batch at a time
+    backfill_match_keys(conn)
+
+
+# (version, description, migration, transactional)
+# Transactional migrations run inside one IMMEDIATE transaction together with
+# their schema_version row. Online migrations (transactional=False) commit
+# in batches themselves, e.g. via backfill(), and must be safe to re-run.
+MIGRATIONS = [
+    (1, 'create jobs table', _create_jobs_table, True),
+    (2, 'structured filter indexes', _create_filter_indexes, True),
+    (3, 'full-text search index', _create_search_index, True),
+    (4, 'statistics rollup tables', _create_stats_rollups, True),
+    (5, 'drop idx_created_at (superseded by idx_jobs_created_at_id)', _drop_created_at_index, True),
+    (6, 'skills and education side tables', _create_tag_tables, True),
+    (7, 'near-duplicate fingerprints', _create_dedup_tables, False),
+    (8, 'raw page archive and re-extraction checkpoints', ensure_archive_schema, True),
+    (9, 'persistent crawl frontier', ensure_frontier_schema, True),
+    (10, 'RSS feed poll state and seen entries', ensure_feed_schema, True),
+    (11, 'scrape source schedule', ensure_schedule_schema, True),
+    (12, 'near-duplicate match keys (title and place)', _add_match_keys, False),
+    (13, 'crawl frontier job ID index', ensure_frontier_job_index, True),
+    (14, 're-key near-duplicates on title, place as a soft signal', backfill_match_keys, False),
+    (15, 'leave linked near-duplicates out of the statistics rollups', hide_linked_duplicates, True),
+]
+
+
+def _ensure_version_table(conn):
+    with conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version(
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+
+def current_version(conn):
+    """Highest applied migration version (0 for a database without schema_version)"""
+    _ensure_version_table(conn)
+    return conn.execute('SELECT IFNULL(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+
+def migrate(conn, target=None, migrations=None):
+    """Apply pending migrations in version order
+
+    Safe to call on every startup and from several processes at once: each
+    transactional migration re-checks the version after taking the write
+    lock, so only one process applies it.
+
+    Args:
+        target: Stop after this version (default: latest)
+        migrations: Override the migration list (used by tests)
+
+    Returns:
+        List of versions applied by this call
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    applied = []
+    version = current_version(conn)
+    for number, description, migration, transactional in sorted(migrations, key=lambda m: m[0]):
+        if number <= version or (target is not None and number > target):
+            continue
+        if transactional:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if conn.execute('SELECT 1 FROM schema_version WHERE version = ?', (number,)).fetchone():
+                    conn.rollback()
+                    continue
+                migration(conn)
+                conn.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)', (number, description))
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        else:
+            migration(conn)
+            with conn:
+                conn.execute('INSERT OR IGNORE INTO schema_version (version, description) VALUES (?, ?)',
+                             (number, description))
+        applied.append(number)
+    return applied
+
+
+def main():
+    from data.database import DB_PATH
+    import sqlite3
+
+    parser = argparse.ArgumentParser(description='Apply schema migrations to the jobs database')
+    parser.add_argument('command', nargs='?', choices=['migrate', 'status'], default='migrate')
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--target', type=int, default=None)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, timeout=30.0)
+    try:
+        if args.command == 'status':
+            version = current_version(conn)
+            print(f"📁 {args.db} is at schema version {version}")
+            for number, description, _, _ in MIGRATIONS:
+                state = '✅' if number <= version else '⏳'
+                print(f"   {state} {number:>3} {description}")
+            return
+
+        applied = migrate(conn, target=args.target)
+        if applied:
+            print(f"✅ Applied migrations {', '.join(map(str, applied))} to {args.db}")
+        else:
+            print(f"✅ {args.db} is already at schema version {current_version(conn)}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Raw page archive and offline re-extraction
+
+Only extracted fields used to be stored, so fixing an extractor (salary,
+YOE, education) or adding one meant rescraping. Now the jobPosting HTML
+of every scraped job is also kept in the job_pages side table, compressed
+with zstandard (zlib when it is not installed; the codec is stored per
+row), and `reextract` replays the archive through the current extractors:
+
+- pages are read in job_id order in batches and parsed on a process
+  pool, so throughput scales with cores
+- results are applied in order, each batch in one transaction that also
+  advances a named checkpoint in reextract_checkpoints, so an interrupted
+  run resumes where it stopped; a run that finishes drops its checkpoint,
+  so the next one (e.g. after an extractor fix) replays every page
+- a job row is only written if a re-extracted value differs, so unchanged
+  jobs don't churn the search index and statistics triggers; a rewritten
+  job's near-duplicate fingerprint is recomputed in the same transaction
+
+    python data/page_archive.py stats
+    python data/page_archive.py reextract --workers 8
+    python data/page_archive.py reextract --restart    # discard an interrupted run's checkpoint
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.dedup import refresh_fingerprints
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+CODEC = 'zstd' if zstandard is not None else 'zlib'
+COMPRESSION_LEVEL = 6
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_CHECKPOINT = 'reextract'
+
+# jobs columns rewritten from the page; job_id, skills and created_at are kept
+REEXTRACT_COLUMNS = (
+    'job_url', 'source', 'title', 'company_name', 'location', 'city', 'state', 'country', 'remote',
+    'industry', 'description', 'seniority_level', 'employment_type', 'job_function',
+    'salary_raw', 'salary_min', 'salary_max', 'salary_avg', 'yoe_raw', 'yoe_min', 'yoe_max', 'yoe_avg',
+    'education',
+)
+UPDATE_JOB_SQL = (
+    f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in REEXTRACT_COLUMNS)} "
+    f"WHERE job_id = ? AND ({' OR '.join(f'{column} IS NOT ?' for column in REEXTRACT_COLUMNS)})"
+)
+
+
+def ensure_archive_schema(c):
+    """Create the page archive and re-extraction checkpoint tables"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS job_pages (
+            job_id TEXT PRIMARY KEY,
+            codec TEXT NOT NULL,
+            raw_size INTEGER NOT NULL,
+            html BLOB NOT NULL,
+            fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS reextract_checkpoints (
+            name TEXT PRIMARY KEY,
+            last_job_id TEXT NOT NULL,
+            processed INTEGER NOT NULL DEFAULT 0,
+            changed INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+# Compression
+
+def compress_page(html, level=COMPRESSION_LEVEL):
+    """(codec, blob, raw_size) for a page's HTML"""
+    data = html.encode('utf-8')
+    if CODEC == 'zstd':
+        return CODEC, zstandard.ZstdCompressor(level=level).compress(data), len(data)
+    return CODEC, zlib.compress(data, level), len(data)
+
+
+def decompress_page(codec, blob):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("page archived with zstd but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(blob).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(blob).decode('utf-8')
+    raise ValueError(f"Unknown page codec: {codec}")
+
+
+def archive_pages(conn, pages):
+    """Store compressed pages, replacing older copies; the caller commits
+
+    Args:
+        pages: (job_id, codec, blob, raw_size) tuples, e.g. job_id plus compress_page(html)
+
+    Returns:
+        Number of pages written
+    """
+    rows = [(job_id, codec, raw_size, blob) for job_id, codec, blob, raw_size in pages]
+    conn.executemany('INSERT OR REPLACE INTO job_pages (job_id, codec, raw_size, html) VALUES (?, ?, ?, ?)', rows)
+    return len(rows)
+
+
+def archive_stats(conn):
+    pages, raw, stored = conn.execute(
+        'SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(LENGTH(html)), 0) FROM job_pages'
+    ).fetchone()
+    return {'pages': pages, 'raw_bytes': raw, 'stored_bytes': stored, 'ratio': raw / stored if stored else 0.0}
+
+
+# Re-extraction
+
+def _job_row(job):
+    row = [job.get(column) for column in REEXTRACT_COLUMNS]
+    i = REEXTRACT_COLUMNS.index('education')
+    if not isinstance(row[i], str):
+        row[i] = json.dumps(row[i]) if row[i] else '[]'
+    return row
+
+
+def _extract_batch(pages):
+    """Worker: parse one batch of archived pages; returns (job_id, row or None) pairs"""
+    from data.scrapers.scraper import parse_job_page
+
+    results = []
+    for job_id, codec, blob in pages:
+        try:
+            results.append((job_id, _job_row(parse_job_page(job_id, decompress_page(codec, blob)))))
+        except Exception as e:
+            print(f"Error re-extracting job {job_id}: {str(e)}")
+            results.append((job_id, None))
+    return results
+
+
+def _read_batches(conn, after, batch_size):
+    while True:
+        pages = conn.execute(
+            'SELECT job_pages.job_id, codec, html FROM job_pages JOIN jobs USING (job_id) '
+            'WHERE job_pages.job_id > ? ORDER BY job_pages.job_id LIMIT ?',
+            (after, batch_size)
+        ).fetchall()
+        if not pages:
+            return
+        after = pages[-1][0]
+        yield pages
+
+
+def load_checkpoint(conn, name=DEFAULT_CHECKPOINT):
+    row = conn.execute('SELECT last_job_id, processed, changed FROM reextract_checkpoints WHERE name = ?',
+                       (name,)).fetchone()
+    return {'last_job_id': row[0], 'processed': row[1], 'changed': row[2]} if row else None
+
+
+def reextract(conn, workers=None, batch_size=DEFAULT_BATCH_SIZE, checkpoint=DEFAULT_CHECKPOINT, restart=False,
+              progress=True):
+    """Re-run the current extractors over every archived page of a stored job
+
+    Args:
+        conn: SQLite connection to jobs.db
+        workers: Worker processes (default: one per core)
+        batch_size: Pages per task and per committed transaction
+        checkpoint: Checkpoint name; a run with the same name resumes after
+            the last committed batch of an interrupted run. It is deleted
+            once every page has been processed.
+        restart: Discard the checkpoint and replay from the first page
+        progress: Print a line per committed batch
+
+    Returns:
+        Dict of processed, changed and failed page counts for this call,
+        plus elapsed seconds and pages_per_second
+    """
+    workers = workers or os.cpu_count() or 1
+    if restart:
+        with conn:
+            conn.execute('DELETE FROM reextract_checkpoints WHERE name = ?', (checkpoint,))
+    state = load_checkpoint(conn, checkpoint) or {'last_job_id': '', 'processed': 0, 'changed': 0}
+    total = conn.execute('SELECT COUNT(*) FROM job_pages JOIN jobs USING (job_id) WHERE job_pages.job_id > ?',
+                         (state['last_job_id'],)).fetchone()[0]
+
+    counts = {'processed': 0, 'changed': 0, 'failed': 0}
+    start = time.perf_counter()
+
+    def collect(future):
+        for key, value in zip(('processed', 'changed', 'failed'), _apply(conn, future.result(), checkpoint)):
+            counts[key] += value
+        if progress:
+            _report(counts['processed'], total, counts['changed'], start)
+
+    # forkserver: forking a process that has HTTP or SQLite threads running can deadlock
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver')) as pool:
+        # Keep every worker busy with one batch queued behind it; results are
+        # applied in submission order so the checkpoint only moves forward
+        pending = deque()
+        for batch in _read_batches(conn, state['last_job_id'], batch_size):
+            pending.append(pool.submit(_extract_batch, batch))
+            if len(pending) >= 2 * workers:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+
+    # Finished: only an interrupted run leaves a checkpoint to resume from
+    with conn:
+        conn.execute('DELETE FROM reextract_checkpoints WHERE name = ?', (checkpoint,))
+
+    elapsed = time.perf_counter() - start
+    counts['elapsed'] = elapsed
+    counts['pages_per_second'] = counts['processed'] / elapsed if elapsed > 0 else 0.0
+    return counts
+
+
+def _apply(conn, results, checkpoint):
+    """Write one batch's changed rows, refresh their fingerprints and advance the checkpoint in one transaction
+
+    Returns:
+        (processed, changed, failed)
+    """
+    rows = [(job_id, row) for job_id, row in results if row is not None]
+    with conn:
+        rewritten = [dict(zip(REEXTRACT_COLUMNS, row), job_id=job_id) for job_id, row in rows
+                     if conn.execute(UPDATE_JOB_SQL, row + [job_id] + row).rowcount]
+        changed = len(rewritten)
+        refresh_fingerprints(conn, rewritten)
+        conn.execute('''
+            INSERT INTO reextract_checkpoints (name, last_job_id, processed, changed) VALUES (?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET last_job_id = excluded.last_job_id,
+                processed = processed + excluded.processed, changed = changed + excluded.changed,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (checkpoint, results[-1][0], len(results), changed))
+    return len(results), changed, len(results) - len(rows)
+
+
+def _report(processed, total, changed, start):
+    elapsed = time.perf_counter() - start
+    print(f"🔁 {processed}/{total} pages re-extracted, {changed} jobs changed "
+          f"({processed / elapsed if elapsed > 0 else 0:.0f} pages/s)")
+
+
+def main():
+    from data.database import db
+
+    parser = argparse.ArgumentParser(description='Raw page archive and offline re-extraction')
+    parser.add_argument('command', choices=['stats', 'reextract'])
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--restart', action='store_true')
+    args = parser.parse_args()
+
+    with db.connection() as conn:
+        if args.command == 'stats':
+            s = archive_stats(conn)
+            print(f"🗄️ {s['pages']} archived pages, {s['raw_bytes'] / 2**20:.1f} MiB raw in "
+                  f"{s['stored_bytes'] / 2**20:.1f} MiB ({s['ratio']:.1f}x)")
+            state = load_checkpoint(conn, args.checkpoint)
+            if state:
+                print(f"   interrupted run '{args.checkpoint}': after {state['last_job_id']}, "
+                      f"{state['processed']} processed, {state['changed']} changed")
+            return
+        result = reextract(conn, workers=args.workers, batch_size=args.batch_size,
+                           checkpoint=args.checkpoint, restart=args.restart)
+    print(f"✅ Re-extracted {result['processed']} pages in {result['elapsed']:.1f}s "
+          f"({result['pages_per_second']:.0f} pages/s): {result['changed']} jobs changed, {result['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
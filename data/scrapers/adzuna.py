@@ -1,11 +1,15 @@
-import requests
 import json
 from typing import List, Dict
 from datetime import datetime
 import re
 import os
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.http_client import get_session
+
 # class AdzunaScraper:
     # def __init__(self):
     #     self.app_id = os.getenv('ADZUNA_APP_ID')
@@ -29,7 +33,7 @@ params = {
     "content-type": "application/json"
 }
 
-response = requests.get(base_url, params=params)
+response = get_session().get(base_url, params=params)
 data = response.json()
 
 # Check if we got any jobs back
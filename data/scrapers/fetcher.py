@@ -0,0 +1,347 @@
+"""
+Concurrent page fetcher with per-host token-bucket rate limiting
+
+Detail pages used to be fetched one at a time with a fixed sleep after
+each, so throughput was capped at 1 / (latency + sleep) no matter how fast
+the network was. iter_pages runs the requests on a thread pool over the
+shared keep-alive session (utils/http_client.py) and spaces
+them per host with a token bucket instead: each host still sees at most
+`rate` requests per second (after an initial `burst`), but slow responses
+overlap rather than add up.
+
+AdaptiveConcurrency adds an AIMD controller on top: per host, the number
+of requests in flight grows by one per window of healthy responses and
+halves on a 429, 5xx or connection error, and a Retry-After pauses the
+host, so each source settles near the highest concurrency it sustains.
+"""
+
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+
+from utils.http_client import get_session
+
+
+DEFAULT_WORKERS = 8
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilling `rate` tokens per second up to `burst`
+
+    Callers reserve a token and sleep outside the lock until it is due, so
+    waiting threads queue up in order instead of polling.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, returning how many seconds to wait before it may be used"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        """Block until a token is available; returns the seconds waited"""
+        wait = self.reserve()
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first request to it"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def acquire(self, url):
+        return self.bucket(url).acquire()
+
+
+def retry_after_seconds(response):
+    """Seconds a Retry-After header asks to wait (delta-seconds or HTTP-date), or None"""
+    value = response.headers.get('Retry-After', '').strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_overloaded(status):
+    """Responses that mean the host wants less traffic: 429, 5xx or no response at all"""
+    return status is None or status == 429 or status >= 500
+
+
+class _HostWindow:
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_cut = float('-inf')
+        self.cuts = 0
+        self.peak = limit
+
+
+class AdaptiveConcurrency:
+    """Per-host AIMD limit on requests in flight
+
+    A healthy response raises a host's limit by increase / limit, so about
+    one more slot per round of `limit` responses while all slots are in use
+    (additive increase); an overloaded one multiplies it by `decrease`
+    (multiplicative decrease), at most once per round - responses already
+    in flight when the limit was cut don't cut it again. A Retry-After
+    pauses the host until then.
+
+    Every change is appended to `history` as (seconds since start, host,
+    limit), so a run shows where each source's concurrency settled.
+    """
+
+    def __init__(self, initial=1, minimum=1, maximum=DEFAULT_WORKERS, increase=1.0, decrease=0.5,
+                 clock=time.monotonic):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.clock = clock
+        self.started = clock()
+        self.history = []
+        self._hosts = {}
+        self._condition = threading.Condition()
+
+    def _window(self, host):
+        if host not in self._hosts:
+            self._hosts[host] = _HostWindow(self.initial)
+            self.history.append((self.clock() - self.started, host, self.initial))
+        return self._hosts[host]
+
+    def limit(self, url):
+        with self._condition:
+            return self._window(urlsplit(url).netloc.lower()).limit
+
+    def acquire(self, url):
+        """Block until the host is not paused and has a free slot
+
+        Returns:
+            Token to pass to release()
+        """
+        host = urlsplit(url).netloc.lower()
+        with self._condition:
+            window = self._window(host)
+            while True:
+                pause = window.paused_until - self.clock()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif window.in_flight >= int(window.limit):
+                    self._condition.wait()
+                else:
+                    window.in_flight += 1
+                    return host, self.clock()
+
+    def release(self, token, status=None, retry_after=None):
+        """Free a slot and adapt the host's limit to how the request went
+
+        Args:
+            token: From acquire()
+            status: HTTP status, or None if the request raised
+            retry_after: Seconds the host asked to wait (Retry-After)
+        """
+        host, started = token
+        with self._condition:
+            window = self._hosts[host]
+            window.in_flight -= 1
+            now = self.clock()
+            limit = window.limit
+            if is_overloaded(status):
+                if started >= window.last_cut:
+                    window.limit = max(self.minimum, window.limit * self.decrease)
+                    window.last_cut = now
+                    window.cuts += 1
+                if retry_after:
+                    window.paused_until = max(window.paused_until, now + retry_after)
+            elif status < 400 and window.in_flight + 1 >= int(window.limit):
+                # Only grow while the slots are in use: a host that was never
+                # pushed to its limit says nothing about a higher one
+                window.limit = min(self.maximum, window.limit + self.increase / window.limit)
+            if int(window.limit) != int(limit) or window.limit < limit:
+                self.history.append((now - self.started, host, window.limit))
+            window.peak = max(window.peak, window.limit)
+            self._condition.notify_all()
+
+    def summary(self):
+        with self._condition:
+            return {host: {'limit': w.limit, 'peak': w.peak, 'cuts': w.cuts} for host, w in self._hosts.items()}
+
+    def report(self):
+        for host, s in self.summary().items():
+            print(f"🎚️ {host}: concurrency settled at {s['limit']:.1f} "
+                  f"(peak {s['peak']:.1f}, cut {s['cuts']} times)")
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[round(fraction * (len(ordered) - 1))]
+
+
+class FetchStats:
+    """Per-request latency, status counts and overall throughput of a fetch run"""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = 0
+        self.rate_limit_wait = 0.0
+        self.started = time.perf_counter()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def record(self, latency, status=None, waited=0.0):
+        """Record one request; status None means it raised"""
+        with self._lock:
+            self.latencies.append(latency)
+            self.rate_limit_wait += waited
+            if status is None:
+                self.errors += 1
+            else:
+                self.statuses[status] += 1
+            self.finished = time.perf_counter()
+
+    def summary(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        requests_made = len(self.latencies)
+        return {
+            'requests': requests_made,
+            'ok': self.statuses.get(200, 0),
+            'errors': self.errors,
+            'statuses': dict(self.statuses),
+            'elapsed': elapsed,
+            'pages_per_second': requests_made / elapsed if elapsed > 0 else 0.0,
+            'latency_p50': _percentile(self.latencies, 0.5),
+            'latency_p90': _percentile(self.latencies, 0.9),
+            'latency_p99': _percentile(self.latencies, 0.99),
+            'latency_max': max(self.latencies, default=None),
+            'rate_limit_wait': self.rate_limit_wait,
+        }
+
+    def report(self):
+        s = self.summary()
+        print(f"⏱️ Fetched {s['requests']} pages in {s['elapsed']:.2f}s "
+              f"({s['pages_per_second']:.2f} pages/s, {s['ok']} ok, {s['errors']} errors)")
+        if s['requests']:
+            print(f"   latency p50 {s['latency_p50'] * 1000:.0f}ms, p90 {s['latency_p90'] * 1000:.0f}ms, "
+                  f"p99 {s['latency_p99'] * 1000:.0f}ms, max {s['latency_max'] * 1000:.0f}ms; "
+                  f"{s['rate_limit_wait']:.1f}s spent waiting on the rate limit")
+
+
+def iter_pages(urls, workers=DEFAULT_WORKERS, rate=0.5, burst=1, limiter=None, stats=None,
+               session=None, timeout=None, headers=None, concurrency=None, retries=0):
+    """Fetch urls concurrently, yielding (url, response) as each one completes
+
+    Args:
+        urls: Pages to GET; any iterable, consumed lazily so a generator
+            of URLs is never read more than 2 * workers ahead
+        workers: Number of concurrent requests
+        rate: Requests per second allowed per host
+        burst: Requests a host may receive back to back before rate applies
+        limiter: Shared HostRateLimiter, overriding rate/burst
+        stats: FetchStats to record into
+        session: HttpSession to send through (the shared one by default)
+        timeout: Per-request timeout overriding the session default
+        headers: Extra request headers
+        concurrency: AdaptiveConcurrency bounding requests in flight per
+            host, on top of the rate limit
+        retries: Times to retry a 429/5xx response (after its Retry-After,
+            if any) before yielding it
+
+    Yields:
+        (url, requests.Response), or (url, None) if the request raised
+    """
+    limiter = limiter or HostRateLimiter(rate, burst)
+    stats = stats if stats is not None else FetchStats()
+    session = session or get_session()
+    options = {'headers': headers}
+    if timeout is not None:
+        options['timeout'] = timeout
+
+    def fetch_once(url):
+        # Responses the cache will answer don't spend the host's rate budget
+        if session.is_fresh(url):
+            token, waited = None, 0.0
+        else:
+            token = concurrency.acquire(url) if concurrency is not None else None
+            waited = limiter.acquire(url)
+        start = time.perf_counter()
+        try:
+            response = session.get(url, **options)
+        except requests.RequestException as e:
+            stats.record(time.perf_counter() - start, None, waited)
+            if token is not None:
+                concurrency.release(token, None)
+            print(f"Error fetching {url}: {str(e)}")
+            return None
+        stats.record(time.perf_counter() - start, response.status_code, waited)
+        if token is not None:
+            concurrency.release(token, response.status_code, retry_after_seconds(response))
+        return response
+
+    def fetch(url):
+        response = fetch_once(url)
+        for _ in range(retries):
+            if response is None or not is_overloaded(response.status_code):
+                break
+            if concurrency is None:
+                time.sleep(retry_after_seconds(response) or 1.0)
+            response = fetch_once(url)
+        return url, response
+
+    # At most 2 * workers requests are queued or in flight, so memory stays
+    # flat however many urls there are and however slowly results are consumed
+    urls = iter(urls)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for url in urls:
+            pending.add(executor.submit(fetch, url))
+            if len(pending) < 2 * workers:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def fetch_pages(urls, **kwargs):
+    """Fetch urls concurrently; returns responses (or None) in the order of urls"""
+    responses = dict(iter_pages(urls, **kwargs))
+    return [responses.get(url) for url in urls]
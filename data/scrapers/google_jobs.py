@@ -1,10 +1,14 @@
-import requests
 import json
 from typing import List, Dict
 import time
 from datetime import datetime
 from dotenv import load_dotenv
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.http_client import get_session
 
 load_dotenv()
 
@@ -24,7 +28,7 @@ def google_test():
     }
 
     try:
-        response = requests.get(url, params=params)
+        response = get_session().get(url, params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -0,0 +1,97 @@
+"""
+HTML parser backends for the LinkedIn scraper
+
+The extractors only read a few nodes per page: the top card, the salary
+box, the description and the criteria list on jobPosting pages, and the
+<li> job cards on listing pages. So rather than building a full tree with
+the pure-Python html.parser, pages are parsed with a pluggable backend
+that keeps only those subtrees:
+
+- html.parser: BeautifulSoup's built-in parser, restricted by SoupStrainer
+- lxml: the C lxml parser, restricted by SoupStrainer (default when installed)
+- selectolax: selectolax's C Lexbor parser cuts out the target subtrees,
+  and only that fragment is handed to BeautifulSoup (optional dependency)
+
+Every backend returns a BeautifulSoup, so the bs4 extractors in scraper.py
+work unchanged on any of them.
+"""
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+
+BACKENDS = ('html.parser', 'lxml', 'selectolax')
+DEFAULT_BACKEND = 'lxml' if HAS_LXML else 'html.parser'
+
+# Outermost jobPosting nodes the extractors read
+DETAIL_CLASSES = frozenset({
+    'top-card-layout',                 # job URL, title, company, location
+    'compensation__salary',            # salary box
+    'description__text',               # description, YOE bullets
+    'description__job-criteria-list',  # seniority, employment type, function, industry
+})
+DETAIL_SELECTOR = ', '.join(f'.{name}' for name in sorted(DETAIL_CLASSES))
+LISTING_SELECTOR = 'li'
+
+
+def _has_detail_class(value):
+    # Called with the raw class attribute while parsing, e.g. "salary compensation__salary"
+    return bool(value) and not DETAIL_CLASSES.isdisjoint(value.split())
+
+
+DETAIL_STRAINER = SoupStrainer(class_=_has_detail_class)
+LISTING_STRAINER = SoupStrainer(LISTING_SELECTOR)
+
+
+def available_backends():
+    """Backends usable in this environment"""
+    return [backend for backend in BACKENDS
+            if backend == 'html.parser'
+            or (backend == 'lxml' and HAS_LXML)
+            or (backend == 'selectolax' and SelectolaxParser is not None)]
+
+
+def _selectolax_fragment(html, selector):
+    """HTML of the outermost nodes matching selector, in document order"""
+    tree = SelectolaxParser(html)
+    nodes = tree.css(selector)
+    selected = {node.mem_id for node in nodes}
+    parts = []
+    for node in nodes:
+        parent = node.parent
+        while parent is not None and parent.mem_id not in selected:
+            parent = parent.parent
+        if parent is None:
+            parts.append(node.html)
+    return ''.join(parts)
+
+
+def _soup(html, strainer, selector, backend):
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'selectolax':
+        if SelectolaxParser is None:
+            raise ValueError("selectolax backend requested but selectolax is not installed")
+        return BeautifulSoup(_selectolax_fragment(html, selector), 'html.parser')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    return BeautifulSoup(html, backend, parse_only=strainer)
+
+
+def detail_soup(html, backend=None):
+    """Soup of a jobPosting page holding only the nodes the extractors read"""
+    return _soup(html, DETAIL_STRAINER, DETAIL_SELECTOR, backend)
+
+
+def listing_soup(html, backend=None):
+    """Soup of a seeMoreJobPostings listing page holding only its <li> job cards"""
+    return _soup(html, LISTING_STRAINER, LISTING_SELECTOR, backend)
@@ -1,18 +1,46 @@
-import requests
+import os
+import sys
 import time
 from bs4 import BeautifulSoup
 import re
 import json
-import spacy
-from keybert import KeyBERT
-import subprocess
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from data.frontier import DETAIL, LISTING
+from data.known_jobs import HIGH_WATER, IncrementalStats
+from data.scrapers.fetcher import (DEFAULT_WORKERS, AdaptiveConcurrency, FetchStats, HostRateLimiter, iter_pages,
+                                   retry_after_seconds)
+from data.scrapers.html_parsing import detail_soup, listing_soup
+from data.scrapers.shards import ShardStats, plan_shards
+from utils import extraction
+from utils.http_client import get_session
+
+JOB_POSTING_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+# Remote jobs (f_WT=2) from the last 30 days, newest first (sortBy=DD)
+LISTING_URL = (
+    "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+    "?keywords=&location=&f_TPR=r2592000&f_WT=2&sortBy=DD&start={start}"
+)
+# Per-host budget for detail pages: the same one request per 2 seconds the
+# sequential scraper kept with time.sleep(2), now shared by all workers
+DETAIL_RATE = 0.5
+DETAIL_BURST = 1
+LISTING_PAGE_SIZE = 10
+START_PARAM = re.compile(r'start=\d+')
+
+
+# Job criteria subheaders in page order
+CRITERIA_FIELDS = ('seniority_level', 'employment_type', 'job_function', 'industry')
 
 
 def clean_description(description):
     if description:
-        description = description.text
+        return clean_description_text(description.text)
+    return None
 
+def clean_description_text(description):
+    if description is not None:
         text = re.sub(r'([a-z])([A-Z])', r'\1 \2', description)
         # Convert to lowercase
         text = text.lower()
@@ -34,283 +62,81 @@ def extract_job_url(job_soup):
 
     
 def extract_title(job_soup):
-    title = job_soup.find("h2", {"class": "top-card-layout__title font-sans text-lg papabear:text-xl font-bold leading-open text-color-text mb-0 topcard__title"}).text.strip() if job_soup.find("h2", {"class": "top-card-layout__title font-sans text-lg papabear:text-xl font-bold leading-open text-color-text mb-0 topcard__title"}) else None
-    return title 
+    title = job_soup.find("h2", {"class": "top-card-layout__title font-sans text-lg papabear:text-xl font-bold leading-open text-color-text mb-0 topcard__title"})
+    return title.text.strip() if title else None
 
 def extract_company_name(job_soup):
-    company_name = job_soup.find("a", {"class": "topcard__org-name-link topcard__flavor--black-link"}).text.strip() if job_soup.find("a", {"class": "topcard__org-name-link topcard__flavor--black-link"}) else None
-    return company_name
+    company_name = job_soup.find("a", {"class": "topcard__org-name-link topcard__flavor--black-link"})
+    return company_name.text.strip() if company_name else None
 
 def extract_location(job_soup):
-    location = job_soup.find("span", {"class": "topcard__flavor topcard__flavor--bullet"}).text.strip() if job_soup.find("span", {"class": "topcard__flavor topcard__flavor--bullet"}) else None
-    if not location:
-        return {"location": None, "city": None, "state": None, "country": None}
-    if location == "United States":
-        return {"location": location, "city": None, "state": None,"country": "United States"}
-    
-    location = location.replace(" Metropolitan Area", "")
-
-    parts = [part.strip() for part in location.split(",")]
-
-    result = {
-        "location": location,
-        "city": None,
-        "state": None,
-        "country": "United States"
-    }
-
-    if len(parts) >= 1:
-        result["city"] = parts[0]
-    
-    if len(parts) >= 2:
-        # Handle state abbreviations and full names
-        state = parts[1]
-        # Remove any extra spaces
-        state = state.strip()
-        result["state"] = state
-    
-    return result
+    location = job_soup.find("span", {"class": "topcard__flavor topcard__flavor--bullet"})
+    return extraction.split_location(location.text.strip() if location else None)
 
 def extract_remote_status(job_soup, title, location, description):
     """Extract whether job allows for remote work"""
-    try:
-        remote_keywords = ['remote', 'work from home', 'wfh', 'virtual']
-        if title and any(keyword in title.lower() for keyword in remote_keywords):
-            return 1
-
-        if location and location.lower() == 'remote':
-            return 1
-        if description:
-            remote_phrases = [
-                'remote work', 'work remotely', 'work from home', 'wfh',
-                'virtual position', 'remote position', 'remote role',
-                'work from anywhere', 'remote-first', 'remote friendly'
-            ]
-            if any(phrase in description for phrase in remote_phrases):
-                return 1
-        return 0
-    except:
-        return 0
+    return extraction.is_remote(title, location, description)
+
+def extract_criteria(job_soup):
+    """Read the job criteria list in one walk.
+
+    Criteria are positional: the span after the 1st, 2nd, 3rd and 4th
+    subheader holds seniority level, employment type, job function and
+    industry. Missing entries are None.
+    """
+    criteria = dict.fromkeys(CRITERIA_FIELDS)
+    headers = job_soup.find_all("h3", {"class": "description__job-criteria-subheader"}, limit=len(CRITERIA_FIELDS))
+    for field, header in zip(CRITERIA_FIELDS, headers):
+        value = header.find_next_sibling("span")
+        if value is not None:
+            criteria[field] = value.text.strip()
+    return criteria
 
 def extract_industry(job_soup):
-    try:
-        level_header = job_soup.find("h3", {"class": "description__job-criteria-subheader"})
-        emp_header = level_header.find_next("h3", {"class": "description__job-criteria-subheader"})
-        job_header = emp_header.find_next("h3", {"class": "description__job-criteria-subheader"})
-        industry_header = job_header.find_next("h3", {"class": "description__job-criteria-subheader"})
-        industry = industry_header.find_next_sibling("span").text.strip()
-        return industry
-    except:
-        return None
-    
+    return extract_criteria(job_soup)['industry']
+
 def extract_seniority_level(job_soup):
-    try:
-        level_header = job_soup.find("h3", {"class": "description__job-criteria-subheader"})
-        sen_level = level_header.find_next_sibling("span").text.strip()
-        return sen_level
-    except:
-        return None
+    return extract_criteria(job_soup)['seniority_level']
+
 def extract_employment_type(job_soup):
-    try:
-        level_header = job_soup.find("h3", {"class": "description__job-criteria-subheader"})
-        emp_header = level_header.find_next("h3", {"class": "description__job-criteria-subheader"})
-        emp_type = emp_header.find_next_sibling("span").text.strip()
-        return emp_type
-        
-    except:
-        return None
-    
+    return extract_criteria(job_soup)['employment_type']
+
 def extract_job_function(job_soup):
-    try:
-        level_header = job_soup.find("h3", {"class": "description__job-criteria-subheader"})
-        emp_header = level_header.find_next("h3", {"class": "description__job-criteria-subheader"})
-        job_header = emp_header.find_next("h3", {"class": "description__job-criteria-subheader"})
-        job_function = job_header.find_next_sibling("span").text.strip()
-        return job_function
-        
-    except:
-        return None
-    
-def extract_salary(job_soup, description):
+    return extract_criteria(job_soup)['job_function']
+
+def extract_salary(job_soup, description, description_text=None):
     """Extract salary information with detailed fields."""
-    try:
-        # First try to find salary in the dedicated div
-        salary_div = job_soup.find("div", {"class": "salary compensation__salary"})
-        if salary_div:
-            salary_text = salary_div.text.strip()
-            # Try to parse range first
-            range_pattern = r"\$([\d,]+)(?:\.\d{2})?\s?-\s?\$([\d,]+)(?:\.\d{2})?"
-            range_match = re.search(range_pattern, salary_text)
-            
-            if range_match:
-                min_salary = int(range_match.group(1).replace(',', ''))
-                max_salary = int(range_match.group(2).replace(',', ''))
-                return {
-                    "salary_raw": salary_text,
-                    "salary_min": int(min_salary),
-                    "salary_max": int(max_salary),
-                    "salary_avg": (min_salary + max_salary) / 2
-                }
-            
-            # Try to find single number
-            single_pattern = r"\$([\d,]+)(?:\.\d{2})?"
-            single_match = re.search(single_pattern, salary_text)
-            if single_match:
-                salary = int(single_match.group(1).replace(',', ''))
-                return {
-                    "salary_raw": salary_text,
-                    "salary_min": int(salary),
-                    "salary_max": int(salary),
-                    "salary_avg": salary
-                }
-        
-        # If no salary in div, try description
-        if description and hasattr(description, 'text'):
-            # Try to find range in description
-            range_pattern = r"\$([\d,]+)(?:\.\d{2})?\s?-\s?\$([\d,]+)(?:\.\d{2})?"
-            range_match = re.search(range_pattern, description.text)
-            
-            if range_match:
-                min_salary = int(range_match.group(1).replace(',', ''))
-                max_salary = int(range_match.group(2).replace(',', ''))
-                return {
-                    "salary_raw": range_match.group(0),
-                    "salary_min": int(min_salary),
-                    "salary_max": int(max_salary),
-                    "salary_avg": (min_salary + max_salary) / 2
-                }
-            
-            # Try to find single number in description
-            single_pattern = r"\$([\d,]+)(?:\.\d{2})?"
-            single_match = re.search(single_pattern, description.text)
-            if single_match:
-                salary = int(single_match.group(1).replace(',', ''))
-                return {
-                    "salary_raw": single_match.group(0),
-                    "salary_min": int(salary),
-                    "salary_max": int(salary),
-                    "salary_avg": salary
-                }
-        
-        # If no salary found
-        return {
-            "salary_raw": None,
-            "salary_min": None,
-            "salary_max": None,
-            "salary_avg": None
-        }
-
-    except Exception as e:
-        return {
-            "salary_raw": None,
-            "salary_min": None,
-            "salary_max": None,
-            "salary_avg": None
-        }
-
-def extract_yoe(job_soup, description):
+    # First try to find salary in the dedicated div
+    salary_div = job_soup.find("div", {"class": "salary compensation__salary"})
+    if salary_div:
+        salary_text = salary_div.text.strip()
+        salary = extraction.parse_salary(salary_text)
+        if salary['salary_raw']:
+            # Keep the whole box ("$150,000.00/yr - $190,000.00/yr") as the raw value
+            salary['salary_raw'] = salary_text
+            return salary
+
+    # If no salary in div, try description
+    if description and hasattr(description, 'text'):
+        if description_text is None:
+            description_text = description.text
+        return extraction.parse_salary(description_text)
+
+    return dict(extraction.EMPTY_SALARY)
+
+def extract_yoe(job_soup, description, cleaned_description=None):
     """Extract years of experience with detailed fields."""
-    try:
-        # First try bullet points for precise matches
-        bullet_points = description.find_all(["li", "p"])
-        experience_keywords = [
-            'experience', 'exp', 'minimum', 'at least', 'required',
-            'qualification', 'background', 'track record', 'proven',
-            'demonstrated', 'expertise', 'proficiency'
-        ]
-        
-        yoe_bullets = []
-        numbers_found = []
-        
-        # Check bullet points first
-        for bullet in bullet_points:
-            text = bullet.get_text(strip=True).lower()
-            if not text:
-                continue
-                
-            # Look for ranges first (e.g., "3-5 years", "3 to 5 years")
-            range_pattern = r'(\d+)\s*(?:-|to)\s*(\d+)\s*(?:years?|yrs?)(?:\s+of\s+experience)?'
-            range_match = re.search(range_pattern, text)
-            
-            if range_match and any(keyword in text for keyword in experience_keywords):
-                yoe_bullets.append(text)
-                min_years = int(range_match.group(1))
-                max_years = int(range_match.group(2))
-                return {
-                    "yoe_raw": text,
-                    "yoe_min": min_years,
-                    "yoe_max": max_years,
-                    "yoe_avg": (min_years + max_years) / 2
-                }
-            
-            # Look for single numbers
-            numbers = re.findall(r'\d+', text)
-            if numbers and any(keyword in text for keyword in experience_keywords):
-                yoe_bullets.append(text)
-                numbers_found.extend([int(num) for num in numbers])
-        
-        # If no matches in bullets, try full description
-        if not numbers_found:
-            # Try to find ranges in the full description
-            range_pattern = r'(\d+)\s*(?:-|to)\s*(\d+)\s*(?:years?|yrs?)(?:\s+of\s+experience)?'
-            range_match = re.search(range_pattern, clean_description(description))
-            
-            if range_match:
-                min_years = int(range_match.group(1))
-                max_years = int(range_match.group(2))
-                return {
-                    "yoe_raw": range_match.group(0),
-                    "yoe_min": min_years,
-                    "yoe_max": max_years,
-                    "yoe_avg": (min_years + max_years) / 2
-                }
-            
-            # Try to find single numbers
-            pattern = r'(?:experience|exp|minimum|at least|required):?\s*(\d+)\+?\s*(?:years?|yrs?)(?:\s+of\s+experience)?'
-            matches = re.findall(pattern, clean_description(description))
-            if matches:
-                numbers_found = [int(num) for num in matches]
-        
-        # If we found single numbers, calculate average
-        if numbers_found:
-            avg_years = sum(numbers_found) / len(numbers_found)
-            return {
-                "yoe_raw": str(numbers_found[0]) if len(numbers_found) == 1 else str(numbers_found),
-                "yoe_min": None,
-                "yoe_max": None,
-                "yoe_avg": avg_years
-            }
-            
-        return {
-            "yoe_raw": None,
-            "yoe_min": None,
-            "yoe_max": None,
-            "yoe_avg": None
-        }
-            
-    except Exception as e:
-        return {
-            "yoe_raw": None,
-            "yoe_min": None,
-            "yoe_max": None,
-            "yoe_avg": None
-        }
+    if description is None:
+        return dict(extraction.EMPTY_YOE)
+    # Bullet points first for precise matches, then the full description
+    bullets = [bullet.get_text(strip=True).lower() for bullet in description.find_all(["li", "p"])]
+    if cleaned_description is None:
+        cleaned_description = clean_description(description)
+    return extraction.parse_yoe(cleaned_description, bullets)
     
 def extract_education(job_soup, description):
-# Degree Required - format as a list if mulitple degrees
-
-    try:
-        pattern = r"(?i)\b(bachelor[’']?s|master[’']?s|ph\.?d|doctorate|b\.?s\.?|m\.?s\.)\b"
-        edu = re.findall(pattern, description)
-        
-        edu = [match.lower().replace("’", "'") for match in edu]
-        degree_map = {"bs": "bachelor's", "ms": "master's", "b.s": "bachelor's", "m.s": "master's"}
-        formatted_matches = [degree_map.get(match, match) for match in edu]
-        degrees = list(set(formatted_matches))     
-        return degrees
-    
-    except:
-        return []
+    # Degree Required - format as a list if mulitple degrees
+    return extraction.find_education(description)
 
 # def extract_skills(job_descriptions):
 #     try:
@@ -323,29 +149,40 @@ def extract_education(job_soup, description):
 #     skills = [kw for kw, score in keywords]
 #     return skills
 
-def get_job_ids(num_jobs: int = 50) -> list:
-    """Get a list of job IDs from LinkedIn job listings."""
-    all_jobs = []
-    jobs_found = 0
+def iter_job_ids(num_jobs: int = 50, known=None, high_water: float = HIGH_WATER, stats=None,
+                 url_template: str = LISTING_URL, page_delay: float = 2):
+    """Yield job IDs from LinkedIn job listings, one listing page at a time.
+
+    Each page's cards are reduced to IDs before the next page is fetched,
+    so no parsed page outlives its own loop iteration.
+
+    With `known` (a set or BloomFilter of stored job IDs, see
+    data/known_jobs.py) this is incremental: known IDs are dropped, only new
+    ones count towards num_jobs, and paging stops at the first page where at
+    least `high_water` of the IDs are known, since the listing is newest first.
+    """
+    found = 0
+    seen = set()
     start_position = 0
     max_retries = 3
     retry_delay = 10  # seconds
+    if known is not None and stats is None:
+        stats = IncrementalStats()
 
     # Scrape job listing pages
-    while jobs_found < num_jobs:
-        list_url = (
-            f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-            f"?keywords=&location=&f_TPR=r2592000&f_WT=2&start={start_position}"  # Added f_WT=2 for remote jobs
-        )
+    while found < num_jobs:
+        list_url = url_template.format(start=start_position)
         
         # Try multiple times if we get rate limited
         for attempt in range(max_retries):
-            response = requests.get(list_url)
+            response = get_session().get(list_url)
             if response.status_code == 200:
                 break
             elif response.status_code == 429:
-                print(f"Rate limited. Waiting {retry_delay} seconds... (Attempt {attempt + 1}/{max_retries})")
-                time.sleep(retry_delay)
+                # The server's Retry-After when it sends one, else exponential backoff
+                delay = retry_after_seconds(response) or retry_delay
+                print(f"Rate limited. Waiting {delay} seconds... (Attempt {attempt + 1}/{max_retries})")
+                time.sleep(delay)
                 retry_delay *= 2  # Exponential backoff
             else:
                 print(f"Failed to fetch page {start_position//10 + 1}. Status code: {response.status_code}")
@@ -355,40 +192,121 @@ def get_job_ids(num_jobs: int = 50) -> list:
             print("Max retries reached. Stopping job collection.")
             break
             
-        list_data = response.text
-        list_soup = BeautifulSoup(list_data, "html.parser")
-        more_jobs = list_soup.find_all("li")
+        more_jobs = parse_listing_page(response.text)
+        card_count = len(more_jobs)
         
         if not more_jobs:
             print(f"No more jobs found at position {start_position}")
             break
-            
-        remaining_jobs = num_jobs - jobs_found
-        jobs_to_add = more_jobs[:remaining_jobs]
-        all_jobs.extend(jobs_to_add)
-        jobs_found += len(jobs_to_add)
-        
-        #print(f"Found {len(jobs_to_add)} jobs on page {start_position//10 + 1}")
-        #print(f"Total jobs found so far: {jobs_found}")
+
+        # IDs not already collected earlier in this run
+        page_ids = [job_id for job_id in map(extract_listing_job_id, more_jobs) if job_id and job_id not in seen]
+        page_ids = list(dict.fromkeys(page_ids))
+        del more_jobs, response
+        seen.update(page_ids)
+        new_ids = page_ids
+        if known is not None:
+            new_ids = [job_id for job_id in page_ids if job_id not in known]
+            stats.record_page(len(page_ids), len(page_ids) - len(new_ids))
+
+        for job_id in new_ids[:num_jobs - found]:
+            found += 1
+            yield job_id
         
-        if len(more_jobs) < 10:
+        if card_count < 10:
             print("Last page reached")
             break
+
+        if known is not None and page_ids and len(page_ids) - len(new_ids) >= high_water * len(page_ids):
+            stats.stopped_at = start_position
+            break
             
         start_position += 10
-        time.sleep(2)  # Add small delay between pages
-
-    # Extract job IDs
-    job_id_list = []
-    for job in all_jobs:
-        base_card_div = job.find("div", {"class": "base-card"})
-        if base_card_div:
-            job_id = base_card_div.get("data-entity-urn", "")
-            if job_id:
-                job_id = job_id.split(":")[3]
-                job_id_list.append(job_id)
-    
-    return list(set(job_id_list))
+        time.sleep(page_delay)  # Add small delay between pages
+
+def get_job_ids(num_jobs: int = 50, known=None, high_water: float = HIGH_WATER, stats=None,
+                url_template: str = LISTING_URL, page_delay: float = 2) -> list:
+    """Get a list of job IDs from LinkedIn job listings (see iter_job_ids)."""
+    return list(iter_job_ids(num_jobs, known=known, high_water=high_water, stats=stats,
+                             url_template=url_template, page_delay=page_delay))
+
+def _page_ids(cards):
+    return list(dict.fromkeys(filter(None, map(extract_listing_job_id, cards))))
+
+def iter_shard_job_ids(shards, num_jobs: int = 50, workers: int = DEFAULT_WORKERS, rate: float = DETAIL_RATE,
+                       burst: int = DETAIL_BURST, known=None, high_water: float = HIGH_WATER, stats=None,
+                       shard_stats=None, limiter=None, concurrency=None):
+    """Yield job IDs from several listing searches paged side by side (see shards.py).
+
+    Each round fetches the next page of every shard still going,
+    concurrently within one per-host rate limit (pass `limiter` to share it
+    with the detail fetches). IDs another shard already yielded are dropped,
+    as are `known` ones (see iter_job_ids). A shard stops on its last page,
+    or once `high_water` of a page is known. Overlap with other shards is
+    only reported: nested time windows share their first pages, so it
+    says nothing about what a shard has left.
+    """
+    shard_stats = shard_stats if shard_stats is not None else ShardStats(shards)
+    if known is not None and stats is None:
+        stats = IncrementalStats()
+    limiter = limiter or HostRateLimiter(rate, burst)
+    concurrency = concurrency if concurrency is not None else AdaptiveConcurrency(maximum=workers)
+    templates = {shard.name: shard.url_template for shard in shards}
+    cursors = dict.fromkeys(templates, 0)
+    seen = set()
+    found = 0
+
+    while cursors and found < num_jobs:
+        urls = {templates[name].format(start=cursor): name for name, cursor in cursors.items()}
+        for url, response in iter_pages(list(urls), workers=workers, limiter=limiter, concurrency=concurrency,
+                                        retries=3):
+            name = urls[url]
+            if response is None or response.status_code != 200:
+                status = response.status_code if response is not None else 'request failed'
+                print(f"Failed to fetch listing page {url}. Status code: {status}")
+                shard_stats.stop(name, f'failed ({status})')
+                del cursors[name]
+                continue
+            cards = parse_listing_page(response.text)
+            page_ids = _page_ids(cards)
+            fresh = [job_id for job_id in page_ids if job_id not in seen]
+            seen.update(page_ids)
+            new_ids = fresh if known is None else [job_id for job_id in fresh if job_id not in known]
+            overlap, known_count = len(page_ids) - len(fresh), len(fresh) - len(new_ids)
+            if known is not None:
+                stats.record_page(len(page_ids), known_count)
+            new_ids = new_ids[:num_jobs - found]
+            shard_stats.record_page(name, len(cards), len(new_ids), overlap, known_count)
+            for job_id in new_ids:
+                found += 1
+                yield job_id
+
+            if len(cards) < LISTING_PAGE_SIZE:
+                shard_stats.stop(name, 'last page')
+            elif page_ids and known_count >= high_water * len(page_ids):
+                shard_stats.stop(name, 'caught up with stored jobs')
+            else:
+                cursors[name] += LISTING_PAGE_SIZE
+                continue
+            del cursors[name]
+    for name in cursors:
+        shard_stats.stop(name, 'target reached')
+    shard_stats.report()
+    if stats is not None:
+        stats.report()
+
+def parse_listing_page(html, backend=None):
+    """Job cards (<li> elements) of a seeMoreJobPostings listing page."""
+    return listing_soup(html, backend).find_all("li")
+
+def extract_listing_job_id(job_card):
+    """Job ID from a listing card's data-entity-urn (urn:li:jobPosting:<id>)."""
+    base_card_div = job_card.find("div", {"class": "base-card"})
+    if base_card_div:
+        job_id = base_card_div.get("data-entity-urn", "")
+        if job_id:
+            return job_id.split(":")[3]
+    return None
 
 def extract_job_source(job_url):
     """Extract the source from the job URL."""
@@ -408,75 +326,292 @@ def extract_job_source(job_url):
     except:
         return None
 
-def scrape_jobs(num_jobs: int = 50) -> list:
-    """Scrape job details for the given number of jobs."""
-    # Get job IDs first
-    job_id_list = get_job_ids(num_jobs)
-    print(f"Found {len(job_id_list)} unique job IDs")
+def parse_job_page(job_id, html, backend=None):
+    """Extract a job dict from a LinkedIn jobPosting page.
 
-    # Scrape jobs sequentially
-    job_list = []
-    for job_id in job_id_list:
-        try:
-            job_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-            response = requests.get(job_url)
-            
-            if response.status_code != 200:
-                print(f"Failed to fetch job {job_id}. Status code: {response.status_code}")
-                continue
-                
-            job_soup = BeautifulSoup(response.text, "html.parser")
-            job_post = {}
-
-            # Descriptions
-            raw_description = job_soup.find("div", {"class": "description__text description__text--rich"})
-            cleaned_desc = clean_description(raw_description)
-
-            # Extract all job details
-            job_post["job_id"] = job_id
-            job_post["job_url"] = extract_job_url(job_soup)
-            job_post["source"] = extract_job_source(job_post["job_url"])
-            job_post["title"] = extract_title(job_soup)
-            job_post["company_name"] = extract_company_name(job_soup)
-            job_post["location"] = extract_location(job_soup)['location']
-            job_post["city"] = extract_location(job_soup)['city']
-            job_post["state"] = extract_location(job_soup)['state']
-            job_post["country"] = extract_location(job_soup)['country']
-            job_post["remote"] = extract_remote_status(job_soup, extract_title(job_soup), extract_location(job_soup)['location'], cleaned_desc)
-            job_post["description"] = cleaned_desc
-            job_post['industry'] = extract_industry(job_soup)
-            job_post['seniority_level'] = extract_seniority_level(job_soup)
-            job_post['employment_type'] = extract_employment_type(job_soup)
-            job_post['job_function'] = extract_job_function(job_soup)
-            
-            # Extract salary with all fields
-            salary_data = extract_salary(job_soup, raw_description)
-            job_post['salary_raw'] = salary_data['salary_raw']
-            job_post['salary_min'] = salary_data['salary_min']
-            job_post['salary_max'] = salary_data['salary_max']
-            job_post['salary_avg'] = salary_data['salary_avg']
-            
-            # Extract YOE with all fields
-            yoe_data = extract_yoe(job_soup, raw_description)
-            job_post['yoe_raw'] = yoe_data['yoe_raw']
-            job_post['yoe_min'] = yoe_data['yoe_min']
-            job_post['yoe_max'] = yoe_data['yoe_max']
-            job_post['yoe_avg'] = yoe_data['yoe_avg']
-            
-            job_post['education'] = extract_education(job_soup, cleaned_desc)
-            #job_post['skills'] = extract_skills(cleaned_desc)
+    Only the nodes the extractors read are parsed (see html_parsing.py).
+    """
+    return extract_job_fields(job_id, detail_soup(html, backend))
 
-            job_list.append(job_post)
-            #print(f"Successfully scraped job {job_id} - {job_post.get('title')}")
-            
-            # Add a small delay between requests
-            time.sleep(2)
-            
+def extract_job_fields(job_id, job_soup):
+    """Extract a job dict from a parsed jobPosting page.
+
+    Each DOM anchor is located once, the criteria list is read in one walk
+    and the description text is extracted and cleaned once.
+    """
+    job_post = {}
+
+    # Descriptions
+    raw_description = job_soup.find("div", {"class": "description__text description__text--rich"})
+    description_text = raw_description.text if raw_description else None
+    cleaned_desc = clean_description_text(description_text)
+
+    title = extract_title(job_soup)
+    location = extract_location(job_soup)
+    criteria = extract_criteria(job_soup)
+
+    # Extract all job details
+    job_post["job_id"] = job_id
+    job_post["job_url"] = extract_job_url(job_soup)
+    job_post["source"] = extract_job_source(job_post["job_url"])
+    job_post["title"] = title
+    job_post["company_name"] = extract_company_name(job_soup)
+    job_post["location"] = location['location']
+    job_post["city"] = location['city']
+    job_post["state"] = location['state']
+    job_post["country"] = location['country']
+    job_post["remote"] = extract_remote_status(job_soup, title, location['location'], cleaned_desc)
+    job_post["description"] = cleaned_desc
+    job_post['industry'] = criteria['industry']
+    job_post['seniority_level'] = criteria['seniority_level']
+    job_post['employment_type'] = criteria['employment_type']
+    job_post['job_function'] = criteria['job_function']
+
+    # Extract salary with all fields
+    salary_data = extract_salary(job_soup, raw_description, description_text)
+    job_post['salary_raw'] = salary_data['salary_raw']
+    job_post['salary_min'] = salary_data['salary_min']
+    job_post['salary_max'] = salary_data['salary_max']
+    job_post['salary_avg'] = salary_data['salary_avg']
+
+    # Extract YOE with all fields
+    yoe_data = extract_yoe(job_soup, raw_description, cleaned_desc)
+    job_post['yoe_raw'] = yoe_data['yoe_raw']
+    job_post['yoe_min'] = yoe_data['yoe_min']
+    job_post['yoe_max'] = yoe_data['yoe_max']
+    job_post['yoe_avg'] = yoe_data['yoe_avg']
+
+    job_post['education'] = extract_education(job_soup, cleaned_desc)
+    #job_post['skills'] = extract_skills(cleaned_desc)
+    return job_post
+
+def iter_job_details(job_ids, workers=DEFAULT_WORKERS, rate=DETAIL_RATE, burst=DETAIL_BURST,
+                     url_template=JOB_POSTING_URL, stats=None, archive=None, concurrency=None, retries=2,
+                     limiter=None):
+    """Fetch and parse jobPosting pages concurrently, yielding each job as it is parsed.
+
+    job_ids may be a generator (e.g. iter_job_ids); it is read only a few
+    pages ahead of the requests in flight. Jobs come in completion order.
+    If given, archive(job_id, html) is called with the raw page of every job
+    parsed. Requests in flight adapt to the host (see AdaptiveConcurrency,
+    up to `workers`), and 429/5xx pages are retried `retries` times. Fetch
+    stats are reported once job_ids is exhausted.
+    """
+    stats = stats if stats is not None else FetchStats()
+    concurrency = concurrency if concurrency is not None else AdaptiveConcurrency(maximum=workers)
+    in_flight = {}
+
+    def urls():
+        for job_id in job_ids:
+            url = url_template.format(job_id=job_id)
+            in_flight[url] = job_id
+            yield url
+
+    for url, response in iter_pages(urls(), workers=workers, rate=rate, burst=burst, limiter=limiter, stats=stats,
+                                    concurrency=concurrency, retries=retries):
+        job_id = in_flight.pop(url)
+        if response is None:
+            continue
+        if response.status_code != 200:
+            print(f"Failed to fetch job {job_id}. Status code: {response.status_code}")
+            continue
+        try:
+            job = parse_job_page(job_id, response.text)
+            if archive is not None:
+                archive(job_id, response.text)
+            #print(f"Successfully scraped job {job_id} - {job.get('title')}")
         except Exception as e:
             print(f"Error scraping job {job_id}: {str(e)}")
             continue
-    
-    return job_list
+        yield job
+
+    stats.report()
+    concurrency.report()
+    get_session().report()
+
+def fetch_job_details(job_ids, workers=DEFAULT_WORKERS, rate=DETAIL_RATE, burst=DETAIL_BURST,
+                      url_template=JOB_POSTING_URL, stats=None, archive=None, concurrency=None,
+                      retries=2) -> list:
+    """Fetch and parse jobPosting pages concurrently (see iter_job_details)."""
+    return list(iter_job_details(job_ids, workers=workers, rate=rate, burst=burst, url_template=url_template,
+                                 stats=stats, archive=archive, concurrency=concurrency, retries=retries))
+
+def iter_scrape_jobs(num_jobs: int = 50, workers: int = DEFAULT_WORKERS, rate: float = DETAIL_RATE,
+                     known=None, high_water: float = HIGH_WATER, incremental_stats=None, archive=None,
+                     shards=None):
+    """Yield scraped jobs as their detail pages are parsed.
+
+    Listing pages are paged lazily while detail pages are fetched, so the
+    first jobs arrive after one listing page rather than after all of them.
+    Pass the stored job IDs as `known` to only fetch new postings (see
+    iter_job_ids); the IDs skipped are reported at the end. archive is
+    passed on to iter_job_details. With `shards` (see shards.plan_shards)
+    the listing is fanned out over several searches sharing one rate limit
+    with the detail pages (see iter_shard_job_ids).
+    """
+    if known is not None and incremental_stats is None:
+        incremental_stats = IncrementalStats()
+    limiter = None
+    if shards:
+        limiter = HostRateLimiter(rate, DETAIL_BURST)
+        job_ids = iter_shard_job_ids(shards, num_jobs, workers=workers, known=known, high_water=high_water,
+                                     stats=incremental_stats, limiter=limiter)
+    else:
+        job_ids = iter_job_ids(num_jobs, known=known, high_water=high_water, stats=incremental_stats)
+
+    # Fetch detail pages concurrently within the per-host rate limit
+    yield from iter_job_details(job_ids, workers=workers, rate=rate, archive=archive, limiter=limiter)
+    if incremental_stats is not None and not shards:
+        incremental_stats.report()
+
+def scrape_jobs(num_jobs: int = 50, workers: int = DEFAULT_WORKERS, rate: float = DETAIL_RATE,
+                known=None, high_water: float = HIGH_WATER, incremental_stats=None, archive=None,
+                shards=None) -> list:
+    """Scrape job details for the given number of jobs (see iter_scrape_jobs)."""
+    return list(iter_scrape_jobs(num_jobs, workers=workers, rate=rate, known=known, high_water=high_water,
+                                 incremental_stats=incremental_stats, archive=archive, shards=shards))
+
+def _listing_key(url):
+    """A listing URL without its page offset: the search (shard) it belongs to"""
+    return START_PARAM.sub('start=', url)
+
+def _expand_listing(frontier, item, html, num_jobs, known, high_water, stats, detail_template,
+                    shard_stats, shard_names):
+    """Queue a fetched listing page's new jobs and, unless its shard should stop, the next page"""
+    cards = parse_listing_page(html)
+    page_ids = _page_ids(cards)
+    urls = {job_id: detail_template.format(job_id=job_id) for job_id in page_ids}
+    new_ids = page_ids
+    if known is not None:
+        new_ids = [job_id for job_id in page_ids if job_id not in known]
+        stats.record_page(len(page_ids), len(page_ids) - len(new_ids))
+    known_count = len(page_ids) - len(new_ids)
+    # Already queued by another shard of this run, or fetched by an earlier one
+    existing = frontier.lookup(urls.values())
+    overlap = sum(existing.values())
+    room = max(0, num_jobs - frontier.enqueued(DETAIL))
+    queue = [job_id for job_id in new_ids if urls[job_id] not in existing][:room]
+
+    name = shard_names.get(_listing_key(item['url']), _listing_key(item['url']))
+    shard_stats.record_page(name, len(cards), len(queue), overlap, known_count)
+    if len(cards) < LISTING_PAGE_SIZE:
+        stopped = 'last page'
+    elif len(queue) >= room:
+        stopped = 'target reached'
+    elif page_ids and known_count >= high_water * len(page_ids):
+        stopped = 'caught up with stored jobs'
+        if stats is not None:
+            stats.stopped_at = item['cursor']
+    else:
+        stopped = None
+    next_listing = None
+    if stopped is None:
+        cursor = item['cursor'] + LISTING_PAGE_SIZE
+        next_listing = (START_PARAM.sub(f'start={cursor}', item['url']), cursor)
+    else:
+        shard_stats.stop(name, stopped)
+    frontier.expand(item['url'], [(urls[job_id], job_id) for job_id in queue], next_listing)
+
+def iter_crawl_jobs(frontier, num_jobs: int = 50, workers: int = DEFAULT_WORKERS, rate: float = DETAIL_RATE,
+                    burst: int = DETAIL_BURST, known=None, high_water: float = HIGH_WATER, incremental_stats=None,
+                    archive=None, url_template: str = LISTING_URL, detail_template: str = JOB_POSTING_URL,
+                    worker: str = 'crawler', concurrency=None, shards=None, shard_stats=None,
+                    defer_complete: bool = False, refetch: bool = False):
+    """Yield scraped jobs from a resumable crawl kept in a CrawlFrontier (data/frontier.py).
+
+    Like iter_scrape_jobs, but the listing cursor and every pending detail
+    page live in the frontier instead of local variables: each round claims
+    the next listing page and a batch of detail pages (newest job first),
+    fetches them together under one per-host rate limit, and records each
+    outcome. Requests in flight adapt to the host (see AdaptiveConcurrency),
+    and failed and rate-limited pages are retried after a backoff
+    (Retry-After when the server sends one). If the crawl is interrupted,
+    the next call with the same frontier resumes where it stopped, and pages
+    already done are never fetched again - unless `refetch` starts a fresh
+    run that fetches every listed posting (see CrawlFrontier.start).
+
+    With `shards` (see shards.plan_shards) every shard's listing is paged
+    side by side, one page per shard per round, and job IDs another shard
+    already queued are skipped (see iter_shard_job_ids). Per-shard yield is
+    reported at the end.
+
+    By default a page is marked done just before its job is yielded. With
+    defer_complete it stays claimed by `worker` until the consumer marks it
+    done once the job is stored - a JobSink with on_commit calling
+    frontier.complete_jobs - so a job lost before its batch commits is
+    fetched again when the crawl resumes.
+    """
+    if shards:
+        templates = {shard.url_template: shard.name for shard in shards}
+    else:
+        templates = {url_template: plan_shards()[0].name if url_template == LISTING_URL else url_template}
+    shard_names = {_listing_key(template.format(start=0)): name for template, name in templates.items()}
+    shard_stats = shard_stats if shard_stats is not None else ShardStats()
+    if frontier.start(num_jobs, worker=worker, refetch=refetch):
+        counts = frontier.counts().get(DETAIL, {})
+        print(f"♻️ Resuming crawl run {frontier.run_id}: {counts.get('done', 0)} job pages done, "
+              f"{counts.get('pending', 0)} pending")
+    else:
+        for template in templates:
+            frontier.add_listing(template.format(start=0), 0)
+    if known is not None and incremental_stats is None:
+        incremental_stats = IncrementalStats()
+    limiter = HostRateLimiter(rate, burst)
+    concurrency = concurrency if concurrency is not None else AdaptiveConcurrency(maximum=workers)
+    stats = FetchStats()
+
+    while True:
+        claimed = (frontier.claim(LISTING, worker, limit=len(templates))
+                   + frontier.claim(DETAIL, worker, limit=2 * workers))
+        if not claimed:
+            wait = frontier.next_due(worker if defer_complete else None)
+            if wait is None:
+                break
+            # Only retries backing off (or another worker's claims) are left
+            time.sleep(wait)
+            continue
+
+        items = {item['url']: item for item in claimed}
+        try:
+            for url, response in iter_pages(list(items), workers=workers, limiter=limiter, stats=stats,
+                                            concurrency=concurrency):
+                item = items.pop(url)
+                if response is None:
+                    frontier.fail(url, 'request failed')
+                    continue
+                if response.status_code != 200:
+                    print(f"Failed to fetch {url}. Status code: {response.status_code}")
+                    # Gone or forbidden pages won't come back; 429 and 5xx do
+                    permanent = 400 <= response.status_code < 500 and response.status_code != 429
+                    frontier.fail(url, f"HTTP {response.status_code}", retry_after=retry_after_seconds(response),
+                                  permanent=permanent)
+                    continue
+                if item['kind'] == LISTING:
+                    _expand_listing(frontier, item, response.text, num_jobs, known, high_water,
+                                    incremental_stats, detail_template, shard_stats, shard_names)
+                    continue
+                try:
+                    job = parse_job_page(item['job_id'], response.text)
+                    if archive is not None:
+                        archive(item['job_id'], response.text)
+                except Exception as e:
+                    print(f"Error scraping job {item['job_id']}: {str(e)}")
+                    frontier.fail(url, str(e), permanent=True)
+                    continue
+                if not defer_complete:
+                    frontier.complete([url])
+                yield job
+        finally:
+            # Claimed but not fetched (the consumer stopped early): back to pending
+            frontier.release(list(items))
+
+    frontier.finish()
+    stats.report()
+    concurrency.report()
+    shard_stats.report()
+    if incremental_stats is not None:
+        incremental_stats.report()
+    get_session().report()
 
 # Optional: test block
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+Listing shards - split one LinkedIn search into many smaller ones
+
+A single seeMoreJobPostings search is one cursor: pages come one after
+another and LinkedIn stops serving results long before the whole market
+is covered. plan_shards splits the search space into keyword x location
+x time-window (f_TPR) searches; the scraper pages all shards side by side
+within one per-host rate budget and merges their job IDs, dropping the
+ones another shard already found. Time windows are nested ("past day" is
+inside "past week"), so they mostly help when combined with keyword or
+location shards, which are disjoint.
+
+ShardStats records each shard's yield - pages fetched, new IDs and IDs
+other shards or earlier runs already had - and why it stopped, so shards
+that only repeat others can be dropped from the plan.
+"""
+
+from collections import namedtuple
+from urllib.parse import urlencode
+
+LISTING_BASE = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+# f_TPR values: postings from the past N seconds
+TIME_WINDOWS = {
+    'day': 'r86400',
+    'week': 'r604800',
+    'month': 'r2592000',
+}
+REMOTE = '2'  # f_WT work type
+
+
+class Shard(namedtuple('Shard', 'keywords location window remote')):
+    """One search of the listing endpoint: keywords, location, f_TPR window and f_WT"""
+
+    @property
+    def name(self):
+        parts = [self.keywords or 'any role', self.location or 'anywhere', self.window]
+        return ' / '.join(parts) + (' / remote' if self.remote else '')
+
+    @property
+    def url_template(self):
+        """Listing URL with a {start} placeholder, newest postings first (sortBy=DD)"""
+        params = {'keywords': self.keywords, 'location': self.location, 'f_TPR': TIME_WINDOWS[self.window]}
+        if self.remote:
+            params['f_WT'] = REMOTE
+        params['sortBy'] = 'DD'
+        return f"{LISTING_BASE}?{urlencode(params)}&start={{start}}"
+
+
+def plan_shards(keywords=('',), locations=('',), windows=('month',), remote=True):
+    """Every keyword x location x window combination as a Shard
+
+    With the defaults this is the single search the scraper has always run
+    (LISTING_URL).
+    """
+    unknown = set(windows) - set(TIME_WINDOWS)
+    if unknown:
+        raise ValueError(f"Unknown time windows {sorted(unknown)}; use {sorted(TIME_WINDOWS)}")
+    return [Shard(keyword, location, window, remote)
+            for keyword in keywords for location in locations for window in windows]
+
+
+class ShardStats:
+    """Per-shard listing yield"""
+
+    def __init__(self, shards=()):
+        self.shards = {}
+        for shard in shards:
+            self._entry(shard.name)
+
+    def _entry(self, name):
+        return self.shards.setdefault(name, {'pages': 0, 'cards': 0, 'new': 0, 'overlap': 0, 'known': 0,
+                                             'stopped': None})
+
+    def record_page(self, name, cards, new, overlap=0, known=0):
+        """One listing page: its cards, the IDs it added, and the IDs already
+        found by another shard (overlap) or already stored (known)"""
+        entry = self._entry(name)
+        entry['pages'] += 1
+        entry['cards'] += cards
+        entry['new'] += new
+        entry['overlap'] += overlap
+        entry['known'] += known
+
+    def stop(self, name, reason):
+        self._entry(name)['stopped'] = reason
+
+    def summary(self):
+        return {name: dict(entry) for name, entry in self.shards.items()}
+
+    def report(self):
+        if not self.shards:
+            return
+        total = sum(entry['new'] for entry in self.shards.values())
+        print(f"🧩 {total} job IDs from {len(self.shards)} listing shards:")
+        for name, entry in sorted(self.shards.items(), key=lambda item: -item[1]['new']):
+            seen = entry['new'] + entry['overlap'] + entry['known']
+            share = entry['new'] / seen if seen else 0.0
+            print(f"   {name}: {entry['new']} new of {seen} ({share:.0%}) over {entry['pages']} pages, "
+                  f"{entry['overlap']} overlap, {entry['known']} known; {entry['stopped'] or 'not finished'}")
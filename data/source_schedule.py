@@ -0,0 +1,73 @@
+"""
+Source schedule state - when each configured scrape source runs next and how its last run went
+
+The scheduler daemon (scrapers/scheduler.py) keeps one row per source of
+the registry (scrapers/sources.json): its next run, so a restarted daemon
+picks up the schedule instead of polling everything at once, and the
+start, duration, outcome and yield of its last run, plus counters of runs,
+failures and runs skipped because the previous one was still going.
+"""
+
+import time
+
+SCHEDULE_COLUMNS = ('name', 'kind', 'interval', 'next_run_at', 'last_started_at', 'last_finished_at',
+                    'last_duration', 'last_status', 'last_error', 'last_jobs', 'last_new_jobs',
+                    'runs', 'failures', 'skipped')
+
+
+def ensure_schedule_schema(c):
+    """Create the per-source schedule table"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS source_schedule (
+            name TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            interval REAL NOT NULL,
+            next_run_at REAL,
+            last_started_at REAL,
+            last_finished_at REAL,
+            last_duration REAL,
+            last_status TEXT,
+            last_error TEXT,
+            last_jobs INTEGER,
+            last_new_jobs INTEGER,
+            runs INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+
+def load_schedule(conn):
+    """{source name: row dict} for every source the scheduler has seen"""
+    rows = conn.execute(f"SELECT {', '.join(SCHEDULE_COLUMNS)} FROM source_schedule ORDER BY name")
+    return {row[0]: dict(zip(SCHEDULE_COLUMNS, row)) for row in rows}
+
+
+def schedule_source(conn, name, kind, interval, next_run_at, skipped=0):
+    """Set a source's next run, adding `skipped` to its count of runs skipped for overlapping"""
+    conn.execute('''
+        INSERT INTO source_schedule (name, kind, interval, next_run_at, skipped) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            kind = excluded.kind,
+            interval = excluded.interval,
+            next_run_at = excluded.next_run_at,
+            skipped = skipped + excluded.skipped
+    ''', (name, kind, interval, next_run_at, skipped))
+
+
+def record_start(conn, name, now=None):
+    now = time.time() if now is None else now
+    conn.execute("UPDATE source_schedule SET last_started_at = ?, last_status = 'running' WHERE name = ?",
+                 (now, name))
+
+
+def record_run(conn, name, status, duration, jobs=None, new_jobs=None, error=None, now=None):
+    """Store the outcome of a finished run ('ok' or 'failed')"""
+    now = time.time() if now is None else now
+    conn.execute('''
+        UPDATE source_schedule SET
+            last_finished_at = ?, last_duration = ?, last_status = ?, last_error = ?,
+            last_jobs = ?, last_new_jobs = ?,
+            runs = runs + 1, failures = failures + ?
+        WHERE name = ?
+    ''', (now, duration, status, error, jobs, new_jobs, int(status == 'failed'), name))
@@ -1,8 +1,13 @@
-import requests
+import os
+import sys
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, urlunparse
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http_client import get_session
+
 def ensure_https(url):
     parsed = urlparse(url)
     if parsed.scheme != "https":
@@ -18,7 +23,7 @@ def validate_careers_url(url, keywords=None, timeout=2):
     if keywords is None:
         keywords = ["careers", "jobs", "join-us", "join", "work-with-us", "work-here", "opportunities", "open-positions", "employment", "hiring", "vacancies", "job-openings", "career-opportunities", "job-listings", "apply", "talent", "people", "we-are-hiring", "team", "career-center", "job-board", "recruiting", "career-opportunity", "life-at", "our-team", "current-openings"]
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp = get_session().get(url, headers=headers, timeout=timeout)
         if resp.status_code != 200:
             #print(f"Non-200 status for {url}: {resp.status_code}")
             return False
@@ -49,7 +54,7 @@ def discover_careers_url(website_url, timeout=2, max_candidates=5):
 
     # 2. Scrape homepage ONCE and collect candidate links
     try:
-        resp = requests.get(website_url, headers=headers, timeout=timeout)
+        resp = get_session().get(website_url, headers=headers, timeout=timeout)
         if resp.status_code != 200:
             return None
         soup = BeautifulSoup(resp.text, "html.parser")
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 """
 Simple script to run job scraping for your job board
+
+For continuous ingestion run the scheduler daemon instead, which polls the
+sources in scrapers/sources.json on their own intervals:
+
+    python scrapers/scheduler.py
 """
 
 import os
@@ -11,6 +16,8 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from scrapers.job_scraper_manager import JobScraperManager
+from scrapers.scheduler import print_status
+from scrapers.source_registry import load_config
 
 def main():
     print("🎯 Job Board Scraper")
@@ -60,8 +67,12 @@ def main():
         if results['rss']['error']:
             print(f"❌ RSS errors: {results['rss']['error']}")
         
-        print(f"\n🎉 Scraping completed! Your job board now has more jobs.")
-        print("Visit http://127.0.0.1:8080 to see the updated job board.")
+        if results['summary']['error']:
+            print(f"\n❌ Scraping failed: {results['summary']['dropped_jobs']} scraped jobs were not stored.")
+            print(f"   {results['summary']['error']}")
+        else:
+            print(f"\n🎉 Scraping completed! Your job board now has more jobs.")
+            print("Visit http://127.0.0.1:8080 to see the updated job board.")
         
     elif choice == "2":
         print("\n📋 Job Scraping Recommendations:")
@@ -110,6 +121,9 @@ def main():
             print(f"  Best times: {', '.join(details['best_times'])}")
             print(f"  Weekend scraping: {details['weekend_scraping']}")
         
+        print("\n📅 Configured schedule (scrapers/sources.json, run by scrapers/scheduler.py):")
+        print_status(load_config()[1])
+        
     elif choice == "4":
         print("👋 Goodbye!")
         return
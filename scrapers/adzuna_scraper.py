@@ -0,0 +1,171 @@
+"""
+Adzuna Jobs Scraper - Scrapes job postings using the Adzuna search API
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Iterator, List, Dict, Optional
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import extraction
+from utils.http_client import get_session
+
+logger = logging.getLogger(__name__)
+
+RESULTS_PER_PAGE = 50  # Adzuna's maximum
+
+class AdzunaJobScraper:
+    """
+    Scraper for job postings using the Adzuna search API
+    """
+
+    def __init__(self, what: str = 'software engineer', where: str = '', country: str = 'us'):
+        """
+        Args:
+            what: Keywords to search for
+            where: Location to search in, anywhere if empty
+            country: Adzuna country code of the job board to search
+        """
+        self.what = what
+        self.where = where
+        self.country = country
+        self.app_id = os.getenv('ADZUNA_APP_ID')
+        self.app_key = os.getenv('ADZUNA_APP_KEY')
+        self.base_url = 'https://api.adzuna.com/v1/api/jobs'
+
+        if not self.app_id or not self.app_key:
+            logger.warning("Adzuna API credentials not found. Set ADZUNA_APP_ID and ADZUNA_APP_KEY environment variables.")
+
+    def scrape_jobs(self, max_jobs: int = 50) -> List[Dict]:
+        """
+        Scrape jobs using the Adzuna search API
+
+        Args:
+            max_jobs: Maximum number of jobs to scrape
+
+        Returns:
+            List of job dictionaries
+        """
+        return list(self.iter_jobs(max_jobs))
+
+    def iter_jobs(self, max_jobs: int = 50) -> Iterator[Dict]:
+        """
+        Yield jobs from Adzuna one result page at a time
+
+        Args:
+            max_jobs: Maximum number of jobs to yield
+
+        Yields:
+            Job dictionaries
+        """
+        if not self.app_id or not self.app_key:
+            logger.error("Adzuna API credentials not configured")
+            return
+
+        found = 0
+        page = 1
+        while found < max_jobs:
+            try:
+                logger.info(f"Searching Adzuna for: {self.what} {self.where}".strip())
+                results = self._search_page(page, min(RESULTS_PER_PAGE, max_jobs - found))
+            except Exception as e:
+                logger.error(f"Error searching Adzuna: {e}")
+                return
+            for result in results:
+                job = self._parse_result(result)
+                if not job:
+                    continue
+                yield job
+                found += 1
+                if found >= max_jobs:
+                    return
+            if len(results) < RESULTS_PER_PAGE:
+                return
+            page += 1
+
+    def _search_page(self, page: int, results_per_page: int) -> List[Dict]:
+        """One page of search results"""
+        params = {
+            'app_id': self.app_id,
+            'app_key': self.app_key,
+            'what': self.what,
+            'results_per_page': results_per_page,
+            'content-type': 'application/json'
+        }
+        if self.where:
+            params['where'] = self.where
+        response = get_session().get(f"{self.base_url}/{self.country}/search/{page}", params=params)
+        response.raise_for_status()
+        return response.json().get('results', [])
+
+    def _parse_result(self, result: Dict) -> Optional[Dict]:
+        """
+        Parse an Adzuna search result into a job dictionary
+
+        Args:
+            result: Adzuna result object
+
+        Returns:
+            Job dictionary or None if parsing fails
+        """
+        try:
+            title = (result.get('title') or '').strip()
+            link = result.get('redirect_url', '')
+            description = result.get('description', '')
+
+            if not title or not link:
+                return None
+
+            # Location, remote, salary, YOE, education, employment type, seniority
+            fields = extraction.extract_fields(title, description)
+
+            # Adzuna reports the salary range itself (sometimes its own estimate)
+            salary_min = result.get('salary_min') or fields['salary_min']
+            salary_max = result.get('salary_max') or fields['salary_max']
+            salary_avg = (salary_min + salary_max) / 2 if salary_min and salary_max else fields['salary_avg']
+
+            job = {
+                'id': f"adzuna_{result.get('id')}",
+                'url': link,
+                'source': 'adzuna.com',
+                'title': title,
+                'company': (result.get('company') or {}).get('display_name') or 'Unknown Company',
+                'description': description,
+                'location': (result.get('location') or {}).get('display_name') or fields['location']
+                            or 'Location not specified',
+                'city': fields['city'],
+                'state': fields['state'],
+                'country': fields['country'],
+                'remote': str(fields['remote']),
+                'industry': (result.get('category') or {}).get('label'),
+                'seniority_level': fields['seniority_level'],
+                'employment_type': fields['employment_type'],
+                'job_function': None,
+                'salary_raw': fields['salary_raw'],
+                'salary_min': salary_min,
+                'salary_max': salary_max,
+                'salary_avg': salary_avg,
+                'yoe_raw': fields['yoe_raw'],
+                'yoe_min': fields['yoe_min'],
+                'yoe_max': fields['yoe_max'],
+                'yoe_avg': fields['yoe_avg'],
+                'education': fields['education'],
+                'skills': [],
+                'created_at': self._parse_date(result.get('created'))
+            }
+
+            return job
+
+        except Exception as e:
+            logger.error(f"Error parsing Adzuna result: {e}")
+            return None
+
+    def _parse_date(self, date_string: Optional[str]) -> str:
+        """Adzuna's ISO 8601 'created' timestamp in the standard format"""
+        try:
+            return datetime.strptime(date_string, '%Y-%m-%dT%H:%M:%SZ').strftime('%Y-%m-%d %H:%M:%S')
+        except (TypeError, ValueError):
+            return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
@@ -3,20 +3,38 @@ Google Jobs Scraper - Scrapes job postings using Google Custom Search API
 """
 
 import os
-import requests
+import sys
 import hashlib
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, timezone
+from typing import Iterator, List, Dict, Optional
 import logging
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import extraction
+from utils.http_client import get_session
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_QUERIES = [
+    'software engineer jobs',
+    'data scientist jobs',
+    'product manager jobs',
+    'marketing jobs',
+    'sales jobs'
+]
+
 class GoogleJobsScraper:
     """
     Scraper for job postings using Google Custom Search API
     """
     
-    def __init__(self):
+    def __init__(self, queries: Optional[List[str]] = None):
+        """
+        Args:
+            queries: Search queries to run, DEFAULT_QUERIES if not given
+        """
+        self.queries = list(queries) if queries else list(DEFAULT_QUERIES)
         self.api_key = os.getenv('GOOGLE_API_KEY')
         self.search_engine_id = os.getenv('GOOGLE_SEARCH_ENGINE_ID')
         self.base_url = 'https://www.googleapis.com/customsearch/v1'
@@ -34,31 +52,37 @@ class GoogleJobsScraper:
         Returns:
             List of job dictionaries
         """
+        return list(self.iter_jobs(max_jobs))
+    
+    def iter_jobs(self, max_jobs: int = 50) -> Iterator[Dict]:
+        """
+        Yield jobs from Google Custom Search one query response at a time
+        
+        Args:
+            max_jobs: Maximum number of jobs to yield
+            
+        Yields:
+            Job dictionaries
+        """
         if not self.api_key or not self.search_engine_id:
             logger.error("Google API credentials not configured")
-            return []
+            return
         
-        jobs = []
-        search_queries = [
-            'software engineer jobs',
-            'data scientist jobs',
-            'product manager jobs',
-            'marketing jobs',
-            'sales jobs'
-        ]
+        jobs_per_query = max(1, max_jobs // len(self.queries))
+        found = 0
         
-        jobs_per_query = max_jobs // len(search_queries)
-        
-        for query in search_queries:
+        for query in self.queries:
             try:
                 logger.info(f"Searching Google for: {query}")
                 query_jobs = self._search_jobs(query, jobs_per_query)
-                jobs.extend(query_jobs)
             except Exception as e:
                 logger.error(f"Error searching for {query}: {e}")
                 continue
-        
-        return jobs[:max_jobs]
+            for job in query_jobs:
+                yield job
+                found += 1
+                if found >= max_jobs:
+                    return
     
     def _search_jobs(self, query: str, max_results: int) -> List[Dict]:
         """
@@ -82,7 +106,7 @@ class GoogleJobsScraper:
                 'siteSearch': 'linkedin.com OR indeed.com OR glassdoor.com OR monster.com'
             }
             
-            response = requests.get(self.base_url, params=params)
+            response = get_session().get(self.base_url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -122,8 +146,8 @@ class GoogleJobsScraper:
             # Extract company name from title
             company = self._extract_company_from_title(title)
             
-            # Extract location from title or snippet
-            location = self._extract_location_from_text(f"{title} {snippet}")
+            # Location, remote, salary, YOE, education, employment type, seniority
+            fields = extraction.extract_fields(title, snippet)
             
             job = {
                 'id': job_id,
@@ -132,26 +156,26 @@ class GoogleJobsScraper:
                 'title': title,
                 'company': company,
                 'description': snippet,
-                'location': location,
-                'city': self._extract_city(location),
-                'state': self._extract_state(location),
-                'country': self._extract_country(location),
-                'remote': '1' if 'remote' in location.lower() or 'remote' in snippet.lower() else '0',
+                'location': fields['location'] or 'Location not specified',
+                'city': fields['city'],
+                'state': fields['state'],
+                'country': fields['country'],
+                'remote': str(fields['remote']),
                 'industry': None,
-                'seniority_level': self._extract_seniority_level(snippet),
-                'employment_type': self._extract_employment_type(snippet),
+                'seniority_level': fields['seniority_level'],
+                'employment_type': fields['employment_type'],
                 'job_function': None,
-                'salary_raw': None,
-                'salary_min': None,
-                'salary_max': None,
-                'salary_avg': None,
-                'yoe_raw': None,
-                'yoe_min': None,
-                'yoe_max': None,
-                'yoe_avg': None,
-                'education': [],
+                'salary_raw': fields['salary_raw'],
+                'salary_min': fields['salary_min'],
+                'salary_max': fields['salary_max'],
+                'salary_avg': fields['salary_avg'],
+                'yoe_raw': fields['yoe_raw'],
+                'yoe_min': fields['yoe_min'],
+                'yoe_max': fields['yoe_max'],
+                'yoe_avg': fields['yoe_avg'],
+                'education': fields['education'],
                 'skills': [],
-                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'created_at': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
             }
             
             return job
@@ -185,87 +209,6 @@ class GoogleJobsScraper:
                 return parts[-1].strip()
         
         return 'Unknown Company'
-    
-    def _extract_location_from_text(self, text: str) -> str:
-        """Extract location from text"""
-        import re
-        
-        # Common location patterns
-        location_patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2})',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z][a-z]+)',
-            r'(Remote|Work from home|WFH)',
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                if len(match.groups()) > 1:
-                    return f"{match.group(1)}, {match.group(2)}"
-                else:
-                    location = match.group(1)
-                    if len(location) > 2 and len(location) < 50:
-                        return location
-        
-        return 'Location not specified'
-    
-    def _extract_city(self, location: str) -> str:
-        """Extract city from location string"""
-        if ',' in location:
-            return location.split(',')[0].strip()
-        return location
-    
-    def _extract_state(self, location: str) -> str:
-        """Extract state from location string"""
-        if ',' in location:
-            parts = location.split(',')
-            if len(parts) > 1:
-                return parts[1].strip()
-        return ''
-    
-    def _extract_country(self, location: str) -> str:
-        """Extract country from location string"""
-        if 'remote' in location.lower():
-            return 'Remote'
-        elif 'united states' in location.lower() or 'usa' in location.lower():
-            return 'United States'
-        elif ',' in location:
-            parts = location.split(',')
-            if len(parts) > 2:
-                return parts[2].strip()
-        return 'United States'  # Default assumption
-    
-    def _extract_employment_type(self, text: str) -> str:
-        """Extract employment type from text"""
-        text_lower = text.lower()
-        
-        if 'full-time' in text_lower or 'full time' in text_lower:
-            return 'Full-time'
-        elif 'part-time' in text_lower or 'part time' in text_lower:
-            return 'Part-time'
-        elif 'contract' in text_lower:
-            return 'Contract'
-        elif 'intern' in text_lower:
-            return 'Internship'
-        else:
-            return 'Full-time'  # Default assumption
-    
-    def _extract_seniority_level(self, text: str) -> str:
-        """Extract seniority level from text"""
-        text_lower = text.lower()
-        
-        if 'senior' in text_lower or 'sr.' in text_lower:
-            return 'Senior'
-        elif 'junior' in text_lower or 'jr.' in text_lower:
-            return 'Junior'
-        elif 'lead' in text_lower or 'principal' in text_lower:
-            return 'Lead'
-        elif 'manager' in text_lower or 'director' in text_lower:
-            return 'Management'
-        elif 'intern' in text_lower or 'internship' in text_lower:
-            return 'Intern'
-        else:
-            return 'Mid-level'  # Default assumption
 
 def test_google_scraper():
     """Test function for Google Jobs scraper"""
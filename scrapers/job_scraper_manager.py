@@ -12,7 +12,7 @@ import logging
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data.database import store_job
+from data.job_sink import JobSink
 from scrapers.rss_scraper import RSSJobScraper
 from scrapers.google_jobs_scraper import GoogleJobsScraper
 
@@ -53,105 +53,78 @@ class JobScraperManager:
             Dictionary with scraping results and statistics
         """
         results = {
-            'rss': {'jobs': [], 'error': None},
-            'google': {'jobs': [], 'error': None},
+            'rss': {'count': 0, 'error': None},
+            'google': {'count': 0, 'error': None},
             'summary': {
                 'total_new_jobs': 0,
                 'total_duplicates': 0,
-                'scraping_time': None
+                'dropped_jobs': 0,
+                'scraping_time': None,
+                'error': None
             }
         }
         
         start_time = datetime.now()
         logger.info("🚀 Starting job scraping from all sources...")
         
-        # Scrape RSS feeds
-        if rss_enabled:
-            logger.info("📡 Scraping RSS feeds...")
-            try:
-                rss_jobs = self.scrapers['rss'].scrape_jobs(max_jobs=max_jobs_per_source)
-                results['rss']['jobs'] = rss_jobs
-                logger.info(f"✅ RSS scraping completed: {len(rss_jobs)} jobs found")
-            except Exception as e:
-                results['rss']['error'] = str(e)
-                logger.error(f"❌ RSS scraping failed: {e}")
-        
-        # Scrape Google Jobs (if API key is available)
-        if google_enabled:
-            logger.info("🔍 Scraping Google Jobs API...")
-            try:
-                google_jobs = self.scrapers['google'].scrape_jobs(max_jobs=max_jobs_per_source)
-                results['google']['jobs'] = google_jobs
-                logger.info(f"✅ Google Jobs scraping completed: {len(google_jobs)} jobs found")
-            except Exception as e:
-                results['google']['error'] = str(e)
-                logger.error(f"❌ Google Jobs scraping failed: {e}")
-        
-        # Store all jobs in database
-        all_jobs = results['rss']['jobs'] + results['google']['jobs']
-        new_jobs, duplicates = self._store_jobs(all_jobs)
+        sources = [
+            ('rss', rss_enabled, "📡 Scraping RSS feeds...", "RSS scraping"),
+            ('google', google_enabled, "🔍 Scraping Google Jobs API...", "Google Jobs scraping"),
+        ]
+        # Jobs are stored in micro-batches while the sources are still being scraped
+        sink = JobSink(on_commit=self._commit)
+        try:
+            with sink:
+                for name, enabled, banner, label in sources:
+                    if not enabled:
+                        continue
+                    logger.info(banner)
+                    try:
+                        for job in self.scrapers[name].iter_jobs(max_jobs=max_jobs_per_source):
+                            sink.put(self._to_record(job))
+                            results[name]['count'] += 1
+                        logger.info(f"✅ {label} completed: {results[name]['count']} jobs found")
+                    except Exception as e:
+                        results[name]['error'] = str(e)
+                        logger.error(f"❌ {label} failed: {e}")
+                        if sink.error is not None:
+                            # Storing failed; the remaining sources couldn't be stored either
+                            break
+        except RuntimeError as e:
+            # Raised by the sink on close: some scraped jobs were not stored
+            results['summary']['error'] = str(e)
+            logger.error(f"❌ Storing scraped jobs failed: {e}")
+        summary = sink.summary()
+        new_jobs, duplicates = summary['new_jobs'], summary['duplicates']
         
         # Update results
         results['summary']['total_new_jobs'] = new_jobs
         results['summary']['total_duplicates'] = duplicates
+        results['summary']['dropped_jobs'] = summary['dropped']
         results['summary']['scraping_time'] = (datetime.now() - start_time).total_seconds()
         
         # Update stats
-        self.scraping_stats['total_jobs_scraped'] += len(all_jobs)
-        self.scraping_stats['successful_scrapes'] += 1
+        self.scraping_stats['total_jobs_scraped'] += summary['received']
+        self.scraping_stats['failed_scrapes' if results['summary']['error'] else 'successful_scrapes'] += 1
         self.scraping_stats['last_scrape_time'] = datetime.now()
         
-        logger.info(f"🎉 Scraping completed! {new_jobs} new jobs, {duplicates} duplicates")
+        if results['summary']['error']:
+            logger.error(f"❌ Scraping failed: {new_jobs} new jobs stored, {summary['dropped']} jobs not stored")
+            return results
+        logger.info(f"🎉 Scraping completed! {new_jobs} new jobs, {duplicates} duplicates "
+                    f"({summary['batches']} batches, first stored after {summary['first_commit_seconds'] or 0:.1f}s)")
         return results
     
-    def _store_jobs(self, jobs: List[Dict]) -> tuple:
-        """
-        Store jobs in database and return count of new vs duplicate jobs
-        
-        Returns:
-            Tuple of (new_jobs_count, duplicate_jobs_count)
-        """
-        new_jobs = 0
-        duplicates = 0
-        
-        for job in jobs:
-            try:
-                # Try to store the job
-                store_job(
-                    job_id=job.get('id'),
-                    job_url=job.get('url'),
-                    source=job.get('source'),
-                    title=job.get('title'),
-                    company_name=job.get('company'),
-                    description=job.get('description'),
-                    location=job.get('location'),
-                    city=job.get('city'),
-                    state=job.get('state'),
-                    country=job.get('country'),
-                    remote=job.get('remote'),
-                    industry=job.get('industry'),
-                    seniority_level=job.get('seniority_level'),
-                    employment_type=job.get('employment_type'),
-                    job_function=job.get('job_function'),
-                    salary_raw=job.get('salary_raw'),
-                    salary_min=job.get('salary_min'),
-                    salary_max=job.get('salary_max'),
-                    salary_avg=job.get('salary_avg'),
-                    yoe_raw=job.get('yoe_raw'),
-                    yoe_min=job.get('yoe_min'),
-                    yoe_max=job.get('yoe_max'),
-                    yoe_avg=job.get('yoe_avg'),
-                    education=job.get('education'),
-                    skills=job.get('skills')
-                )
-                new_jobs += 1
-            except Exception as e:
-                if "UNIQUE constraint failed" in str(e):
-                    duplicates += 1
-                else:
-                    logger.error(f"Error storing job {job.get('id', 'unknown')}: {e}")
-        
-        return new_jobs, duplicates
+    @staticmethod
+    def _to_record(job: Dict) -> Dict:
+        """Scraper dicts use short keys for a few columns; everything else matches"""
+        return dict(job, job_id=job.get('id'), job_url=job.get('url'), company_name=job.get('company'))
+    
+    def _commit(self, jobs: List[Dict]):
+        """Let scrapers that track what they handed out (RSS feed entries) know these jobs are stored"""
+        for scraper in self.scrapers.values():
+            if hasattr(scraper, 'commit'):
+                scraper.commit(jobs)
     
     def get_scraping_recommendations(self) -> Dict:
         """
@@ -300,5 +273,8 @@ def main():
     if results['google']['error']:
         print(f"  • Google errors: {results['google']['error']}")
 
+    if results['summary']['error']:
+        print(f"  • ❌ {results['summary']['dropped_jobs']} scraped jobs were not stored: {results['summary']['error']}")
+
 if __name__ == "__main__":
     main()
@@ -1,72 +1,157 @@
 """
 RSS Job Scraper - Scrapes job postings from RSS feeds
+
+Feeds are polled concurrently. Each feed's ETag/Last-Modified is kept in
+jobs.db and sent back on the next poll, so an unchanged feed costs one 304,
+and entries whose guid was seen in an earlier poll are skipped before they
+are parsed (see data/feed_state.py).
+
+An entry only counts as seen once its job is stored: pass commit as the
+on_commit of the JobSink the jobs go to. Until every entry of a poll is
+committed its validators are not kept, so the next poll fetches the full
+feed and parses whatever was lost.
 """
 
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import feedparser
-import requests
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timezone
 import hashlib
 import re
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 import logging
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.database import (get_feed_state, get_unseen_feed_entries, mark_feed_entries_seen, record_feed_poll,
+                           set_feed_validators)
+from data.feed_state import conditional_headers
+from scrapers.source_registry import load_feeds
+from utils import extraction
+from utils.http_client import get_session
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_FEED_WORKERS = 8
+
 class RSSJobScraper:
     """
     Scraper for job postings from RSS feeds
     """
     
-    def __init__(self):
-        self.rss_feeds = [
-            {
-                'name': 'LinkedIn Jobs',
-                'url': 'https://www.linkedin.com/jobs/search/rss/?keywords=software%20engineer&location=United%20States',
-                'source': 'linkedin.com'
-            },
-            {
-                'name': 'Indeed Jobs',
-                'url': 'https://rss.indeed.com/rss?q=software+engineer&l=United+States',
-                'source': 'indeed.com'
-            },
-            {
-                'name': 'Remote Jobs',
-                'url': 'https://remote.co/remote-jobs/feed/',
-                'source': 'remote.co'
-            },
-            {
-                'name': 'AngelList Jobs',
-                'url': 'https://angel.co/jobs.rss',
-                'source': 'angel.co'
-            }
-        ]
+    def __init__(self, feeds: Optional[List[Dict]] = None, max_workers: int = DEFAULT_FEED_WORKERS,
+                 track_state: bool = True):
+        """
+        Args:
+            feeds: {'name', 'url', 'source'} dicts to poll; the RSS sources
+                of scrapers/sources.json if not given
+            max_workers: Feeds polled at once
+            track_state: Send conditional requests and skip seen entries,
+                using the poll state stored in jobs.db
+        """
+        self.max_workers = max_workers
+        self.track_state = track_state
+        self.rss_feeds = list(feeds) if feeds is not None else load_feeds()
+        # job ID -> [(poll, guid)] of entries handed out but not yet stored
+        self._uncommitted = {}
+        self._lock = threading.Lock()
     
     def scrape_jobs(self, max_jobs: int = 50) -> List[Dict]:
         """
         Scrape jobs from RSS feeds
         
+        Call commit with the jobs once they are stored, or their entries
+        are parsed again on the next poll.
+        
         Args:
             max_jobs: Maximum number of jobs to scrape
             
         Returns:
             List of job dictionaries
         """
-        all_jobs = []
+        return list(self.iter_jobs(max_jobs))
+    
+    def commit(self, jobs: List[Dict]):
+        """
+        Mark the feed entries of stored jobs seen (a JobSink on_commit)
+        
+        A feed's validators are kept once every entry of its last poll is
+        stored. Jobs this scraper did not hand out are ignored.
+        """
+        seen, finished = {}, []
+        with self._lock:
+            for job in jobs:
+                for poll, guid in self._uncommitted.pop(job.get('id'), ()):
+                    seen.setdefault(poll['url'], []).append(guid)
+                    poll['outstanding'] -= 1
+                    if not poll['outstanding'] and poll['validators']:
+                        finished.append((poll['url'], *poll['validators']))
+        for url, guids in seen.items():
+            mark_feed_entries_seen(url, guids)
+        for url, etag, last_modified in finished:
+            set_feed_validators(url, etag, last_modified)
+    
+    def _merge(self, job: Dict, kept_id: str):
+        """Commit a cross-feed duplicate's entry together with the job it duplicates"""
+        with self._lock:
+            if job['id'] == kept_id:
+                return
+            if kept_id in self._uncommitted:
+                self._uncommitted[kept_id].extend(self._uncommitted.pop(job['id'], ()))
+                return
+        # The kept job is stored already (or untracked)
+        self.commit([job])
+    
+    def iter_jobs(self, max_jobs: int = 50) -> Iterator[Dict]:
+        """
+        Yield jobs from RSS feeds as each feed is parsed, skipping duplicates
         
-        for feed in self.rss_feeds:
-            try:
-                logger.info(f"Scraping RSS feed: {feed['name']}")
-                jobs = self._scrape_feed(feed, max_jobs // len(self.rss_feeds))
-                all_jobs.extend(jobs)
-                logger.info(f"Found {len(jobs)} jobs from {feed['name']}")
-            except Exception as e:
-                logger.error(f"Error scraping {feed['name']}: {e}")
-                continue
+        Feeds are polled concurrently and parsed in the order they arrive;
+        unchanged feeds and entries seen in earlier polls yield nothing.
+        
+        Args:
+            max_jobs: Maximum number of jobs to yield
+            
+        Yields:
+            Job dictionaries
+        """
+        if not self.rss_feeds:
+            return
+        seen = {}
+        found = 0
         
-        # Remove duplicates and limit results
-        unique_jobs = self._remove_duplicates(all_jobs)
-        return unique_jobs[:max_jobs]
+        workers = max(1, min(self.max_workers, len(self.rss_feeds)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            polls = {executor.submit(self._poll_feed, feed): feed for feed in self.rss_feeds}
+            for future in as_completed(polls):
+                feed = polls[future]
+                response = future.result()
+                if response is None:
+                    continue
+                try:
+                    logger.info(f"Scraping RSS feed: {feed['name']}")
+                    feed_jobs = 0
+                    for job in self._iter_entries(feed, response, max(1, max_jobs // len(self.rss_feeds))):
+                        # Same title at the same company counts once across feeds
+                        key = (job['title'].lower(), job['company'].lower())
+                        if key in seen:
+                            self._merge(job, seen[key])
+                            continue
+                        seen[key] = job['id']
+                        feed_jobs += 1
+                        found += 1
+                        yield job
+                        if found >= max_jobs:
+                            for pending in polls:
+                                pending.cancel()
+                            return
+                    logger.info(f"Found {feed_jobs} jobs from {feed['name']}")
+                except Exception as e:
+                    logger.error(f"Error scraping {feed['name']}: {e}")
+                    continue
     
     def _scrape_feed(self, feed: Dict, max_jobs: int) -> List[Dict]:
         """
@@ -79,28 +164,110 @@ class RSSJobScraper:
         Returns:
             List of job dictionaries
         """
-        jobs = []
+        return list(self._iter_feed(feed, max_jobs))
+    
+    def _iter_feed(self, feed: Dict, max_jobs: int) -> Iterator[Dict]:
+        """
+        Yield jobs from a single RSS feed as its entries are parsed
+        
+        Args:
+            feed: Feed configuration dictionary
+            max_jobs: Maximum jobs to yield from this feed
+        """
+        response = self._poll_feed(feed)
+        if response is not None:
+            yield from self._iter_entries(feed, response, max_jobs)
+    
+    def _poll_feed(self, feed: Dict):
+        """
+        Conditionally GET a feed over the shared keep-alive session
         
+        Returns:
+            The response, or None if the feed is unchanged since the last
+            poll (304) or could not be fetched
+        """
         try:
-            # Parse RSS feed
-            feed_data = feedparser.parse(feed['url'])
-            
-            if feed_data.bozo:
-                logger.warning(f"RSS feed {feed['name']} has parsing issues")
-            
-            for entry in feed_data.entries[:max_jobs]:
+            headers = conditional_headers(get_feed_state(feed['url'])) if self.track_state else {}
+            response = get_session().get(feed['url'], headers=headers)
+            # A 200's validators are stored once its entries are stored
+            if self.track_state and response.status_code != 200:
+                record_feed_poll(feed['url'], response.status_code)
+            if response.status_code == 304:
+                logger.info(f"RSS feed {feed['name']} unchanged since the last poll")
+                return None
+            response.raise_for_status()
+            return response
+        except Exception as e:
+            logger.error(f"Error fetching RSS feed {feed['name']}: {e}")
+            return None
+    
+    def _iter_entries(self, feed: Dict, response, max_jobs: int) -> Iterator[Dict]:
+        """
+        Yield jobs from a fetched feed's entries not seen in an earlier poll
+        
+        Args:
+            feed: Feed configuration dictionary
+            response: The feed's 200 response
+            max_jobs: Maximum entries to parse from this feed
+        """
+        feed_data = feedparser.parse(response.content, response_headers={
+            'content-location': response.url,
+            'content-type': response.headers.get('Content-Type', ''),
+        })
+        
+        if feed_data.bozo:
+            logger.warning(f"RSS feed {feed['name']} has parsing issues")
+        
+        entries = {}
+        for entry in feed_data.entries:
+            guid = entry.get('id') or entry.get('link') or entry.get('title')
+            if guid:
+                entries.setdefault(guid, entry)
+        guids = list(entries)
+        if self.track_state:
+            guids = get_unseen_feed_entries(feed['url'], guids)
+            skipped = len(entries) - len(guids)
+            if skipped:
+                logger.info(f"Skipped {skipped} entries of {feed['name']} seen in earlier polls")
+        
+        poll = {'url': feed['url'], 'outstanding': 0, 'validators': None}
+        processed = 0
+        unusable = []
+        try:
+            for guid in guids[:max_jobs]:
+                processed += 1
                 try:
-                    job = self._parse_rss_entry(entry, feed['source'])
-                    if job:
-                        jobs.append(job)
+                    job = self._parse_rss_entry(entries[guid], feed['source'])
                 except Exception as e:
                     logger.error(f"Error parsing RSS entry: {e}")
+                    job = None
+                if not job:
+                    # Parsing it again won't help
+                    unusable.append(guid)
                     continue
-                    
-        except Exception as e:
-            logger.error(f"Error fetching RSS feed {feed['name']}: {e}")
-        
-        return jobs
+                if self.track_state:
+                    with self._lock:
+                        self._uncommitted.setdefault(job['id'], []).append((poll, guid))
+                        poll['outstanding'] += 1
+                yield job
+        finally:
+            # Entries handed out count as seen once commit() is called for
+            # their jobs. The validators wait for the last of them, and are
+            # dropped if some entries were left over, so until then the next
+            # poll gets the full feed instead of a 304 and parses the rest.
+            if self.track_state:
+                if unusable:
+                    mark_feed_entries_seen(feed['url'], unusable)
+                record_feed_poll(feed['url'], 200)
+                validators = None
+                if processed == len(guids):
+                    with self._lock:
+                        if poll['outstanding']:
+                            poll['validators'] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                        else:
+                            validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                if validators:
+                    set_feed_validators(feed['url'], *validators)
     
     def _parse_rss_entry(self, entry, source: str) -> Optional[Dict]:
         """
@@ -129,14 +296,8 @@ class RSSJobScraper:
             # Extract company name from title or description
             company = self._extract_company(title, description)
             
-            # Extract location
-            location = self._extract_location(title, description)
-            
-            # Extract salary information
-            salary_info = self._extract_salary(description)
-            
-            # Extract employment type
-            employment_type = self._extract_employment_type(description)
+            # Location, remote, salary, YOE, education, employment type, seniority
+            fields = extraction.extract_fields(title, description)
             
             # Parse published date
             published_date = self._parse_date(published)
@@ -148,24 +309,24 @@ class RSSJobScraper:
                 'title': title,
                 'company': company,
                 'description': description,
-                'location': location,
-                'city': self._extract_city(location),
-                'state': self._extract_state(location),
-                'country': self._extract_country(location),
-                'remote': '1' if 'remote' in location.lower() or 'remote' in description.lower() else '0',
+                'location': fields['location'] or 'Location not specified',
+                'city': fields['city'],
+                'state': fields['state'],
+                'country': fields['country'],
+                'remote': str(fields['remote']),
                 'industry': None,
-                'seniority_level': self._extract_seniority_level(description),
-                'employment_type': employment_type,
+                'seniority_level': fields['seniority_level'],
+                'employment_type': fields['employment_type'],
                 'job_function': None,
-                'salary_raw': salary_info.get('raw'),
-                'salary_min': salary_info.get('min'),
-                'salary_max': salary_info.get('max'),
-                'salary_avg': salary_info.get('avg'),
-                'yoe_raw': None,
-                'yoe_min': None,
-                'yoe_max': None,
-                'yoe_avg': None,
-                'education': [],
+                'salary_raw': fields['salary_raw'],
+                'salary_min': fields['salary_min'],
+                'salary_max': fields['salary_max'],
+                'salary_avg': fields['salary_avg'],
+                'yoe_raw': fields['yoe_raw'],
+                'yoe_min': fields['yoe_min'],
+                'yoe_max': fields['yoe_max'],
+                'yoe_avg': fields['yoe_avg'],
+                'education': fields['education'],
                 'skills': [],
                 'created_at': published_date
             }
@@ -201,143 +362,20 @@ class RSSJobScraper:
         
         return 'Unknown Company'
     
-    def _extract_location(self, title: str, description: str) -> str:
-        """Extract location from title or description"""
-        # Common location patterns
-        location_patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2})',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z][a-z]+)',
-            r'(Remote|Work from home|WFH)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-        ]
-        
-        text = f"{title} {description}"
-        for pattern in location_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                if len(match.groups()) > 1:
-                    return f"{match.group(1)}, {match.group(2)}"
-                else:
-                    location = match.group(1)
-                    if len(location) > 2 and len(location) < 50:
-                        return location
-        
-        return 'Location not specified'
-    
-    def _extract_city(self, location: str) -> str:
-        """Extract city from location string"""
-        if ',' in location:
-            return location.split(',')[0].strip()
-        return location
-    
-    def _extract_state(self, location: str) -> str:
-        """Extract state from location string"""
-        if ',' in location:
-            parts = location.split(',')
-            if len(parts) > 1:
-                return parts[1].strip()
-        return ''
-    
-    def _extract_country(self, location: str) -> str:
-        """Extract country from location string"""
-        if 'remote' in location.lower():
-            return 'Remote'
-        elif 'united states' in location.lower() or 'usa' in location.lower():
-            return 'United States'
-        elif ',' in location:
-            parts = location.split(',')
-            if len(parts) > 2:
-                return parts[2].strip()
-        return 'United States'  # Default assumption
-    
-    def _extract_salary(self, description: str) -> Dict:
-        """Extract salary information from description"""
-        salary_patterns = [
-            r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*[-–]\s*\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*\+',
-            r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*[-–]\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*k',
-        ]
-        
-        for pattern in salary_patterns:
-            match = re.search(pattern, description, re.IGNORECASE)
-            if match:
-                if len(match.groups()) == 2:
-                    min_sal = int(match.group(1).replace(',', ''))
-                    max_sal = int(match.group(2).replace(',', ''))
-                    return {
-                        'raw': match.group(0),
-                        'min': min_sal,
-                        'max': max_sal,
-                        'avg': (min_sal + max_sal) / 2
-                    }
-                else:
-                    sal = int(match.group(1).replace(',', ''))
-                    return {
-                        'raw': match.group(0),
-                        'min': sal,
-                        'max': None,
-                        'avg': sal
-                    }
-        
-        return {'raw': None, 'min': None, 'max': None, 'avg': None}
-    
-    def _extract_employment_type(self, description: str) -> str:
-        """Extract employment type from description"""
-        description_lower = description.lower()
-        
-        if 'full-time' in description_lower or 'full time' in description_lower:
-            return 'Full-time'
-        elif 'part-time' in description_lower or 'part time' in description_lower:
-            return 'Part-time'
-        elif 'contract' in description_lower:
-            return 'Contract'
-        elif 'intern' in description_lower:
-            return 'Internship'
-        else:
-            return 'Full-time'  # Default assumption
-    
-    def _extract_seniority_level(self, description: str) -> str:
-        """Extract seniority level from description"""
-        description_lower = description.lower()
-        
-        if 'senior' in description_lower or 'sr.' in description_lower:
-            return 'Senior'
-        elif 'junior' in description_lower or 'jr.' in description_lower:
-            return 'Junior'
-        elif 'lead' in description_lower or 'principal' in description_lower:
-            return 'Lead'
-        elif 'manager' in description_lower or 'director' in description_lower:
-            return 'Management'
-        elif 'intern' in description_lower or 'internship' in description_lower:
-            return 'Intern'
-        else:
-            return 'Mid-level'  # Default assumption
-    
     def _parse_date(self, date_string: str) -> str:
-        """Parse date string to standard format"""
+        """Parse date string to standard format, in UTC like SQLite's CURRENT_TIMESTAMP"""
         try:
             if not date_string:
-                return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
             
             # Try to parse the date
             from dateutil import parser
             parsed_date = parser.parse(date_string)
+            if parsed_date.tzinfo is not None:
+                parsed_date = parsed_date.astimezone(timezone.utc)
             return parsed_date.strftime('%Y-%m-%d %H:%M:%S')
         except:
-            return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    def _remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate jobs based on title and company"""
-        seen = set()
-        unique_jobs = []
-        
-        for job in jobs:
-            key = (job['title'].lower(), job['company'].lower())
-            if key not in seen:
-                seen.add(key)
-                unique_jobs.append(job)
-        
-        return unique_jobs
+            return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
 
 def test_rss_scraper():
     """Test function for RSS scraper"""
@@ -0,0 +1,275 @@
+"""
+Scheduler daemon - polls every configured scrape source on its own interval
+
+Loads the source registry (scrapers/sources.json, see source_registry.py)
+and keeps ingestion running at a controlled cost:
+
+- each source runs every interval_minutes, plus or minus its jitter share
+  at random, so sources with the same interval drift apart instead of
+  hitting the network together
+- a source never overlaps itself: if its next run comes due while the
+  last one is still going, that run is skipped (and counted), and
+  LinkedIn sources take turns (see Source.lock)
+- at most max_concurrent sources run at once; due sources beyond that
+  wait for a free slot, earliest due first
+- each source's next run, last duration, outcome and yield are stored in
+  jobs.db (data/source_schedule.py), so a restarted daemon keeps the
+  schedule, and overdue sources are spread over their jitter window
+  instead of all starting together
+
+Jobs are stored through a JobSink as each source produces them.
+
+    python scrapers/scheduler.py                  # run until SIGINT/SIGTERM
+    python scrapers/scheduler.py --once           # run each enabled source once, then exit
+    python scrapers/scheduler.py status           # next and last run of every source
+"""
+
+import argparse
+import math
+import os
+import random
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.database import (complete_crawled_jobs, db, get_known_job_ids, get_source_schedule, init_db,
+                           record_source_run, record_source_start, set_source_next_run)
+from data.frontier import CrawlFrontier
+from data.job_sink import JobSink
+from data.page_archive import compress_page
+from data.scrapers.scraper import iter_crawl_jobs
+from data.scrapers.shards import plan_shards
+from scrapers.adzuna_scraper import AdzunaJobScraper
+from scrapers.google_jobs_scraper import GoogleJobsScraper
+from scrapers.job_scraper_manager import JobScraperManager
+from scrapers.rss_scraper import RSSJobScraper
+from scrapers.source_registry import DEFAULT_CONFIG, load_config
+
+logger = logging.getLogger(__name__)
+
+MAX_SLEEP = 60.0  # seconds between checks when nothing is due sooner
+
+
+def source_scraper(source):
+    """The scraper object for an rss, google or adzuna source"""
+    if source.kind == 'rss':
+        return RSSJobScraper(feeds=[{'name': source.name, **source.options}])
+    if source.kind == 'google':
+        return GoogleJobsScraper(queries=source.options['queries'])
+    if source.kind == 'adzuna':
+        return AdzunaJobScraper(**source.options)
+    raise ValueError(f"No scraper for {source.kind} sources")
+
+
+def run_source(source):
+    """Scrape one source into jobs.db; returns {'jobs', 'new_jobs', 'duplicates'}
+
+    Raises if any scraped job could not be stored, so the run is recorded
+    as failed.
+    """
+    if source.kind == 'linkedin':
+        scraper, on_commit = None, complete_crawled_jobs
+    else:
+        scraper = source_scraper(source)
+        on_commit = getattr(scraper, 'commit', None)
+    with JobSink(on_commit=on_commit) as sink:
+        if scraper is None:
+            # Same path as data/job_pipeline.py, with the source's own shards and frontier run
+            options = source.options
+            shards = plan_shards(options['keywords'], options['locations'], options['windows'], options['remote'])
+            with db.connection() as conn:
+                archive = lambda job_id, html: sink.put_page((job_id, *compress_page(html)))
+                for job in iter_crawl_jobs(CrawlFrontier(conn, name=source.name), num_jobs=source.max_jobs,
+                                           known=get_known_job_ids(), archive=archive, shards=shards,
+                                           defer_complete=True):
+                    sink.put(job)
+        else:
+            for job in scraper.iter_jobs(max_jobs=source.max_jobs):
+                sink.put(JobScraperManager._to_record(job))
+    summary = sink.summary()
+    return {'jobs': summary['received'], 'new_jobs': summary['new_jobs'], 'duplicates': summary['duplicates']}
+
+
+class SourceScheduler:
+    """Runs sources on their intervals with jitter, no self-overlap and a global concurrency cap"""
+
+    def __init__(self, sources, max_concurrent=4, runner=run_source, clock=time.time, seed=None):
+        """
+        Args:
+            sources: Source tuples to schedule (see source_registry.load_sources)
+            max_concurrent: Sources running at once
+            runner: Called with a Source to run it; returns a dict with
+                'jobs' and 'new_jobs', raises on failure
+            clock: Wall clock for the schedule
+            seed: Seed for the jitter
+        """
+        self.sources = {source.name: source for source in sources}
+        self.max_concurrent = max_concurrent
+        self.runner = runner
+        self.clock = clock
+        self.next_run = {}
+        self.runs = []
+        self._running = {}
+        self._locks = set()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def _interval(self, source):
+        """The source's interval, plus or minus up to its jitter share"""
+        return source.interval * (1 + self._random.uniform(-source.jitter, source.jitter))
+
+    def _schedule(self, source, next_run, skipped=0):
+        self.next_run[source.name] = next_run
+        set_source_next_run(source.name, source.kind, source.interval, None if math.isinf(next_run) else next_run,
+                            skipped)
+
+    def plan(self, once=False):
+        """First run of every source: the stored next run if still ahead, else within its jitter window"""
+        now = self.clock()
+        stored = get_source_schedule()
+        for source in self.sources.values():
+            row = stored.get(source.name)
+            if once:
+                next_run = now
+            elif row and row['next_run_at'] and row['next_run_at'] > now and row['interval'] == source.interval:
+                next_run = row['next_run_at']
+            else:
+                next_run = now + self._random.uniform(0, source.jitter * source.interval)
+            self._schedule(source, next_run)
+
+    def running(self):
+        with self._lock:
+            return dict(self._running)
+
+    def stop(self):
+        """Start no more runs; run() returns once the ones in flight finish"""
+        self._stopping.set()
+        self._wake.set()
+
+    def run(self, once=False):
+        """Run sources until stop() (or, with once, until each source has run once)"""
+        self.plan(once)
+        logger.info(f"Scheduling {len(self.sources)} sources, at most {self.max_concurrent} at a time")
+        with ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix='source') as executor:
+            while not self._stopping.is_set():
+                self._wake.clear()
+                now = self.clock()
+                running = self.running()
+                self._skip_overlaps(running, now)
+                self._start_due(executor, running, now, once)
+                if once and not self.running() and all(map(math.isinf, self.next_run.values())):
+                    break
+                ahead = [next_run for next_run in self.next_run.values() if now < next_run < math.inf]
+                self._wake.wait(min(min(ahead, default=now + MAX_SLEEP) - now, MAX_SLEEP))
+
+    def _skip_overlaps(self, running, now):
+        """Move the next run of sources still running past now, counting the runs skipped"""
+        for name in running:
+            source = self.sources[name]
+            skipped = 0
+            next_run = self.next_run[name]
+            while next_run <= now:
+                next_run += self._interval(source)
+                skipped += 1
+            if skipped:
+                logger.warning(f"{name} is still running; skipped {skipped} run(s)")
+                self._schedule(source, next_run, skipped)
+
+    def _start_due(self, executor, running, now, once):
+        due = sorted((next_run, name) for name, next_run in self.next_run.items()
+                     if next_run <= now and name not in running)
+        for _, name in due:
+            source = self.sources[name]
+            with self._lock:
+                if len(self._running) >= self.max_concurrent or source.lock in self._locks:
+                    continue
+                self._running[name] = now
+                self._locks.add(source.lock)
+            self._schedule(source, math.inf if once else now + self._interval(source))
+            record_source_start(name)
+            executor.submit(self._run, source)
+
+    def _run(self, source):
+        started = time.perf_counter()
+        result, status, error = {}, 'ok', None
+        try:
+            logger.info(f"Running {source.kind} source {source.name}")
+            result = self.runner(source) or {}
+        except Exception as e:
+            status, error = 'failed', str(e)
+            logger.error(f"❌ Source {source.name} failed: {e}")
+        duration = time.perf_counter() - started
+        try:
+            record_source_run(source.name, status, duration, result.get('jobs'), result.get('new_jobs'), error)
+        except Exception as e:
+            logger.error(f"Could not record the run of {source.name}: {e}")
+        logger.info(f"{source.name}: {result.get('new_jobs', 0)} new of {result.get('jobs', 0)} jobs "
+                    f"in {duration:.1f}s ({status})")
+        with self._lock:
+            self.runs.append({'name': source.name, 'started': self._running.pop(source.name), 'duration': duration,
+                              'status': status})
+            self._locks.discard(source.lock)
+        self._wake.set()
+
+
+def _when(timestamp, now):
+    if timestamp is None:
+        return '-'
+    seconds = timestamp - now
+    if seconds <= 0:
+        return 'due'
+    return f"in {seconds / 60:.0f}m" if seconds >= 60 else f"in {seconds:.0f}s"
+
+
+def print_status(sources):
+    """Configured sources with their stored schedule and last run"""
+    schedule = get_source_schedule()
+    now = time.time()
+    print(f"⏰ {len(sources)} configured sources:")
+    for source in sources:
+        row = schedule.get(source.name) or {}
+        state = f"next {_when(row.get('next_run_at'), now)}" if source.enabled else 'disabled'
+        print(f"   {source.name} ({source.kind}, every {source.interval / 60:g}m): {state}")
+        if row.get('last_started_at'):
+            started = datetime.fromtimestamp(row['last_started_at']).strftime('%Y-%m-%d %H:%M:%S')
+            duration = f"{row['last_duration']:.1f}s" if row.get('last_duration') is not None else 'running'
+            print(f"      last run {started}, {duration}, {row['last_status']}: "
+                  f"{row['last_new_jobs'] or 0} new of {row['last_jobs'] or 0} jobs; "
+                  f"{row['runs']} runs, {row['failures']} failed, {row['skipped']} skipped for overlap")
+            if row.get('last_error'):
+                print(f"      error: {row['last_error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Poll the configured job sources on their intervals')
+    parser.add_argument('command', nargs='?', choices=['run', 'status'], default='run')
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help='source registry (JSON)')
+    parser.add_argument('--max-concurrent', type=int, help="sources running at once (default: the config's)")
+    parser.add_argument('--once', action='store_true', help='run every enabled source once and exit')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    settings, sources = load_config(args.config)
+    init_db()
+    if args.command == 'status':
+        print_status(sources)
+        return
+
+    scheduler = SourceScheduler([source for source in sources if source.enabled],
+                                max_concurrent=args.max_concurrent or settings['max_concurrent'])
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: scheduler.stop())
+    scheduler.run(once=args.once)
+    print_status(sources)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Source registry - the scrape sources and their polling intervals, from a JSON config
+
+Every source the scheduler daemon polls (scrapers/scheduler.py) is one
+entry of scrapers/sources.json:
+
+    {"name": "Remote Jobs", "type": "rss", "url": "https://remote.co/remote-jobs/feed/",
+     "source": "remote.co", "interval_minutes": 30}
+
+- name: unique; the key of the source's schedule row in jobs.db
+- type: rss (url, source), google (queries), linkedin (keywords,
+  locations, windows, remote - see data/scrapers/shards.py) or adzuna
+  (what, where, country)
+- interval_minutes: time between the starts of two runs
+- max_jobs, jitter (fraction of the interval), enabled: optional
+
+Top-level max_concurrent and jitter are the daemon's defaults. The RSS
+entries are also RSSJobScraper's default feed list.
+"""
+
+import json
+import os
+import sys
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.scrapers.shards import plan_shards
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sources.json')
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_JITTER = 0.1
+DEFAULT_MAX_JOBS = {'rss': 50, 'google': 50, 'linkedin': 1000, 'adzuna': 50}
+# Options each source type accepts, with their defaults (None: required)
+SOURCE_OPTIONS = {
+    'rss': {'url': None, 'source': ''},
+    'google': {'queries': []},
+    'linkedin': {'keywords': [''], 'locations': [''], 'windows': ['month'], 'remote': True},
+    'adzuna': {'what': 'software engineer', 'where': '', 'country': 'us'},
+}
+SOURCE_FIELDS = {'name', 'type', 'interval_minutes', 'max_jobs', 'jitter', 'enabled'}
+
+
+class Source(namedtuple('Source', 'name kind interval max_jobs jitter enabled options')):
+    """One configured scrape source; interval in seconds"""
+
+    @property
+    def lock(self):
+        """Sources sharing a lock never run at the same time
+
+        The LinkedIn crawl frontier hands its pages to whichever crawl
+        claims them first, so LinkedIn sources take turns.
+        """
+        return 'linkedin' if self.kind == 'linkedin' else self.name
+
+
+def parse_source(entry, jitter=DEFAULT_JITTER):
+    """A Source from one config entry; ValueError says what is wrong with it"""
+    name = entry.get('name')
+    if not name:
+        raise ValueError(f"Source without a name: {entry}")
+    kind = entry.get('type')
+    if kind not in SOURCE_OPTIONS:
+        raise ValueError(f"Source {name!r}: unknown type {kind!r}; use one of {sorted(SOURCE_OPTIONS)}")
+    unknown = set(entry) - SOURCE_FIELDS - set(SOURCE_OPTIONS[kind])
+    if unknown:
+        raise ValueError(f"Source {name!r}: unknown {kind} options {sorted(unknown)}")
+    interval = entry.get('interval_minutes')
+    if not isinstance(interval, (int, float)) or interval <= 0:
+        raise ValueError(f"Source {name!r}: interval_minutes must be a positive number")
+    jitter = entry.get('jitter', jitter)
+    if not 0 <= jitter < 1:
+        raise ValueError(f"Source {name!r}: jitter must be a fraction of the interval below 1")
+
+    options = {}
+    for option, default in SOURCE_OPTIONS[kind].items():
+        if default is None and not entry.get(option):
+            raise ValueError(f"Source {name!r}: {kind} sources need {option!r}")
+        options[option] = entry.get(option, default)
+    if kind == 'rss' and not options['source']:
+        options['source'] = urlsplit(options['url']).netloc
+    if kind == 'linkedin':
+        plan_shards(options['keywords'], options['locations'], options['windows'], options['remote'])
+
+    return Source(name, kind, interval * 60, entry.get('max_jobs', DEFAULT_MAX_JOBS[kind]), jitter,
+                  entry.get('enabled', True), options)
+
+
+def load_config(path=DEFAULT_CONFIG):
+    """({'max_concurrent', 'jitter'}, [Source]) from a registry file, disabled sources included"""
+    with open(path) as f:
+        config = json.load(f)
+    settings = {
+        'max_concurrent': config.get('max_concurrent', DEFAULT_MAX_CONCURRENT),
+        'jitter': config.get('jitter', DEFAULT_JITTER),
+    }
+    sources = [parse_source(entry, settings['jitter']) for entry in config.get('sources', [])]
+    names = [source.name for source in sources]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate source names in {path}: {duplicates}")
+    return settings, sources
+
+
+def load_sources(path=DEFAULT_CONFIG):
+    """The enabled sources of a registry file"""
+    return [source for source in load_config(path)[1] if source.enabled]
+
+
+def load_feeds(path=DEFAULT_CONFIG):
+    """The enabled RSS sources as RSSJobScraper feed dicts"""
+    return [{'name': source.name, 'url': source.options['url'], 'source': source.options['source']}
+            for source in load_sources(path) if source.kind == 'rss']
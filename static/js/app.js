@@ -3,7 +3,12 @@
 class JobBoard {
     constructor() {
         this.jobs = [];
-        this.filteredJobs = [];
+        this.nextCursor = null;
+        this.isLoading = false;
+        this.requestId = 0;
+        this.pageSize = 25;
+        this.filterDelay = 250;
+        this.filterTimer = null;
         this.currentFilters = {
             search: '',
             location: '',
@@ -16,7 +21,7 @@ class JobBoard {
     init() {
         this.setupEventListeners();
         this.setupFileUpload();
-        this.loadJobs();
+        this.loadJobs(true);
         this.updateStats();
     }
 
@@ -44,6 +49,14 @@ class JobBoard {
             this.clearFilters();
         });
 
+        // Load the next page when the list is scrolled near its end
+        document.getElementById('jobs-list').addEventListener('scroll', (e) => {
+            const list = e.target;
+            if (list.scrollTop + list.clientHeight >= list.scrollHeight - 200) {
+                this.loadJobs(false);
+            }
+        });
+
         // Modal close
         document.getElementById('close-modal').addEventListener('click', () => {
             this.closeModal();
@@ -57,43 +70,53 @@ class JobBoard {
         });
     }
 
-    async loadJobs() {
+    buildQuery(cursor) {
+        const params = new URLSearchParams({ limit: this.pageSize });
+        if (this.currentFilters.search) params.set('q', this.currentFilters.search);
+        if (this.currentFilters.location) params.set('location', this.currentFilters.location);
+        if (this.currentFilters.employmentType === 'Remote') {
+            params.set('remote', '1');
+        } else if (this.currentFilters.employmentType) {
+            params.set('employment_type', this.currentFilters.employmentType);
+        }
+        if (cursor) params.set('cursor', cursor);
+        return params.toString();
+    }
+
+    async loadJobs(reset) {
+        if (!reset && (this.isLoading || !this.nextCursor)) return;
+
+        // Responses from superseded filter states are dropped
+        const requestId = ++this.requestId;
+        this.isLoading = true;
         try {
-            const response = await fetch('/api/jobs');
+            const response = await fetch('/api/jobs?' + this.buildQuery(reset ? null : this.nextCursor));
             const data = await response.json();
+            if (requestId !== this.requestId) return;
             
             if (data.success) {
-                this.jobs = data.jobs;
-                this.filteredJobs = [...this.jobs];
+                this.jobs = reset ? data.jobs : this.jobs.concat(data.jobs);
+                this.nextCursor = data.next_cursor;
+                this.isLoading = false;
                 this.renderJobs();
-                this.updateJobCount(data.total);
             } else {
                 this.showError('Failed to load jobs: ' + data.error);
             }
         } catch (error) {
-            this.showError('Error loading jobs: ' + error.message);
+            if (requestId === this.requestId) {
+                this.showError('Error loading jobs: ' + error.message);
+            }
+        } finally {
+            if (requestId === this.requestId) {
+                this.isLoading = false;
+            }
         }
     }
 
     filterJobs() {
-        this.filteredJobs = this.jobs.filter(job => {
-            const matchesSearch = !this.currentFilters.search || 
-                job.title.toLowerCase().includes(this.currentFilters.search.toLowerCase()) ||
-                job.company.toLowerCase().includes(this.currentFilters.search.toLowerCase()) ||
-                job.description.toLowerCase().includes(this.currentFilters.search.toLowerCase());
-
-            const matchesLocation = !this.currentFilters.location ||
-                job.location.toLowerCase().includes(this.currentFilters.location.toLowerCase()) ||
-                job.city.toLowerCase().includes(this.currentFilters.location.toLowerCase()) ||
-                job.state.toLowerCase().includes(this.currentFilters.location.toLowerCase());
-
-            const matchesEmploymentType = !this.currentFilters.employmentType ||
-                job.employment_type === this.currentFilters.employmentType;
-
-            return matchesSearch && matchesLocation && matchesEmploymentType;
-        });
-
-        this.renderJobs();
+        // Filtering happens on the server; wait for typing to pause
+        clearTimeout(this.filterTimer);
+        this.filterTimer = setTimeout(() => this.loadJobs(true), this.filterDelay);
     }
 
     clearFilters() {
@@ -107,14 +130,14 @@ class JobBoard {
             employmentType: ''
         };
         
-        this.filteredJobs = [...this.jobs];
-        this.renderJobs();
+        clearTimeout(this.filterTimer);
+        this.loadJobs(true);
     }
 
     renderJobs() {
         const jobsList = document.getElementById('jobs-list');
         
-        if (this.filteredJobs.length === 0) {
+        if (this.jobs.length === 0) {
             jobsList.innerHTML = `
                 <div class="loading">
                     <i class="fas fa-search"></i>
@@ -124,7 +147,13 @@ class JobBoard {
             return;
         }
 
-        jobsList.innerHTML = this.filteredJobs.map(job => this.createJobHTML(job)).join('');
+        jobsList.innerHTML = this.jobs.map(job => this.createJobHTML(job)).join('') +
+            (this.nextCursor ? `
+                <div class="loading">
+                    <i class="fas fa-spinner fa-spin"></i>
+                    <span>Loading more jobs...</span>
+                </div>
+            ` : '');
         
         // Add click event listeners to job items
         document.querySelectorAll('.job-item').forEach(item => {
@@ -136,6 +165,11 @@ class JobBoard {
                 }
             });
         });
+
+        // A short first page may not fill the list enough to scroll
+        if (this.nextCursor && jobsList.scrollHeight <= jobsList.clientHeight) {
+            this.loadJobs(false);
+        }
     }
 
     createJobHTML(job) {
@@ -173,7 +207,18 @@ class JobBoard {
         `;
     }
 
-    showJobModal(job) {
+    async showJobModal(job) {
+        // The list only carries a preview of the description
+        try {
+            const response = await fetch('/api/jobs/' + encodeURIComponent(job.id));
+            const data = await response.json();
+            if (data.success) {
+                job = data.job;
+            }
+        } catch (error) {
+            console.error('Error loading job details:', error);
+        }
+
         const modal = document.getElementById('job-modal');
         const modalTitle = document.getElementById('modal-title');
         const modalBody = document.getElementById('modal-body');
@@ -245,6 +290,7 @@ class JobBoard {
             
             if (data.success) {
                 const stats = data.stats;
+                this.updateJobCount(stats.total_jobs);
                 document.getElementById('update-time').textContent = new Date().toLocaleTimeString();
             }
         } catch (error) {
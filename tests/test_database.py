@@ -0,0 +1,273 @@
+import itertools
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import database, migrations
+from data.job_record import Job
+
+
+def sample_job(job_id, **overrides):
+    job = {
+        'job_id': job_id,
+        'job_url': f'https://www.linkedin.com/jobs/view/{job_id}',
+        'source': 'linkedin.com',
+        'title': 'Data Scientist',
+        'company_name': 'Acme',
+        'description': 'we are hiring a data scientist. python and sql required.',
+        'location': 'New York, NY',
+        'city': 'New York',
+        'state': 'NY',
+        'country': 'United States',
+        'remote': '0',
+        'industry': 'Software Development',
+        'seniority_level': 'Mid-Senior level',
+        'employment_type': 'Full-time',
+        'job_function': 'Engineering',
+        'salary_raw': '$120,000 - $150,000',
+        'salary_min': 120000,
+        'salary_max': 150000,
+        'salary_avg': 135000,
+        'yoe_raw': '3-5 years',
+        'yoe_min': 3,
+        'yoe_max': 5,
+        'yoe_avg': 4,
+        'education': ["bachelor's"],
+        'skills': ['python', 'sql'],
+    }
+    job.update(overrides)
+    return job
+
+
+@pytest.fixture
+def jobs_db(tmp_path):
+    database.set_db_path(str(tmp_path / 'jobs.db'))
+    database.init_db()
+    yield database
+    database.db.close_all()
+
+
+def test_store_and_fetch_round_trip(jobs_db):
+    assert jobs_db.store_job(**sample_job('1'))
+    assert not jobs_db.store_job(**sample_job('1'))
+
+    job = jobs_db.get_job_by_id('1')
+    assert job['title'] == 'Data Scientist'
+    assert job['skills'] == ['python', 'sql']
+    assert jobs_db.get_job_by_id('missing') is None
+
+
+def test_connections_are_reused_with_wal(jobs_db):
+    with jobs_db.db.connection() as first:
+        assert first.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert first.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+    with jobs_db.db.connection() as second:
+        assert second is first
+
+
+def test_pool_serves_concurrent_threads(jobs_db):
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(20):
+                jobs_db.store_job(**sample_job(f'{offset}-{i}'))
+                jobs_db.get_job_by_id(f'{offset}-{i}')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(jobs_db.get_all_jobs()) == 80
+    assert len(jobs_db.db._idle) <= jobs_db.db.max_idle
+
+
+def test_store_jobs_bulk_counts_new_and_duplicates(jobs_db):
+    jobs_db.store_job(**sample_job('existing'))
+    records = [sample_job(str(i), title=f'Data Scientist {i}') for i in range(25)]
+    records += [sample_job('existing'), sample_job('3')]
+
+    new_jobs, duplicates = jobs_db.store_jobs_bulk(iter(records), batch_size=10)
+
+    assert (new_jobs, duplicates) == (25, 2)
+    assert len(jobs_db.get_all_jobs()) == 26
+    assert jobs_db.get_job_by_id('7')['education'] == ["bachelor's"]
+
+
+def test_search_jobs_ranks_matches_and_limits(jobs_db):
+    jobs_db.store_jobs_bulk([
+        sample_job('ds', title='Senior Data Scientist', location='New York, NY'),
+        sample_job('de', title='Data Engineer', location='Remote',
+                   description='build pipelines with spark. work with data scientists.'),
+        sample_job('pm', title='Product Manager', location='Austin, TX', description='own the roadmap.'),
+    ])
+
+    results = jobs_db.search_jobs(title='data scien', num_jobs=5)
+    assert [job['job_id'] for job in results] == ['ds']
+    assert jobs_db.SNIPPET_OPEN in results[0]['snippet']
+
+    results = jobs_db.search_jobs(keywords='data scientist', num_jobs=5)
+    assert [job['job_id'] for job in results] == ['ds', 'de']
+    assert len(jobs_db.search_jobs(keywords='data', num_jobs=1)) == 1
+    assert jobs_db.search_jobs(title='data', location='remote')[0]['job_id'] == 'de'
+    assert jobs_db.search_jobs(title='None', location='austin')[0]['job_id'] == 'pm'
+
+
+def test_search_index_follows_updates_and_deletes(jobs_db):
+    jobs_db.store_job(**sample_job('1', title='Data Scientist'))
+    with jobs_db.db.transaction() as conn:
+        conn.execute("UPDATE jobs SET title = 'Staff Engineer' WHERE job_id = '1'")
+    assert jobs_db.search_jobs(title='scientist') == []
+    assert jobs_db.search_jobs(title='staff')[0]['job_id'] == '1'
+
+    jobs_db.clear_jobs()
+    assert jobs_db.search_jobs(title='staff') == []
+
+
+def test_search_index_is_built_for_existing_databases(tmp_path):
+    db_path = str(tmp_path / 'legacy.db')
+    conn = database.sqlite3.connect(db_path)
+    # Database created before migrations existed: just the jobs table
+    migrations._create_jobs_table(conn)
+    conn.execute(database.INSERT_JOB_SQL, [None] * 25)
+    conn.execute("UPDATE jobs SET job_id = 'old', title = 'Legacy Analyst'")
+    conn.commit()
+    conn.close()
+
+    database.set_db_path(db_path)
+    try:
+        assert database.search_jobs(title='analyst')[0]['job_id'] == 'old'
+        assert database.get_job_statistics()['total_jobs'] == 1
+    finally:
+        database.db.close_all()
+
+
+def test_init_db_keeps_existing_jobs(jobs_db):
+    jobs_db.store_job(**sample_job('1'))
+    jobs_db.init_db()
+    jobs_db.set_db_path(jobs_db.db.db_path)
+    jobs_db.init_db()
+    assert jobs_db.get_job_by_id('1')['title'] == 'Data Scientist'
+
+
+FILTER_SAMPLES = {
+    'salary_min': 100000,
+    'salary_max': 200000,
+    'yoe_min': 2,
+    'yoe_max': 5,
+    'remote': True,
+    'seniority_level': ['Entry level', 'Associate'],
+    'employment_type': 'Full-time',
+    'source': 'linkedin.com',
+    'posted_since': '2025-01-01',
+    'skills': ['python', 'sql'],
+    'education': "master's",
+}
+
+
+def test_every_filter_combination_searches_an_index(jobs_db):
+    keys = list(FILTER_SAMPLES)
+    with jobs_db.db.connection() as conn:
+        for size in range(1, len(keys) + 1):
+            for combo in itertools.combinations(keys, size):
+                for order_by in ('newest', 'salary'):
+                    sql, params = jobs_db.compile_job_query({k: FILTER_SAMPLES[k] for k in combo}, order_by=order_by)
+                    plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+                    assert any(step.startswith('SEARCH jobs USING') and 'INDEX' in step for step in plan), (combo, plan)
+
+
+def test_filters_select_matching_jobs(jobs_db):
+    jobs_db.store_jobs_bulk([
+        sample_job('senior', title='Senior Data Scientist', seniority_level='Mid-Senior level',
+                   salary_min=180000, salary_max=220000, yoe_min=5, yoe_max=8),
+        sample_job('entry', title='Junior Data Scientist', seniority_level='Entry level',
+                   salary_min=70000, salary_max=90000, yoe_min=0, yoe_max=2),
+        sample_job('remote', location='Remote', salary_min=None, salary_max=None, yoe_min=None, yoe_max=None,
+                   employment_type='Contract', created_at='2020-01-01 00:00:00'),
+    ])
+
+    def ids(**filters):
+        return sorted(job['job_id'] for job in jobs_db.search_jobs(num_jobs=10, filters=filters))
+
+    assert ids(salary_min=150000) == ['senior']
+    assert ids(salary_max=100000) == ['entry']
+    assert ids(yoe_max=3) == ['entry']
+    assert ids(remote=True) == ['remote']
+    assert ids(remote=False) == ['entry', 'senior']
+    assert ids(employment_type=['Contract', 'Part-time']) == ['remote']
+    assert ids(posted_since='2024-01-01') == ['entry', 'senior']
+    # created_at is UTC, so an aware bound is compared in UTC
+    assert ids(posted_since=datetime(2020, 1, 1, 1, tzinfo=timezone(timedelta(hours=2)))) == ['entry', 'remote', 'senior']
+    assert [job['job_id'] for job in jobs_db.search_jobs(keywords='data', filters={'yoe_min': 4})] == ['senior']
+
+    with pytest.raises(ValueError):
+        jobs_db.compile_job_query({'salary': 1})
+    with pytest.raises(ValueError):
+        jobs_db.compile_job_query({'salary_min': 'lots'})
+
+
+def test_list_jobs_pages_with_a_keyset_cursor(jobs_db):
+    jobs_db.store_jobs_bulk((
+        sample_job(f'{i:03d}', title=f'Data Scientist {i}', created_at=f'2025-01-{i % 5 + 1:02d} 00:00:00',
+                   employment_type='Contract' if i % 2 else 'Full-time')
+        for i in range(23)
+    ))
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = jobs_db.list_jobs(cursor=cursor, page_size=5)
+        seen.extend((job['created_at'], job['job_id']) for job in page)
+        assert len(page[0]['description']) <= 300
+        if cursor is None:
+            break
+    assert len(seen) == 23
+    assert seen == sorted(seen, reverse=True)
+
+    page, cursor = jobs_db.list_jobs(filters={'employment_type': 'Contract'}, page_size=20, order_by='oldest')
+    assert len(page) == 11 and cursor is None
+    assert all(job['employment_type'] == 'Contract' for job in page)
+
+    with pytest.raises(ValueError):
+        jobs_db.list_jobs(cursor='not-a-cursor')
+
+    sql, params = jobs_db.compile_job_query(
+        order_by='newest', columns=jobs_db.LIST_COLUMNS, after=('2025-01-03 00:00:00', '010'))
+    with jobs_db.db.connection() as conn:
+        plan = ' '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params))
+    assert 'idx_jobs_created_at_id' in plan and 'TEMP B-TREE' not in plan
+
+
+def test_reads_return_compact_job_records(jobs_db):
+    jobs_db.store_jobs_bulk([
+        sample_job('1'),
+        sample_job('2', title='Data Engineer', skills='plain text skills', description='x' * 400),
+    ])
+
+    job = jobs_db.get_job_by_id('1')
+    assert isinstance(job, Job) and not hasattr(job, '__dict__')
+    assert job.title == job['title'] == job.get('title') == 'Data Scientist'
+    assert job._skills_raw == '["python", "sql"]' and job.skills == ['python', 'sql']
+    assert json.loads(job.to_json()) == dict(job.to_dict(), created_at=job.created_at)
+    assert jobs_db.get_job_by_id('2').skills == 'plain text skills'
+
+    page, _ = jobs_db.list_jobs(page_size=5)
+    assert len(page[0].keys()) == 17 and page[0].description == 'x' * 300
+    assert page[0].get('skills') is None and 'skills' not in page[0]
+    with pytest.raises(KeyError):
+        page[0]['skills']
+
+    with jobs_db.db.connection() as conn:
+        extra = jobs_db._fetch_jobs(conn, 'SELECT job_id, length(description) AS n FROM jobs ORDER BY job_id')
+    assert [(job.job_id, job['n']) for job in extra] == [('1', 56), ('2', 400)]
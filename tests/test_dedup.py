@@ -0,0 +1,196 @@
+import sqlite3
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import dedup, job_stats, migrations
+from test_database import jobs_db, sample_job
+
+POSTING = (
+    'Acme is looking for a senior data scientist to join the growth team. You will build '
+    'forecasting models in python and sql, run experiments with product managers and present '
+    'findings to leadership. 5+ years of experience with statistics and machine learning. '
+    'What you will do: own the demand forecasting roadmap from exploration to production; partner with '
+    'engineering to ship models behind feature flags; design and analyze a/b tests across web and mobile; '
+    'mentor two junior analysts and review their work. What we offer: competitive salary and equity, '
+    'a flexible hybrid schedule with two office days in new york, generous parental leave, a learning '
+    'budget and a home office stipend. Acme is an equal opportunity employer and values diversity.'
+)
+
+
+def reference_simhash(hashes):
+    """Textbook per-bit SimHash"""
+    counts = [0] * 64
+    for h in hashes:
+        for bit in range(64):
+            counts[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if counts[bit] > 0)
+
+
+def test_simhash_matches_reference_and_tolerates_edits():
+    hashes = dedup.feature_hashes('Senior Data Scientist', 'Acme', POSTING)
+    assert dedup.simhash(hashes) == reference_simhash(hashes)
+    assert dedup.simhash([2 ** 64 - 1, 1, 2 ** 63 + 1]) == 2 ** 63 + 1
+
+    original = dedup.job_simhash({'title': 'Senior Data Scientist', 'company_name': 'Acme', 'description': POSTING})
+    repost = dedup.job_simhash({'title': 'Senior Data Scientist', 'company_name': 'ACME',
+                                'description': '<p>' + POSTING.replace('5+', '6+') + ' Apply now!</p>'})
+    other = dedup.job_simhash({'title': 'Warehouse Associate', 'company_name': 'Globex',
+                               'description': 'pick and pack orders on the night shift. forklift certification a plus.'})
+    assert dedup.hamming_distance(original, repost) <= dedup.MAX_DISTANCE
+    assert dedup.hamming_distance(original, other) > dedup.MAX_DISTANCE
+    assert dedup.job_simhash({'title': 'Engineer'}) is None
+
+
+def test_ingest_skips_and_links_near_duplicates(jobs_db):
+    linkedin = sample_job('li-1', title='Senior Data Scientist', description=POSTING)
+    rss = sample_job('rss-1', source='remoteok', job_url='https://remoteok.com/1', title='Senior Data Scientist',
+                     description=POSTING + ' Apply now!')
+    google = sample_job('g-1', source='google', title='Senior Data Scientist', description=POSTING.upper())
+
+    assert jobs_db.store_jobs_bulk([linkedin, rss]) == (1, 1)
+    assert jobs_db.store_jobs_bulk([google, sample_job('pm', title='Product Manager', description='own the roadmap.')]) \
+        == (1, 1)
+    assert jobs_db.store_jobs_bulk([rss]) == (0, 1)
+    # A stored ID is an exact duplicate, never linked to anything
+    assert jobs_db.store_jobs_bulk([linkedin]) == (0, 1)
+
+    with jobs_db.db.connection() as conn:
+        links = conn.execute('SELECT job_id, duplicate_of, source, job_url FROM job_duplicates ORDER BY job_id').fetchall()
+        assert links == [('g-1', 'li-1', 'google', google['job_url']),
+                         ('rss-1', 'li-1', 'remoteok', 'https://remoteok.com/1')]
+        plan = ' '.join(row[3] for row in conn.execute(
+            'EXPLAIN QUERY PLAN SELECT DISTINCT f.job_id, f.simhash FROM job_simhash_bands b '
+            'JOIN job_fingerprints f USING (job_id) WHERE b.band_key IN (1, 2, 3, 4)'))
+        assert 'SEARCH b USING PRIMARY KEY' in plan
+
+    jobs_db.clear_jobs()
+    assert jobs_db.store_jobs_bulk([rss]) == (1, 0)
+
+
+def test_cross_source_repost_appears_once(jobs_db):
+    linkedin = sample_job('li-1', title='Senior Data Scientist', description=POSTING, skills=['python'])
+    rss = sample_job('rss-1', source='remoteok', title='Senior Data Scientist', description=POSTING + ' Apply now!',
+                     location='Location not specified', city=None, state=None, skills=['python'])
+    stored_anyway = dict(rss, job_id='rss-2')
+
+    jobs_db.store_jobs_bulk([linkedin, rss])
+    # Stored all the same on request, but still linked, and hidden from every read
+    assert jobs_db.store_jobs_bulk([stored_anyway], skip_near_duplicates=False) == (1, 0)
+    assert jobs_db.get_job_by_id('rss-2') is not None
+
+    assert [job.job_id for job in jobs_db.get_all_jobs()] == ['li-1']
+    assert [job.job_id for job in jobs_db.search_jobs(title='data scientist')] == ['li-1']
+    assert [job.job_id for job in jobs_db.list_jobs()[0]] == ['li-1']
+    assert jobs_db.get_tag_frequency() == [{'name': 'python', 'count': 1}]
+    assert jobs_db.get_tag_frequency(title='data scientist') == [{'name': 'python', 'count': 1}]
+    stats = jobs_db.get_job_statistics(title_filter='data scientist')
+    assert stats['total_jobs'] == 1 and stats['title_stats']['count'] == 1
+    assert stats['top_companies'] == [{'company': 'Acme', 'count': 1}]
+
+    with jobs_db.db.transaction() as conn:
+        conn.execute("UPDATE jobs SET company_name = 'Globex' WHERE job_id = 'rss-2'")
+        conn.execute("DELETE FROM jobs WHERE job_id = 'rss-2'")
+    with jobs_db.db.connection() as conn:
+        assert job_stats.check_job_statistics(conn) == {}
+    assert jobs_db.get_job_statistics()['top_companies'] == [{'company': 'Acme', 'count': 1}]
+
+
+def test_same_role_in_other_places_is_not_a_duplicate(jobs_db):
+    boston = sample_job('vp-boston', title='VP of Customer Success', description=POSTING,
+                        location='Boston, MA', city='Boston', state='MA')
+    cleveland = dict(boston, job_id='vp-cleveland', location='Cleveland, OH', city='Cleveland', state='OH')
+    designer = sample_job('designer', title='Digital Designer', description=POSTING,
+                          location='Boston, MA', city='Boston', state='MA')
+    springfield_il = dict(boston, job_id='vp-springfield-il', location='Springfield, IL', city='Springfield',
+                          state='IL')
+    springfield_ma = dict(springfield_il, job_id='vp-springfield-ma', location='Springfield, MA', state='MA')
+
+    jobs = [boston, cleveland, designer, springfield_il, springfield_ma]
+    assert jobs_db.store_jobs_bulk(jobs) == (5, 0)
+    assert {job.job_id for job in jobs_db.get_all_jobs()} == {job['job_id'] for job in jobs}
+    with jobs_db.db.connection() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM job_duplicates').fetchone()[0] == 0
+
+
+def test_cross_source_repost_matches_despite_place_format(jobs_db):
+    linkedin = sample_job('li-1', title='Senior Data Scientist', description=POSTING,
+                          location='New York City Metropolitan Area', city='New York', state=None)
+    # RSS and Google give a free-text location, or none at all
+    rss = sample_job('rss-1', source='remoteok', title='Senior Data Scientist', description=POSTING,
+                     location='New York, NY', city='New York', state='NY', remote='1')
+    google = sample_job('g-1', source='google.com', title='Senior Data Scientist', description=POSTING,
+                        location='Location not specified', city=None, state=None, country=None)
+
+    assert jobs_db.store_jobs_bulk([linkedin]) == (1, 0)
+    assert jobs_db.store_jobs_bulk([rss, google]) == (0, 2)
+    with jobs_db.db.connection() as conn:
+        assert conn.execute('SELECT job_id, duplicate_of FROM job_duplicates ORDER BY job_id').fetchall() == [
+            ('g-1', 'li-1'), ('rss-1', 'li-1')]
+
+
+def test_match_keys_compare_places_only_when_both_are_known():
+    key = dedup.job_match_key
+    assert key({'title': 'Data Analyst', 'location': 'Austin, TX'}) == 'data analyst|austin,tx'
+    assert key({'title': 'Data Analyst', 'city': 'Austin', 'state': None}) == 'data analyst|austin'
+    assert key({'title': 'Data Analyst', 'location': 'Remote'}) == 'data analyst|'
+    assert dedup.keys_match('data analyst|austin,tx', 'data analyst|austin')
+    assert dedup.keys_match('data analyst|austin,tx', 'data analyst|')
+    assert not dedup.keys_match('data analyst|austin,tx', 'data analyst|dallas,tx')
+    assert not dedup.keys_match('data analyst|springfield,il', 'data analyst|springfield,ma')
+    assert not dedup.keys_match('data analyst|austin,tx', 'data engineer|austin,tx')
+
+
+def test_migration_fingerprints_existing_jobs(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'jobs.db'))
+    migrations.migrate(conn, target=6)
+    with conn:
+        conn.executemany('INSERT INTO jobs (job_id, title, company_name, description) VALUES (?, ?, ?, ?)',
+                         [(str(i), f'Role {i}', 'Acme', f'{POSTING} {i}') for i in range(1200)] + [('empty', None, None, None)])
+    migrations.migrate(conn)
+    assert conn.execute('SELECT COUNT(*) FROM job_fingerprints').fetchone()[0] == 1200
+    assert conn.execute('SELECT COUNT(*) FROM job_simhash_bands').fetchone()[0] == 1200 * dedup.BANDS
+    assert conn.execute("SELECT match_key FROM job_fingerprints WHERE job_id = '7'").fetchone() == ('role 7|',)
+    conn.close()
+
+
+def test_migration_keys_fingerprints_stored_without_match_keys(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'jobs.db'))
+    migrations.migrate(conn, target=11)
+    # Migration 7 creates job_fingerprints as it shipped; migration 12 adds the key
+    assert migrations.table_columns(conn, 'job_fingerprints') == ['job_id', 'simhash']
+    with conn:
+        conn.execute("INSERT INTO jobs (job_id, title, company_name, description, city, state, remote) "
+                     "VALUES ('1', 'LPC (Virtual)', 'Acme', ?, 'Burlington', 'VT', 1)", (POSTING,))
+        conn.execute("INSERT INTO job_fingerprints (job_id, simhash) VALUES ('1', 42)")
+    migrations.migrate(conn)
+    assert conn.execute("SELECT match_key FROM job_fingerprints WHERE job_id = '1'").fetchone() == (
+        'lpc virtual|burlington,vt',)
+    conn.close()
+
+
+def test_migration_rekeys_title_place_remote_keys(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'jobs.db'))
+    migrations.migrate(conn, target=13)
+    with conn:
+        conn.execute("INSERT INTO jobs (job_id, title, description, location) "
+                     "VALUES ('1', 'Data Analyst', ?, 'Location not specified')", (POSTING,))
+        conn.execute("INSERT INTO job_fingerprints VALUES ('1', 42, 'data analyst|location not specified|onsite')")
+    migrations.migrate(conn)
+    assert conn.execute("SELECT match_key FROM job_fingerprints").fetchone() == ('data analyst|',)
+    conn.close()
+
+
+def test_migration_recounts_statistics_without_linked_duplicates(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'jobs.db'))
+    migrations.migrate(conn, target=14)
+    with conn:
+        conn.executemany("INSERT INTO jobs (job_id, title, company_name) VALUES (?, 'Data Analyst', 'Acme')",
+                         [('1',), ('2',)])
+        conn.execute("INSERT INTO job_duplicates (job_id, duplicate_of, distance) VALUES ('2', '1', 0)")
+    assert conn.execute('SELECT job_count FROM job_stats_company').fetchone() == (2,)
+    migrations.migrate(conn)
+    assert conn.execute('SELECT job_count FROM job_stats_company').fetchone() == (1,)
+    assert job_stats.check_job_statistics(conn) == {}
+    conn.close()
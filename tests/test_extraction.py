@@ -0,0 +1,45 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import extraction
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'extraction_corpus.json')
+
+with open(CORPUS, encoding='utf-8') as f:
+    CASES = json.load(f)
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case['name'] for case in CASES])
+def test_extract_fields_matches_corpus(case):
+    assert extraction.extract_fields(case['title'], case['description'], case['location']) == case['expected']
+
+
+def test_batch_forms_match_single_calls():
+    postings = [(case['title'], case['description'], case['location']) for case in CASES]
+    descriptions = [case['description'] for case in CASES]
+
+    assert extraction.extract_fields_batch(postings) == [case['expected'] for case in CASES]
+    assert extraction.parse_salaries(descriptions) == [extraction.parse_salary(text) for text in descriptions]
+    assert extraction.find_educations(descriptions) == [extraction.find_education(text) for text in descriptions]
+    assert extraction.employment_types(descriptions) == [extraction.employment_type(text) for text in descriptions]
+    assert extraction.seniority_levels(descriptions) == [extraction.seniority_level(text) for text in descriptions]
+
+
+def test_keyword_priority_beats_position():
+    # The earlier rule wins wherever it appears, as the old if/elif chains did
+    assert extraction.employment_type("Contract to hire, full-time after 6 months") == 'Full-time'
+    assert extraction.seniority_level("Reports to the director; senior individual contributor") == 'Senior'
+    assert extraction.employment_type("Internal mobility program") == 'Full-time'
+    assert extraction.seniority_level("Thought leadership") == 'Mid-level'
+
+
+def test_salary_forms():
+    assert extraction.parse_salary("$120,000.00-$150,000.00 per year")['salary_avg'] == 135000
+    assert extraction.parse_salary("120k - 140k")['salary_min'] == 120000
+    assert extraction.parse_salary("$ , see posting") == extraction.EMPTY_SALARY
+    assert extraction.parse_salary(None) == extraction.EMPTY_SALARY
@@ -0,0 +1,206 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.scrapers import scraper
+from data.scrapers.fetcher import AdaptiveConcurrency, FetchStats, TokenBucket, iter_pages
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+@pytest.fixture
+def job_server():
+    """Local stand-in for the jobPosting endpoint serving a recorded page with 100ms latency"""
+    with open(os.path.join(FIXTURES, 'linkedin_jobs', 'senior_data_scientist.html'), 'rb') as f:
+        page = f.read()
+    state = {'in_flight': 0, 'max_in_flight': 0, 'requests': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                state['requests'] += 1
+                state['in_flight'] += 1
+                state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+            time.sleep(0.1)
+            with lock:
+                state['in_flight'] -= 1
+            if self.path.endswith('/missing'):
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/jobs-guest/jobs/api/jobPosting/{{job_id}}', state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def throttling_server():
+    """Host that sustains 3 requests in flight and answers 429 (Retry-After: 0) beyond that"""
+    capacity = 3
+    state = {'in_flight': 0, 'max_in_flight': 0, 'ok': 0, 'throttled': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                state['in_flight'] += 1
+                state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+                throttled = state['in_flight'] > capacity
+                state['throttled' if throttled else 'ok'] += 1
+            time.sleep(0.01 if throttled else 0.05)
+            with lock:
+                state['in_flight'] -= 1
+            self.send_response(429 if throttled else 200)
+            if throttled:
+                self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/page/{{}}', state, capacity
+    server.shutdown()
+    server.server_close()
+
+
+def test_token_bucket_spaces_reservations():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, burst=1, clock=lambda: now[0])
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.5, 1.0]
+    now[0] = 1.0
+    assert bucket.reserve() == 0.5
+    now[0] = 10.0
+    # Idle time refills at most `burst` tokens
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.5]
+
+
+def test_fetch_job_details_concurrently_within_rate_limit(job_server):
+    url_template, state = job_server
+    job_ids = [str(4000000000 + i) for i in range(12)] + ['missing']
+    stats = FetchStats()
+
+    start = time.perf_counter()
+    jobs = scraper.fetch_job_details(job_ids, workers=6, rate=20, burst=1, url_template=url_template, stats=stats)
+    elapsed = time.perf_counter() - start
+
+    assert sorted(job['job_id'] for job in jobs) == sorted(job_ids[:-1])
+    job = jobs[0]
+    assert job['title'] == 'Senior Data Scientist'
+    assert job['company_name'] == 'Acme'
+    assert job['seniority_level'] == 'Mid-Senior level'
+    assert job['yoe_min'] == 5 and job['yoe_max'] == 7
+
+    # 13 requests at 20/s with a burst of 1 can't finish before 12 / 20 seconds,
+    # but the 100ms responses overlap rather than queue
+    assert elapsed >= 12 / 20
+    assert state['max_in_flight'] > 1
+    summary = stats.summary()
+    assert summary['requests'] == state['requests'] == 13
+    assert summary['statuses'] == {200: 12, 404: 1}
+    assert summary['latency_p50'] >= 0.1
+    assert summary['pages_per_second'] > 0
+
+
+def test_job_ids_are_consumed_lazily(job_server):
+    url_template, state = job_server
+    pulled = []
+
+    def job_ids():
+        for i in range(40):
+            pulled.append(i)
+            yield str(4100000000 + i)
+
+    jobs = scraper.iter_job_details(job_ids(), workers=2, rate=1000, burst=10, url_template=url_template)
+    assert next(jobs)['title'] == 'Senior Data Scientist'
+    # At most 2 * workers requests queued ahead of the consumer
+    assert len(pulled) <= 5
+    assert len(list(jobs)) == 39
+
+
+def test_adaptive_concurrency_increases_additively_and_cuts_multiplicatively():
+    now = [0.0]
+    control = AdaptiveConcurrency(initial=1, maximum=4, clock=lambda: now[0])
+    url = 'https://www.linkedin.com/jobs'
+
+    # Saturated host: every free slot is taken again straight away
+    held = []
+    for _ in range(5):
+        while len(held) < int(control.limit(url)):
+            held.append(control.acquire(url))
+        now[0] += 1
+        control.release(held.pop(0), 200)
+    # 1 -> 2 -> 2.5 -> 2.9 -> 3.24 -> 3.55: +1/limit per response
+    assert control.limit(url) == pytest.approx(3.55, abs=0.01)
+
+    held.append(control.acquire(url))
+    now[0] += 1
+    control.release(held.pop(0), 429)
+    assert control.limit(url) == pytest.approx(3.55 / 2, abs=0.01)
+    cut = control.limit(url)
+    # Sent before the cut: already accounted for
+    control.release(held.pop(0), 503)
+    control.release(held.pop(0), None)
+    assert control.limit(url) == cut
+    assert control.summary()['www.linkedin.com']['cuts'] == 1
+    assert control.history[-1][2] == cut
+
+    # A host that isn't kept busy gives no reason to grow
+    idle = AdaptiveConcurrency(initial=3, maximum=8, clock=lambda: now[0])
+    for _ in range(5):
+        idle.release(idle.acquire(url), 200)
+    assert idle.limit(url) == 3
+
+
+def test_adaptive_concurrency_pauses_host_for_retry_after():
+    control = AdaptiveConcurrency(initial=2)
+    url = 'http://127.0.0.1/page'
+    control.release(control.acquire(url), 429, retry_after=0.3)
+    start = time.perf_counter()
+    control.release(control.acquire(url), 200)
+    assert time.perf_counter() - start >= 0.25
+    # Other hosts aren't paused
+    start = time.perf_counter()
+    control.release(control.acquire('http://localhost/page'), 200)
+    assert time.perf_counter() - start < 0.1
+
+
+def test_concurrency_converges_to_what_the_host_sustains(throttling_server):
+    url_template, state, capacity = throttling_server
+    control = AdaptiveConcurrency(initial=1, maximum=8)
+    urls = [url_template.format(i) for i in range(120)]
+
+    statuses = Counter(response.status_code for _, response in
+                       iter_pages(urls, workers=8, rate=1000, burst=100, concurrency=control, retries=5))
+
+    # Every page arrives despite the throttling, without ever running all 8 workers at once
+    assert statuses == {200: 120}
+    assert state['max_in_flight'] <= capacity + 2
+    assert state['throttled'] < 0.25 * state['ok']
+    # The limit kept probing above capacity and backing off below it
+    limits = [limit for _, _, limit in control.history]
+    assert max(limits) >= capacity and min(limits[1:]) < capacity + 1
+    assert 1 <= control.limit(urls[0]) <= capacity + 1
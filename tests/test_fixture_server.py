@@ -0,0 +1,93 @@
+import functools
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_server import FixtureServer
+from data import database
+from data.job_sink import JobSink
+from data.scrapers import scraper
+from data.scrapers.fetcher import AdaptiveConcurrency
+from scrapers import job_scraper_manager
+from scrapers.job_scraper_manager import JobScraperManager
+from utils.http_client import get_session
+
+
+@pytest.fixture
+def replay():
+    """Fixture server the shared session is routed to, for the length of a test"""
+    servers = []
+
+    def start(**options):
+        server = FixtureServer(**options).start()
+        servers.append((server, server.install(get_session())))
+        return server
+
+    yield start
+    for server, uninstall in servers:
+        uninstall()
+        server.stop()
+
+
+def test_linkedin_scrape_runs_offline(replay):
+    server = replay(pages=3)
+    jobs = scraper.scrape_jobs(num_jobs=25, workers=4, rate=1000)
+
+    assert len(jobs) == 25
+    assert len({job['job_id'] for job in jobs}) == 25
+    assert all(job['title'] and job['job_url'] for job in jobs)
+    assert server.summary() == {'linkedin-detail 200': 25, 'linkedin-listing 200': 3}
+
+
+def test_throttled_detail_pages_are_retried(replay):
+    server = replay(throttle_rate=0.2, retry_after=0, seed=3)
+    job_ids = [str(4200000000 - i) for i in range(30)]
+    concurrency = AdaptiveConcurrency(maximum=4)
+
+    jobs = scraper.fetch_job_details(job_ids, workers=4, rate=1000, burst=10, concurrency=concurrency, retries=6)
+
+    assert sorted(job['job_id'] for job in jobs) == sorted(job_ids)
+    summary = server.summary()
+    assert summary['linkedin-detail 200'] == 30
+    assert summary['linkedin-detail 429'] > 0
+    assert concurrency.summary()['www.linkedin.com']['cuts'] > 0
+
+
+def test_rss_and_google_sources_store_through_the_manager(replay, tmp_path):
+    server = replay()
+    database.set_db_path(str(tmp_path / 'jobs.db'))
+    database.init_db()
+    try:
+        manager = JobScraperManager()
+        manager.scrapers['google'].api_key = manager.scrapers['google'].search_engine_id = 'replay'
+        results = manager.scrape_all_sources(rss_enabled=True, google_enabled=True, max_jobs_per_source=40)
+
+        assert results['rss'] == {'count': 10, 'error': None}
+        assert results['google'] == {'count': 40, 'error': None}
+        assert results['summary']['total_new_jobs'] + results['summary']['total_duplicates'] == 50
+        assert len(database.get_all_jobs()) == results['summary']['total_new_jobs'] > 0
+        assert server.summary() == {'google-cse 200': 5, 'rss 200': 4}
+    finally:
+        database.db.close_all()
+
+
+def test_manager_reports_jobs_it_could_not_store(replay, tmp_path, monkeypatch):
+    def broken(jobs):
+        raise ValueError('disk full')
+
+    replay()
+    monkeypatch.setattr(job_scraper_manager, 'JobSink', functools.partial(JobSink, store_jobs=broken))
+    database.set_db_path(str(tmp_path / 'jobs.db'))
+    database.init_db()
+    try:
+        manager = JobScraperManager()
+        results = manager.scrape_all_sources(rss_enabled=True, google_enabled=False, max_jobs_per_source=40)
+
+        assert results['summary']['dropped_jobs'] == results['rss']['count'] == 10
+        assert 'disk full' in results['summary']['error']
+        assert (manager.scraping_stats['successful_scrapes'], manager.scraping_stats['failed_scrapes']) == (0, 1)
+    finally:
+        database.db.close_all()
@@ -0,0 +1,223 @@
+import os
+import sqlite3
+import sys
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.frontier import DETAIL, LISTING, CrawlFrontier, complete_jobs, ensure_frontier_schema
+from data.job_sink import JobSink
+from data.scrapers import scraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'frontier.db'))
+    with conn:
+        ensure_frontier_schema(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def crawl_server():
+    """Listing pages of 10, 10 and 5 job IDs (newest first) plus a jobPosting endpoint"""
+    with open(os.path.join(FIXTURES, 'linkedin_jobs', 'senior_data_scientist.html'), 'rb') as f:
+        detail = f.read()
+    pages = [[str(4100000100 - page * 10 - i) for i in range(10 if page < 2 else 5)] for page in range(3)]
+    requested = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == '/search':
+                start = int(parse_qs(parts.query)['start'][0])
+                requested[f'listing {start}'] += 1
+                ids = pages[start // 10] if start // 10 < len(pages) else []
+                body = ''.join(f'<li><div class="base-card" data-entity-urn="urn:li:jobPosting:{job_id}"></div></li>'
+                               for job_id in ids).encode()
+            else:
+                requested[parts.path.rsplit('/', 1)[1]] += 1
+                body = detail
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f'http://127.0.0.1:{server.server_port}'
+    yield {'listing': base + '/search?start={start}', 'detail': base + '/jobPosting/{job_id}'}, pages, requested
+    server.shutdown()
+    server.server_close()
+
+
+def crawl(frontier, urls, num_jobs, **kwargs):
+    return scraper.iter_crawl_jobs(frontier, num_jobs=num_jobs, workers=2, rate=1000, burst=100,
+                                   url_template=urls['listing'], detail_template=urls['detail'], **kwargs)
+
+
+def test_claims_newest_first_and_expired_leases_are_reclaimed(conn):
+    now = [1000.0]
+    frontier = CrawlFrontier(conn, lease=60, clock=lambda: now[0])
+    frontier.start()
+    frontier.add_details([(f'https://example.com/{job_id}', job_id) for job_id in ('101', '303', '202')])
+    # Already queued: ignored
+    assert frontier.add_details([('https://example.com/303', '303')]) == 0
+
+    assert [item['job_id'] for item in frontier.claim(DETAIL, 'a', limit=2)] == ['303', '202']
+    assert [item['job_id'] for item in frontier.claim(DETAIL, 'b', limit=2)] == ['101']
+    assert frontier.claim(DETAIL, 'b') == []
+
+    # Worker a went away; its claims expire after the lease
+    now[0] += 61
+    reclaimed = frontier.claim(DETAIL, 'b', limit=5)
+    assert sorted(item['job_id'] for item in reclaimed) == ['101', '202', '303']
+    assert {item['attempts'] for item in reclaimed} == {2}
+
+
+def test_failed_items_back_off_then_give_up(conn):
+    now = [0.0]
+    frontier = CrawlFrontier(conn, max_attempts=2, backoff=30, clock=lambda: now[0])
+    frontier.start()
+    frontier.add_details([('https://example.com/1', '1')])
+
+    frontier.claim(DETAIL, 'w')
+    frontier.fail('https://example.com/1', 'HTTP 429', retry_after=5)
+    assert frontier.claim(DETAIL, 'w') == []
+    assert frontier.next_due() == 5
+    now[0] = 5
+    assert len(frontier.claim(DETAIL, 'w')) == 1
+    frontier.fail('https://example.com/1', 'HTTP 503')
+    assert frontier.counts() == {DETAIL: {'failed': 1}}
+    assert frontier.next_due() is None
+
+
+def test_interrupted_crawl_resumes_without_refetching(conn, crawl_server):
+    urls, pages, requested = crawl_server
+    newest_first = [job_id for page in pages for job_id in page]
+
+    # First run stops after a handful of jobs (crash, Ctrl-C, ...)
+    first = []
+    jobs = crawl(CrawlFrontier(conn), urls, num_jobs=22)
+    for job in jobs:
+        first.append(job['job_id'])
+        if len(first) == 7:
+            break
+    jobs.close()
+
+    # A new process picks the same crawl up where it stopped
+    frontier = CrawlFrontier(conn)
+    second = [job['job_id'] for job in crawl(frontier, urls, num_jobs=22)]
+
+    assert sorted(first + second) == sorted(newest_first[:22])
+    assert requested['listing 0'] == 1
+    # Pages completed before the interruption were not fetched again; only
+    # ones in flight when it stopped may have been
+    assert all(requested[job_id] == 1 for job_id in first)
+    assert sum(requested[job_id] for job_id in newest_first) <= 22 + 2 * 2
+    assert frontier.counts()[DETAIL] == {'done': 22}
+
+    # The finished crawl is not resumed; a new one pages from the top again
+    # but skips every posting an earlier crawl fetched
+    requested.clear()
+    assert sorted(job['job_id'] for job in crawl(CrawlFrontier(conn), urls, num_jobs=25)) == sorted(newest_first[22:])
+    assert requested['listing 0'] == 1
+    assert not any(requested[job_id] for job_id in newest_first[:22])
+
+
+def test_jobs_lost_before_the_sink_commits_are_fetched_again(conn, crawl_server, tmp_path):
+    urls, pages, requested = crawl_server
+    newest_first = [job_id for page in pages for job_id in page]
+    writer_conn = sqlite3.connect(str(tmp_path / 'frontier.db'), check_same_thread=False)
+    stored = []
+
+    def store_jobs(jobs):
+        # The first batch commits; the process dies before the second does
+        if stored:
+            raise RuntimeError('killed')
+        stored.extend(job['job_id'] for job in jobs)
+        return len(jobs), 0
+
+    def on_commit(jobs):
+        with writer_conn:
+            complete_jobs(writer_conn, [job['job_id'] for job in jobs])
+
+    first = []
+    jobs = crawl(CrawlFrontier(conn), urls, num_jobs=22, defer_complete=True)
+    with pytest.raises(RuntimeError):
+        with JobSink(batch_size=5, max_delay=60, store_jobs=store_jobs, on_commit=on_commit) as sink:
+            for job in jobs:
+                first.append(job['job_id'])
+                sink.put(job)
+                if len(first) == 8:
+                    break
+            jobs.close()
+    writer_conn.close()
+    assert stored == first[:5]
+    assert CrawlFrontier(conn).counts()[DETAIL]['done'] == 5
+
+    frontier = CrawlFrontier(conn)
+    second = [job['job_id'] for job in crawl(frontier, urls, num_jobs=22)]
+
+    # Stored jobs are not fetched again; the three lost with the sink are
+    assert sorted(second) == sorted(set(newest_first[:22]) - set(stored))
+    assert all(requested[job_id] == 1 for job_id in stored)
+    assert all(requested[job_id] >= 2 for job_id in first[5:])
+    assert frontier.counts()[DETAIL] == {'done': 22}
+
+
+def test_refetch_starts_a_fresh_crawl_of_every_listed_job(conn, crawl_server):
+    urls, pages, requested = crawl_server
+    newest_first = [job_id for page in pages for job_id in page]
+
+    # An interrupted crawl is not resumed by a full re-scrape: it pages from
+    # the top again and fetches the postings already done too
+    first = []
+    jobs = crawl(CrawlFrontier(conn), urls, num_jobs=10)
+    for job in jobs:
+        first.append(job['job_id'])
+        if len(first) == 3:
+            break
+    jobs.close()
+
+    requested.clear()
+    frontier = CrawlFrontier(conn)
+    again = [job['job_id'] for job in crawl(frontier, urls, num_jobs=10, refetch=True)]
+    assert sorted(again) == sorted(newest_first[:10])
+    assert requested['listing 0'] == 1
+    assert all(requested[job_id] == 1 for job_id in first)
+    assert conn.execute('SELECT COUNT(*) FROM crawl_runs WHERE finished_at IS NULL').fetchone()[0] == 0
+
+
+def test_named_crawls_only_claim_and_reset_their_own_items(conn):
+    linkedin, indeed = CrawlFrontier(conn, clock=lambda: 0.0), CrawlFrontier(conn, 'indeed', clock=lambda: 0.0)
+    linkedin.start()
+    indeed.start()
+    linkedin.add_details([('https://example.com/1', '1')])
+    indeed.add_details([('https://example.com/2', '2')])
+    indeed.add_listing('https://example.com/search?start=0', 0)
+
+    assert [item['job_id'] for item in linkedin.claim(DETAIL, 'w', limit=5)] == ['1']
+    linkedin.fail('https://example.com/1', 'HTTP 503', retry_after=5)
+    # indeed's page is due now, but isn't linkedin's to fetch
+    assert linkedin.next_due() == 5
+    assert linkedin.counts() == {DETAIL: {'pending': 1}}
+
+    # A new linkedin run drops only linkedin's listing pages
+    linkedin.finish()
+    linkedin.start()
+    assert indeed.counts() == {DETAIL: {'pending': 1}, LISTING: {'pending': 1}}
+    assert [item['job_id'] for item in indeed.claim(DETAIL, 'w', limit=5)] == ['2']
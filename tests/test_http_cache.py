@@ -0,0 +1,135 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http_cache import ResponseCache
+from utils.http_client import HttpSession
+
+BODY = b'<html><body>' + b'<li class="job">Data Scientist</li>' * 200 + b'</body></html>'
+
+
+@pytest.fixture
+def server():
+    """Origin sending an ETag on /etag, Last-Modified on /dated, nothing on /plain and no-store on /private"""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            hits.append((self.path, self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since')))
+            if self.path.startswith('/etag') and self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('ETag', '"v1"')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if self.path.startswith('/dated') and self.headers.get('If-Modified-Since'):
+                self.send_response(304)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(BODY)))
+            if self.path.startswith('/etag'):
+                self.send_header('ETag', '"v1"')
+            if self.path.startswith('/dated'):
+                self.send_header('Last-Modified', 'Wed, 01 Oct 2025 00:00:00 GMT')
+            if self.path.startswith('/private'):
+                self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(BODY)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_port}', hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+
+@pytest.fixture
+def session(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache'), ttls={}, default_ttl=60, clock=lambda: clock[0])
+    session = HttpSession(cache=cache)
+    yield session
+    session.close()
+    cache.close()
+
+
+def test_fresh_responses_are_served_from_disk(server, session):
+    base, hits = server
+    first = session.get(f'{base}/plain?b=2&a=1')
+    second = session.get(f'{base}/plain', params={'a': 1, 'b': 2})
+
+    assert len(hits) == 1
+    assert second.content == first.content == BODY
+    assert second.text == first.text
+    assert getattr(second, 'from_cache', False) and not getattr(first, 'from_cache', False)
+    assert session.is_fresh(f'{base}/plain?a=1&b=2')
+    stats = session.cache.stats()
+    assert (stats['hits'], stats['misses'], stats['bytes_saved']) == (1, 1, len(BODY))
+
+
+def test_stale_responses_are_revalidated(server, session, clock):
+    base, hits = server
+    session.get(f'{base}/etag')
+    session.get(f'{base}/dated')
+    session.get(f'{base}/plain')
+    clock[0] += 61
+
+    assert session.get(f'{base}/etag').content == BODY
+    assert session.get(f'{base}/dated').content == BODY
+    assert session.get(f'{base}/plain').content == BODY
+    assert hits[3:] == [
+        ('/etag', '"v1"', None),
+        ('/dated', None, 'Wed, 01 Oct 2025 00:00:00 GMT'),
+        ('/plain', None, None),  # no validators: refetched
+    ]
+    # A 304 renews the entry for another TTL
+    session.get(f'{base}/etag')
+    assert len(hits) == 6
+    stats = session.cache.stats()
+    assert (stats['hits'], stats['revalidated'], stats['misses']) == (1, 2, 4)
+
+
+def test_uncacheable_responses_and_shared_bodies(server, session, tmp_path):
+    base, hits = server
+    session.get(f'{base}/private')
+    session.get(f'{base}/private')
+    assert len(hits) == 2
+
+    session.get(f'{base}/plain?page=1')
+    session.get(f'{base}/plain?page=2')
+    bodies = [name for _, _, names in os.walk(tmp_path / 'cache' / 'bodies') for name in names]
+    # Identical bodies are stored once, compressed
+    assert len(bodies) == 1
+    assert os.path.getsize(next((tmp_path / 'cache' / 'bodies').rglob('*.*'))) < len(BODY) / 10
+
+
+def test_cache_survives_restarts(server, tmp_path, clock):
+    base, hits = server
+    for _ in range(2):
+        cache = ResponseCache(str(tmp_path / 'cache'), clock=lambda: clock[0])
+        with HttpSession(cache=cache) as session:
+            assert session.get(f'{base}/plain').content == BODY
+        cache.close()
+    assert len(hits) == 1
+
+    clock[0] += 31 * 24 * 3600
+    cache = ResponseCache(str(tmp_path / 'cache'), clock=lambda: clock[0])
+    assert cache.prune() == (1, 1)
+    cache.close()
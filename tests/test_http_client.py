@@ -0,0 +1,92 @@
+import gzip
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http_client import HttpSession, default_retry
+
+BODY = b'<html><body>' + b'<li>job</li>' * 500 + b'</body></html>'
+
+
+@pytest.fixture
+def server():
+    """Keep-alive HTTP/1.1 server: gzip when asked, a 503 on the first /flaky hit, a slow /slow"""
+    state = {'flaky': 0, 'slow': 0, 'encodings': []}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            state['encodings'].append(self.headers.get('Accept-Encoding', ''))
+            if self.path == '/slow':
+                state['slow'] += 1
+                time.sleep(0.3)
+            if self.path == '/flaky':
+                state['flaky'] += 1
+                if state['flaky'] == 1:
+                    self.send_response(503)
+                    self.send_header('Retry-After', '0')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+            body = BODY
+            self.send_response(200)
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_port}', state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_requests_reuse_one_keep_alive_connection(server):
+    base, state = server
+    session = HttpSession()
+    for i in range(10):
+        response = session.get(f'{base}/page/{i}')
+        assert response.content == BODY
+        assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'gzip' in state['encodings'][0]
+
+    stats = session.connection_stats()['127.0.0.1']
+    assert stats == {'requests': 10, 'connections': 1, 'reused': 9}
+
+
+def test_default_timeout_and_retries(server):
+    base, state = server
+    session = HttpSession(timeout=0.1, retry=False)
+    with pytest.raises(requests.Timeout):
+        session.get(f'{base}/slow')
+    session = HttpSession(timeout=0.1)
+    with pytest.raises(requests.ConnectionError):
+        session.get(f'{base}/slow')
+    # Read timeouts on GET are retried: one try above, then 1 + 3 retries
+    assert state['slow'] == 5
+
+    session = HttpSession(retry=default_retry())
+    response = session.get(f'{base}/flaky')
+    assert response.status_code == 200
+    assert state['flaky'] == 2
+
+
+def test_per_host_pool_sizes():
+    session = HttpSession(pool_size=4, host_pool_sizes={'jobs.example.com': 16})
+    assert session.get_adapter('https://jobs.example.com/a')._pool_maxsize == 16
+    assert session.get_adapter('https://other.example.com/a')._pool_maxsize == 4
@@ -0,0 +1,118 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import database
+from data.job_sink import JobSink
+
+
+def job(i):
+    return {'job_id': str(i), 'title': f'Role {i}', 'company_name': f'Company {i}'}
+
+
+class Recorder:
+    """store_jobs stand-in recording each batch"""
+
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, jobs):
+        time.sleep(self.delay)
+        with self.lock:
+            self.batches.append([j['job_id'] for j in jobs])
+        return len(jobs), 0
+
+
+def test_jobs_are_flushed_in_micro_batches():
+    store = Recorder()
+    with JobSink(batch_size=10, max_delay=60, store_jobs=store) as sink:
+        for i in range(25):
+            sink.put(job(i))
+    assert [len(batch) for batch in store.batches] == [10, 10, 5]
+    assert sum(store.batches, []) == [str(i) for i in range(25)]
+    assert sink.summary()['new_jobs'] == 25
+
+
+def test_slow_trickle_is_stored_within_max_delay():
+    store = Recorder()
+    sink = JobSink(batch_size=100, max_delay=0.1, store_jobs=store)
+    sink.put(job(1))
+    sink.put(job(2))
+    time.sleep(0.5)
+    # Stored long before the batch filled or the sink closed
+    assert store.batches == [['1', '2']]
+    sink.close()
+    assert sink.summary()['first_commit_seconds'] < 0.5
+
+
+def test_bounded_queue_applies_backpressure():
+    store = Recorder(delay=0.05)
+    sink = JobSink(batch_size=2, max_delay=60, queue_size=4, store_jobs=store)
+    high_water = 0
+    for i in range(20):
+        sink.put(job(i))
+        high_water = max(high_water, sink._queue.qsize())
+    sink.close()
+    assert high_water <= 4
+    assert sum(len(batch) for batch in store.batches) == 20
+
+
+def test_crash_mid_stream_keeps_flushed_batches(tmp_path):
+    database.set_db_path(str(tmp_path / 'jobs.db'))
+    database.init_db()
+
+    def scrape():
+        for i in range(30):
+            if i == 25:
+                raise RuntimeError('connection reset')
+            yield {'job_id': str(i), 'title': f'Role {i}', 'company_name': f'Company {i}',
+                   'description': f'posting number {i} ' * 3}
+
+    try:
+        with pytest.raises(RuntimeError, match='connection reset'):
+            with JobSink(batch_size=10, max_delay=60) as sink:
+                for record in scrape():
+                    sink.put(record)
+        # Both full batches and the partial one flushed on the way out
+        assert len(database.get_all_jobs()) == 25
+    finally:
+        database.db.close_all()
+
+
+def test_writer_errors_surface_to_the_producer():
+    def broken(jobs):
+        raise ValueError('disk full')
+
+    sink = JobSink(batch_size=1, max_delay=60, store_jobs=broken)
+    with pytest.raises(RuntimeError, match='disk full'):
+        for i in range(100):
+            sink.put(job(i))
+            time.sleep(0.01)
+    with pytest.raises(RuntimeError):
+        sink.close()
+
+
+def test_batches_after_a_failed_one_are_counted_as_dropped():
+    store = Recorder()
+
+    def fails_second_batch(jobs):
+        if store.batches:
+            raise ValueError('disk full')
+        return store(jobs)
+
+    sink = JobSink(batch_size=5, max_delay=60, store_jobs=fails_second_batch)
+    with pytest.raises(RuntimeError, match='jobs not stored: disk full') as raised:
+        with sink:
+            for i in range(20):
+                sink.put(job(i))
+    summary = sink.summary()
+    assert (summary['new_jobs'], summary['batches']) == (5, 1)
+    assert summary['dropped'] == summary['received'] - 5 > 0
+    assert f"{summary['dropped']} jobs not stored" in str(raised.value)
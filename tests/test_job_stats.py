@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import database, job_stats
+from test_database import jobs_db, sample_job
+
+
+def test_rollups_follow_inserts_updates_and_deletes(jobs_db):
+    jobs_db.store_jobs_bulk([
+        sample_job('1', company_name='Acme', location='Remote', salary_avg=100000),
+        sample_job('2', title='Data Engineer', company_name='Acme', employment_type='Contract', salary_avg=None),
+        sample_job('3', company_name='Globex', remote='1', created_at='2020-01-01 00:00:00', salary_avg=200000),
+    ])
+    with jobs_db.db.transaction() as conn:
+        conn.execute("UPDATE jobs SET company_name = 'Initech', location = 'Austin, TX' WHERE job_id = '1'")
+        conn.execute("DELETE FROM jobs WHERE job_id = '2'")
+    jobs_db.store_job(**sample_job('4', company_name='Initech'))
+
+    with jobs_db.db.connection() as conn:
+        assert job_stats.check_job_statistics(conn) == {}
+
+    stats = jobs_db.get_job_statistics(days_back=7, title_filter='data')
+    assert stats['total_jobs'] == 3
+    assert stats['recent_jobs'] == 2
+    assert stats['top_companies'] == [{'company': 'Initech', 'count': 2}, {'company': 'Globex', 'count': 1}]
+    assert stats['employment_types'] == [{'type': 'Full-time', 'count': 3}]
+    assert stats['remote_jobs'] == 1
+    assert round(stats['remote_percentage'], 1) == 33.3
+    assert stats['avg_salary'] == (100000 + 200000 + 135000) / 3
+    assert stats['title_stats'] == {'count': 3, 'filter': 'data'}
+
+
+def test_rebuild_repairs_drift(jobs_db):
+    jobs_db.store_jobs_bulk([sample_job(str(i), title=f'Data Scientist {i}', company_name=f"Company {i % 3}")
+                             for i in range(9)])
+    with jobs_db.db.transaction() as conn:
+        conn.execute("UPDATE job_stats_company SET job_count = 99")
+        conn.execute("DELETE FROM job_stats_day")
+    with jobs_db.db.connection() as conn:
+        assert set(job_stats.check_job_statistics(conn)) == {'job_stats_company', 'job_stats_day'}
+
+    with jobs_db.db.transaction() as conn:
+        job_stats.rebuild_job_statistics(conn)
+    with jobs_db.db.connection() as conn:
+        assert job_stats.check_job_statistics(conn) == {}
+    assert jobs_db.get_job_statistics()['total_jobs'] == 9
+
+
+def test_empty_database_statistics(jobs_db):
+    stats = jobs_db.get_job_statistics()
+    assert stats['total_jobs'] == 0
+    assert stats['remote_percentage'] == 0.0
+    assert stats['avg_salary'] is None
@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import job_tags
+from test_database import jobs_db, sample_job
+
+
+def tag_rows(db, link_table, id_col, table):
+    with db.db.connection() as conn:
+        return sorted(conn.execute(
+            f'SELECT job_id, name FROM {link_table} JOIN {table} USING ({id_col})'
+        ).fetchall())
+
+
+def test_side_tables_follow_inserts_updates_and_deletes(jobs_db):
+    jobs_db.store_jobs_bulk([
+        sample_job('1', skills=['Python', ' SQL ', 'python'], education=["Bachelor's", 'M.S']),
+        sample_job('2', title='Data Engineer', skills=['python', 'spark'], education=['bachelors']),
+        sample_job('3', title='Data Analyst', skills='not json', education=[{'degree': 'phd'}]),
+    ])
+    jobs_db.store_job(**sample_job('4', skills=['sql']))
+    with jobs_db.db.transaction() as conn:
+        conn.execute("""UPDATE jobs SET skills = '["go"]' WHERE job_id = '2'""")
+        conn.execute("DELETE FROM jobs WHERE job_id = '4'")
+
+    assert tag_rows(jobs_db, 'job_skills', 'skill_id', 'skills') == [('1', 'python'), ('1', 'sql'), ('2', 'go')]
+    assert tag_rows(jobs_db, 'job_education', 'degree_id', 'degrees') == [
+        ('1', 'bachelors'), ('1', 'ms'), ('2', 'bachelors')]
+
+    expected = tag_rows(jobs_db, 'job_skills', 'skill_id', 'skills')
+    with jobs_db.db.transaction() as conn:
+        job_tags.rebuild_job_tags(conn)
+    assert tag_rows(jobs_db, 'job_skills', 'skill_id', 'skills') == expected
+
+
+def test_skill_filters_and_frequency(jobs_db):
+    jobs_db.store_jobs_bulk([
+        sample_job('ds1', skills=['python', 'sql'], education=["master's"]),
+        sample_job('ds2', title='Senior Data Scientist', skills=['python', 'r'], education=['phd']),
+        sample_job('de', title='Data Engineer', skills=['python', 'spark', 'sql']),
+        sample_job('pm', title='Product Manager', skills=['roadmaps']),
+    ])
+
+    def ids(**filters):
+        return sorted(job['job_id'] for job in jobs_db.search_jobs(num_jobs=10, filters=filters))
+
+    assert ids(skills='Python') == ['de', 'ds1', 'ds2']
+    assert ids(skills=['python', 'sql']) == ['de', 'ds1']
+    assert ids(education=['Masters', 'PhD']) == ['ds1', 'ds2']
+    assert ids(skills=['python'], education="bachelor's") == ['de']
+
+    assert jobs_db.get_tag_frequency(limit=2) == [{'name': 'python', 'count': 3}, {'name': 'sql', 'count': 2}]
+    assert jobs_db.get_tag_frequency(title='data scientist') == [
+        {'name': 'python', 'count': 2}, {'name': 'r', 'count': 1}, {'name': 'sql', 'count': 1}]
+    assert jobs_db.get_tag_frequency('education', filters={'skills': 'spark'}) == [{'name': 'bachelors', 'count': 1}]
@@ -0,0 +1,99 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import database
+from data.known_jobs import BloomFilter, IncrementalStats
+from data.scrapers import scraper
+
+
+def listing_page(job_ids):
+    cards = ''.join(
+        f'<li><div class="base-card" data-entity-urn="urn:li:jobPosting:{job_id}">'
+        f'<a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/{job_id}">Job</a></div></li>'
+        for job_id in job_ids
+    )
+    return f'<!DOCTYPE html><html><body><ul>{cards}</ul></body></html>'.encode()
+
+
+@pytest.fixture
+def listing_server():
+    """Stand-in for seeMoreJobPostings: 5 pages of 10 job IDs, newest first"""
+    pages = [[str(4100000000 + page * 10 + i) for i in range(10)] for page in range(5)]
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            start = int(parse_qs(urlsplit(self.path).query)['start'][0])
+            requested.append(start)
+            body = listing_page(pages[start // 10] if start // 10 < len(pages) else [])
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/search?start={{start}}', pages, requested
+    server.shutdown()
+    server.server_close()
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    known = BloomFilter(10000, error_rate=0.01)
+    known.update(str(i) for i in range(10000))
+    assert all(str(i) in known for i in range(10000))
+    false_positives = sum(str(i) in known for i in range(10000, 30000))
+    assert false_positives / 20000 < 0.02
+    assert len(known) == 10000 and known.nbytes < 12500
+
+
+def test_known_ids_include_stored_and_near_duplicate_jobs(tmp_path):
+    database.set_db_path(str(tmp_path / 'jobs.db'))
+    database.init_db()
+    try:
+        database.store_jobs_bulk([
+            {'job_id': '1', 'title': 'Data Scientist', 'company_name': 'Acme'},
+            {'job_id': '2', 'title': 'Chef', 'company_name': 'Bistro'},
+        ])
+        with database.db.transaction() as conn:
+            conn.execute("INSERT INTO job_duplicates (job_id, duplicate_of, distance) VALUES ('rss-3', '1', 2)")
+        assert database.get_known_job_ids() == {'1', '2', 'rss-3'}
+        bloom = database.get_known_job_ids(bloom=True)
+        assert all(job_id in bloom for job_id in ('1', '2', 'rss-3'))
+    finally:
+        database.db.close_all()
+
+
+def test_full_scrape_pages_until_num_jobs(listing_server):
+    url_template, pages, requested = listing_server
+    job_ids = scraper.get_job_ids(25, url_template=url_template, page_delay=0)
+    assert job_ids == pages[0] + pages[1] + pages[2][:5]
+    assert requested == [0, 10, 20]
+
+
+def test_incremental_scrape_skips_known_ids_and_stops_at_high_water(listing_server):
+    url_template, pages, requested = listing_server
+    # Last run stored everything from page 2 on, and one job on page 1
+    known = set(pages[0][3:4]) | {job_id for page in pages[1:] for job_id in page}
+    stats = IncrementalStats()
+
+    job_ids = scraper.get_job_ids(100, known=known, stats=stats, url_template=url_template, page_delay=0)
+
+    assert job_ids == [job_id for job_id in pages[0] if job_id not in known]
+    assert requested == [0, 10]
+    summary = stats.summary()
+    assert summary['fetches_avoided'] == 11
+    assert summary['new_ids'] == 9
+    assert summary['stopped_at'] == 10
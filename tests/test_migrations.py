@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import migrations
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'jobs.db'))
+    yield conn
+    conn.close()
+
+
+def test_migrations_apply_once_in_order(conn):
+    assert migrations.migrate(conn, target=2) == [1, 2]
+    assert migrations.current_version(conn) == 2
+    assert migrations.migrate(conn) == [m[0] for m in migrations.MIGRATIONS[2:]]
+    assert migrations.migrate(conn) == []
+
+    versions = [row[0] for row in conn.execute('SELECT version FROM schema_version ORDER BY version')]
+    assert versions == [m[0] for m in migrations.MIGRATIONS]
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'idx_jobs_created_at_id' in indexes and 'idx_created_at' not in indexes
+
+
+def test_failed_migration_rolls_back(conn):
+    def broken(c):
+        c.execute('CREATE TABLE half_done (id INTEGER)')
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        migrations.migrate(conn, migrations=migrations.MIGRATIONS[:1] + [(2, 'broken', broken, True)])
+    assert migrations.current_version(conn) == 1
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone()
+
+
+def test_online_add_column_and_backfill(conn):
+    migrations.migrate(conn)
+    with conn:
+        conn.executemany('INSERT INTO jobs (job_id, salary_min, salary_max) VALUES (?, ?, ?)',
+                         [(str(i), i * 1000, i * 1000 + 500) for i in range(2500)])
+
+    def add_salary_mid(c):
+        migrations.add_column(c, 'jobs', 'salary_mid', 'INTEGER')
+        migrations.backfill(c, 'jobs', 'salary_mid = (salary_min + salary_max) / 2',
+                            where='salary_mid IS NULL AND salary_min >= ?', where_params=(1000,), batch_size=1000)
+
+    steps = migrations.MIGRATIONS + [(99, 'salary midpoint', add_salary_mid, False)]
+    assert migrations.migrate(conn, migrations=steps) == [99]
+    assert not migrations.add_column(conn, 'jobs', 'salary_mid', 'INTEGER')
+    assert conn.execute('SELECT salary_mid FROM jobs WHERE job_id = ?', ('7',)).fetchone()[0] == 7250
+    assert conn.execute('SELECT COUNT(*) FROM jobs WHERE salary_mid IS NULL').fetchone()[0] == 1
+    # Re-running the backfill finds nothing left to do
+    assert migrations.backfill(conn, 'jobs', 'salary_mid = 0', where='salary_mid IS NULL AND salary_min >= 1000') == 0
@@ -0,0 +1,126 @@
+import glob
+import os
+import sys
+import zlib
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import database, dedup, page_archive
+from data.scrapers import scraper
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'linkedin_jobs')
+
+
+def retitle(html, suffix):
+    """The same page for another opening, so it is not a near-duplicate of the original"""
+    title = scraper.parse_job_page('', html)['title']
+    return html.replace(title, f'{title} {suffix}')
+
+
+@pytest.fixture
+def archived_db(tmp_path):
+    """jobs.db holding the recorded corpus twice as jobs 1..8, each with its archived page"""
+    database.set_db_path(str(tmp_path / 'jobs.db'))
+    database.init_db()
+    jobs, pages = [], []
+    paths = sorted(glob.glob(os.path.join(CORPUS, '*.html')))
+    for i, path in enumerate(paths * 2, start=1):
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        if i > len(paths):
+            html = retitle(html, 'II')
+        job_id = f'job-{i}'
+        jobs.append(scraper.parse_job_page(job_id, html))
+        pages.append((job_id, *page_archive.compress_page(html)))
+    assert database.store_jobs_bulk(jobs) == (8, 0)
+    assert database.store_job_pages(pages) == len(pages)
+    yield database
+    database.db.close_all()
+
+
+def test_pages_round_trip_through_each_codec():
+    html = '<html><body>' + '<li>Data Scientist – $150,000</li>' * 100 + '</body></html>'
+    codec, blob, size = page_archive.compress_page(html)
+    assert size == len(html.encode()) and len(blob) < size / 10
+    assert page_archive.decompress_page(codec, blob) == html
+    assert page_archive.decompress_page('zlib', zlib.compress(html.encode())) == html
+
+
+def test_reextract_rewrites_only_changed_jobs(archived_db):
+    with database.db.transaction() as conn:
+        # Stand-in for a job stored by an older, broken extractor
+        conn.execute("UPDATE jobs SET yoe_min = NULL, yoe_max = NULL, education = '[]' WHERE job_id = 'job-3'")
+    expected = database.get_job_by_id('job-7')
+
+    with database.db.connection() as conn:
+        result = page_archive.reextract(conn, workers=2, batch_size=3, progress=False)
+    assert (result['processed'], result['changed'], result['failed']) == (8, 1, 0)
+    fixed = database.get_job_by_id('job-3')
+    assert (fixed.yoe_min, fixed.yoe_max, sorted(fixed.education)) == \
+        (expected.yoe_min, expected.yoe_max, sorted(expected.education))
+
+
+def test_reextract_resumes_from_its_checkpoint(archived_db, monkeypatch):
+    apply = page_archive._apply
+    applied = []
+
+    def interrupted(*args):
+        if applied:
+            raise RuntimeError('interrupted')
+        applied.append(args)
+        return apply(*args)
+
+    monkeypatch.setattr(page_archive, '_apply', interrupted)
+    with database.db.connection() as conn:
+        with pytest.raises(RuntimeError):
+            page_archive.reextract(conn, workers=1, batch_size=3, progress=False)
+        assert page_archive.load_checkpoint(conn)['last_job_id'] == 'job-3'
+        monkeypatch.setattr(page_archive, '_apply', apply)
+
+        # Resumes after the last committed batch, and a finished run leaves no checkpoint
+        assert page_archive.reextract(conn, workers=1, progress=False)['processed'] == 5
+        assert page_archive.load_checkpoint(conn) is None
+
+        monkeypatch.setattr(page_archive, '_apply', interrupted)
+        with pytest.raises(RuntimeError):
+            page_archive.reextract(conn, workers=1, batch_size=3, progress=False)
+        monkeypatch.setattr(page_archive, '_apply', apply)
+        assert page_archive.reextract(conn, workers=1, progress=False, restart=True)['processed'] == 8
+
+
+def test_each_finished_reextract_replays_every_page(archived_db):
+    with database.db.connection() as conn:
+        assert page_archive.reextract(conn, workers=1, progress=False)['processed'] == 8
+    with database.db.transaction() as conn:
+        # Stand-in for an extractor fix since the first run: a page already replayed is stored stale
+        conn.execute("UPDATE jobs SET yoe_min = NULL, yoe_max = NULL, education = '[]' WHERE job_id = 'job-7'")
+
+    with database.db.connection() as conn:
+        result = page_archive.reextract(conn, workers=1, progress=False)
+    assert (result['processed'], result['changed']) == (8, 1)
+    fixed, expected = database.get_job_by_id('job-7'), database.get_job_by_id('job-3')
+    assert (fixed.yoe_min, fixed.yoe_max, sorted(fixed.education)) == \
+        (expected.yoe_min, expected.yoe_max, sorted(expected.education))
+
+
+def test_reextract_refreshes_rewritten_jobs_fingerprints(archived_db):
+    def fingerprint(conn, job_id):
+        row = conn.execute('SELECT simhash, match_key FROM job_fingerprints WHERE job_id = ?', (job_id,)).fetchone()
+        bands = {key for key, in conn.execute('SELECT band_key FROM job_simhash_bands WHERE job_id = ?', (job_id,))}
+        return row, bands
+
+    with database.db.transaction() as conn:
+        expected = fingerprint(conn, 'job-3')
+        # Stand-in for a job stored, and fingerprinted, by an older extractor
+        conn.execute("UPDATE jobs SET title = 'Unknown', city = NULL, state = NULL, "
+                     "description = 'no description parsed' || description WHERE job_id = 'job-3'")
+        columns = ', '.join(dedup.FINGERPRINT_COLUMNS)
+        row = conn.execute(f"SELECT {columns} FROM jobs WHERE job_id = 'job-3'").fetchone()
+        assert dedup.refresh_fingerprints(conn, [dict(zip(dedup.FINGERPRINT_COLUMNS, row))]) == 1
+        assert fingerprint(conn, 'job-3') != expected
+
+    with database.db.connection() as conn:
+        assert page_archive.reextract(conn, workers=1, progress=False)['changed'] == 1
+        assert fingerprint(conn, 'job-3') == expected
@@ -0,0 +1,122 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_server import FixtureServer
+from data import database
+from scrapers.rss_scraper import RSSJobScraper
+from utils.http_client import get_session
+
+NEW_ITEM = b'''<item>
+      <title>Staff Data Engineer at Fresh Co</title>
+      <link>https://remote.co/job/staff-data-engineer-fresh-co/</link>
+      <guid>remote-co-job-2000</guid>
+      <description>Build streaming pipelines. Remote, US. $180,000 - $210,000.</description>
+    </item>
+    <item>'''
+
+
+@pytest.fixture
+def replay(tmp_path):
+    """Fixture server routed through the shared session, with a fresh jobs.db for the feed state"""
+    server = FixtureServer().start()
+    uninstall = server.install(get_session())
+    database.set_db_path(str(tmp_path / 'jobs.db'))
+    database.init_db()
+    yield server
+    database.db.close_all()
+    uninstall()
+    server.stop()
+
+
+def scrape(scraper, max_jobs):
+    """Scrape and commit, as if every job was stored"""
+    jobs = scraper.scrape_jobs(max_jobs=max_jobs)
+    scraper.commit(jobs)
+    return jobs
+
+
+def parsed_entries(scraper, monkeypatch):
+    """Record the links of the entries that reach the parser"""
+    parsed = []
+    parse = scraper._parse_rss_entry
+
+    def recording(entry, source):
+        parsed.append(entry.get('link'))
+        return parse(entry, source)
+
+    monkeypatch.setattr(scraper, '_parse_rss_entry', recording)
+    return parsed
+
+
+def test_unchanged_feeds_cost_one_304_each(replay):
+    # The same recorded feed is served for all four, so the cross-feed dedup keeps 25
+    assert len(scrape(RSSJobScraper(), 400)) == 25
+    assert replay.summary() == {'rss 200': 4}
+    assert database.get_feed_state('https://remote.co/remote-jobs/feed/')['etag']
+
+    assert scrape(RSSJobScraper(), 400) == []
+    assert replay.summary() == {'rss 200': 4, 'rss 304': 4}
+    state = database.get_feed_state('https://remote.co/remote-jobs/feed/')
+    assert (state['polls'], state['not_modified'], state['last_status']) == (2, 1, 304)
+
+
+def test_only_new_entries_are_parsed(replay, monkeypatch):
+    scraper = RSSJobScraper()
+    parsed = parsed_entries(scraper, monkeypatch)
+    scrape(scraper, 400)
+    assert len(parsed) == 4 * 25
+
+    replay.feed = replay.feed.replace(b'<item>', NEW_ITEM, 1)
+    del parsed[:]
+    jobs = scrape(scraper, 400)
+
+    # Every feed changed, but only its new entry went through the parser
+    assert parsed == ['https://remote.co/job/staff-data-engineer-fresh-co/'] * 4
+    assert [job['title'] for job in jobs] == ['Staff Data Engineer at Fresh Co']
+
+
+def test_entries_left_over_by_the_quota_are_parsed_next_poll(replay, monkeypatch):
+    scraper = RSSJobScraper()
+    parsed = parsed_entries(scraper, monkeypatch)
+    scrape(scraper, 40)
+    assert len(parsed) == 4 * 10
+
+    # The feeds did not change, but their unparsed entries are fetched in full again
+    del parsed[:]
+    scrape(scraper, 400)
+    assert len(parsed) == 4 * 15
+    assert replay.summary() == {'rss 200': 8}
+
+
+def test_entries_count_as_seen_only_once_their_jobs_are_stored(replay, monkeypatch):
+    scraper = RSSJobScraper()
+    parsed = parsed_entries(scraper, monkeypatch)
+    jobs = scraper.scrape_jobs(max_jobs=400)
+    assert len(jobs) == 25
+
+    # Nothing was stored (the sink failed): the next poll parses every entry again
+    assert database.get_feed_state('https://remote.co/remote-jobs/feed/')['etag'] is None
+    del parsed[:]
+    jobs = scraper.scrape_jobs(max_jobs=400)
+    assert len(parsed) == 4 * 25
+
+    # Some stored: the rest of the entries are still parsed, and no 304 yet
+    scraper.commit(jobs[:10])
+    del parsed[:]
+    rest = scraper.scrape_jobs(max_jobs=400)
+    assert len(rest) == 15
+    assert len(parsed) == 4 * 15
+
+    scraper.commit(rest)
+    assert scraper.scrape_jobs(max_jobs=400) == []
+    assert replay.summary() == {'rss 200': 12, 'rss 304': 4}
+
+
+def test_published_dates_are_stored_in_utc():
+    scraper = RSSJobScraper()
+    assert scraper._parse_date('Tue, 14 Oct 2025 09:30:00 +0200') == '2025-10-14 07:30:00'
+    assert scraper._parse_date('2025-10-14T09:30:00Z') == '2025-10-14 09:30:00'
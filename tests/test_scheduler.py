@@ -0,0 +1,149 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_server import FixtureServer
+from data import database
+from data.job_sink import JobSink
+from scrapers import scheduler
+from scrapers.scheduler import SourceScheduler
+from scrapers.source_registry import Source, load_config, load_sources
+from utils.http_client import get_session
+
+
+@pytest.fixture
+def jobs_db(tmp_path):
+    database.set_db_path(str(tmp_path / 'jobs.db'))
+    database.init_db()
+    yield
+    database.db.close_all()
+
+
+def source(name, kind='rss', interval=0.1, jitter=0.0):
+    return Source(name, kind, interval, 10, jitter, True, {})
+
+
+def test_intervals_overlap_and_concurrency_cap(jobs_db):
+    durations = {'slow': 0.35, 'crawl-a': 0.1, 'crawl-b': 0.1}
+    active, peak, crawls, overlaps = set(), [0], [0], []
+    lock = threading.Lock()
+
+    def runner(src):
+        with lock:
+            if src.name in active:
+                overlaps.append(src.name)
+            active.add(src.name)
+            peak[0] = max(peak[0], len(active))
+            crawls[0] += src.kind == 'linkedin'
+            if crawls[0] > 1:
+                overlaps.append('linkedin')
+        time.sleep(durations.get(src.name, 0.05))
+        with lock:
+            active.discard(src.name)
+            crawls[0] -= src.kind == 'linkedin'
+        return {'jobs': 3, 'new_jobs': 1}
+
+    sources = [source('slow'), source('feed-1'), source('feed-2'), source('feed-3'),
+               source('crawl-a', 'linkedin'), source('crawl-b', 'linkedin')]
+    scheduler = SourceScheduler(sources, max_concurrent=3, runner=runner)
+    timer = threading.Timer(1.2, scheduler.stop)
+    timer.start()
+    scheduler.run()
+
+    assert overlaps == []
+    assert peak[0] == 3
+    ran = {run['name'] for run in scheduler.runs}
+    assert ran == {src.name for src in sources}
+    schedule = database.get_source_schedule()
+    slow = schedule['slow']
+    assert slow['skipped'] > 0
+    assert slow['last_duration'] == pytest.approx(0.35, abs=0.1)
+    assert (slow['last_status'], slow['last_jobs'], slow['last_new_jobs']) == ('ok', 3, 1)
+    assert all(row['next_run_at'] > row['last_started_at'] for row in schedule.values())
+
+
+def test_restart_keeps_the_stored_schedule(jobs_db):
+    sources = [source('hourly', interval=3600, jitter=0.1), source('daily', interval=86400, jitter=0.1)]
+    first = SourceScheduler(sources, seed=1)
+    first.plan()
+    # New sources start within the first jitter share of their interval
+    assert all(0 <= first.next_run[src.name] - time.time() <= src.jitter * src.interval for src in sources)
+
+    second = SourceScheduler(sources, seed=2)
+    second.plan()
+    assert second.next_run == first.next_run
+
+
+def test_failed_runs_are_recorded(jobs_db):
+    def runner(src):
+        raise RuntimeError('feed is down')
+
+    SourceScheduler([source('broken')], runner=runner).run(once=True)
+    row = database.get_source_schedule()['broken']
+    assert (row['last_status'], row['last_error'], row['runs'], row['failures']) == ('failed', 'feed is down', 1, 1)
+
+
+def test_configured_feed_runs_once_into_the_database(jobs_db, tmp_path):
+    config = tmp_path / 'sources.json'
+    config.write_text(json.dumps({'max_concurrent': 2, 'sources': [
+        {'name': 'Remote Jobs', 'type': 'rss', 'url': 'https://remote.co/remote-jobs/feed/', 'interval_minutes': 30},
+        {'name': 'Google Jobs', 'type': 'google', 'interval_minutes': 180, 'enabled': False},
+    ]}))
+    settings, sources = load_config(str(config))
+    assert settings == {'max_concurrent': 2, 'jitter': 0.1}
+    assert sources[0].options == {'url': 'https://remote.co/remote-jobs/feed/', 'source': 'remote.co'}
+    assert sources[0].interval == 1800
+
+    with FixtureServer() as server:
+        uninstall = server.install(get_session())
+        try:
+            SourceScheduler(load_sources(str(config)), max_concurrent=settings['max_concurrent']).run(once=True)
+        finally:
+            uninstall()
+
+    row = database.get_source_schedule()['Remote Jobs']
+    assert (row['last_status'], row['last_jobs'], row['runs']) == ('ok', 25, 1)
+    assert row['last_new_jobs'] == len(database.get_all_jobs()) > 0
+    assert 'Google Jobs' not in database.get_source_schedule()
+
+
+def test_runs_that_could_not_store_every_job_fail(jobs_db, tmp_path, monkeypatch):
+    def broken(jobs):
+        raise ValueError('disk full')
+
+    monkeypatch.setattr(scheduler, 'JobSink', functools.partial(JobSink, store_jobs=broken))
+    config = tmp_path / 'sources.json'
+    config.write_text(json.dumps({'sources': [
+        {'name': 'Remote Jobs', 'type': 'rss', 'url': 'https://remote.co/remote-jobs/feed/', 'interval_minutes': 30},
+    ]}))
+    with FixtureServer() as server:
+        uninstall = server.install(get_session())
+        try:
+            SourceScheduler(load_sources(str(config))).run(once=True)
+        finally:
+            uninstall()
+
+    row = database.get_source_schedule()['Remote Jobs']
+    assert (row['last_status'], row['failures']) == ('failed', 1)
+    assert '25 jobs not stored: disk full' in row['last_error']
+
+
+@pytest.mark.parametrize('entry', [
+    {'name': 'x', 'type': 'indeed', 'interval_minutes': 5},
+    {'name': 'x', 'type': 'rss', 'interval_minutes': 5},
+    {'name': 'x', 'type': 'rss', 'url': 'https://example.com/feed', 'interval_minutes': 0},
+    {'name': 'x', 'type': 'linkedin', 'windows': ['year'], 'interval_minutes': 5},
+    {'name': 'x', 'type': 'adzuna', 'query': 'data', 'interval_minutes': 5},
+])
+def test_invalid_sources_are_rejected(tmp_path, entry):
+    config = tmp_path / 'sources.json'
+    config.write_text(json.dumps({'sources': [entry]}))
+    with pytest.raises(ValueError):
+        load_config(str(config))
@@ -0,0 +1,82 @@
+import glob
+import json
+import os
+import sys
+
+import pytest
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.scrapers import html_parsing, scraper
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'linkedin_jobs')
+PAGES = sorted(glob.glob(os.path.join(CORPUS, '*.html')))
+LISTING = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'linkedin_listing.html')
+BACKENDS = [
+    pytest.param(backend, marks=pytest.mark.skipif(backend not in html_parsing.available_backends(),
+                                                    reason=f'{backend} not installed'))
+    for backend in html_parsing.BACKENDS
+]
+
+
+def load_page(path):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    with open(path[:-5] + '.json', encoding='utf-8') as f:
+        expected = json.load(f)
+    return html, expected
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('path', PAGES, ids=lambda path: os.path.basename(path)[:-5])
+def test_parse_job_page_matches_recorded_fields(path, backend):
+    """Golden outputs were recorded with full html.parser trees and the per-field extractors"""
+    html, expected = load_page(path)
+    job = scraper.parse_job_page(os.path.basename(path)[:-5], html, backend=backend)
+    # education lists degrees in order of first mention
+    assert job == expected
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_remote_location_and_open_ended_salary_parse_as_before(backend):
+    """Fields recorded with the per-field extractors from before utils/extraction.py"""
+    html, _ = load_page(os.path.join(CORPUS, 'sparse_product_manager.html'))
+    html = html.replace('San Francisco Bay Area', 'Remote').replace(
+        'Work from home Fridays.', 'Base pay starts at $150,000+ with equity.')
+    job = scraper.parse_job_page('remote', html, backend=backend)
+    assert {key: job[key] for key in ('location', 'city', 'state', 'country', 'remote')} == \
+        {'location': 'Remote', 'city': 'Remote', 'state': None, 'country': 'United States', 'remote': 1}
+    assert {key: job[key] for key in ('salary_raw', 'salary_min', 'salary_max', 'salary_avg')} == \
+        {'salary_raw': '$150,000', 'salary_min': 150000, 'salary_max': 150000, 'salary_avg': 150000}
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_listing_page_cards_and_ids_match_full_parse(backend):
+    html, expected = load_page(LISTING)
+    cards = scraper.parse_listing_page(html, backend=backend)
+    # Nested <li> benefit badges count as cards, as they did with the full tree
+    assert len(cards) == expected['cards']
+    job_ids = [scraper.extract_listing_job_id(card) for card in cards]
+    assert [job_id for job_id in job_ids if job_id] == expected['job_ids']
+
+
+def test_detail_strainer_keeps_only_extractor_nodes():
+    html, _ = load_page(os.path.join(CORPUS, 'senior_data_scientist.html'))
+    soup = html_parsing.detail_soup(html, 'html.parser')
+    assert soup.find(class_='num-applicants__caption') is not None  # inside the top card
+    assert soup.find('button', class_='show-more-less-html__button') is not None  # inside the description
+    assert soup.find(class_='core-section-container') is None
+
+
+def test_field_extractors_agree_with_criteria_walk():
+    html, expected = load_page(os.path.join(CORPUS, 'remote_ml_engineer.html'))
+    soup = BeautifulSoup(html, 'html.parser')
+    assert scraper.extract_seniority_level(soup) == expected['seniority_level']
+    assert scraper.extract_employment_type(soup) == expected['employment_type']
+    assert scraper.extract_job_function(soup) == expected['job_function']
+    assert scraper.extract_industry(soup) == expected['industry']
+
+    empty = BeautifulSoup('<div class="description__text description__text--rich"></div>', 'html.parser')
+    assert scraper.clean_description(empty.div) == ''
+    assert scraper.clean_description(None) is None
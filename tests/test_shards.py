@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_server import FixtureServer
+from data.frontier import CrawlFrontier, ensure_frontier_schema
+from data.scrapers import scraper
+from data.scrapers.shards import ShardStats, plan_shards
+from utils.http_client import get_session
+
+
+@pytest.fixture
+def replay():
+    """Fixture server with 2 listing pages per search (week: 1), routed through the shared session"""
+    server = FixtureServer(pages=2).start()
+    uninstall = server.install(get_session())
+    yield server
+    uninstall()
+    server.stop()
+
+
+def test_default_plan_is_the_single_search():
+    assert [shard.url_template for shard in plan_shards()] == [scraper.LISTING_URL]
+    shards = plan_shards(keywords=['data', 'python'], locations=['', 'Germany'], windows=['day', 'week'])
+    assert len(shards) == 8
+    assert 'keywords=python&location=Germany&f_TPR=r604800&f_WT=2' in shards[-1].url_template
+    with pytest.raises(ValueError):
+        plan_shards(windows=['year'])
+
+
+def test_keyword_shards_get_past_the_single_search_cap(replay):
+    assert len(scraper.get_job_ids(100, page_delay=0)) == 20
+
+    shards = plan_shards(keywords=['data scientist', 'data engineer', 'analyst'])
+    stats = ShardStats(shards)
+    job_ids = list(scraper.iter_shard_job_ids(shards, num_jobs=100, rate=1000, burst=10, shard_stats=stats))
+
+    assert len(job_ids) == len(set(job_ids)) == 60
+    assert all(entry['new'] == 20 and entry['pages'] == 3 and entry['stopped'] == 'last page'
+               for entry in stats.summary().values())
+    # 3 pages per shard (the last one empty) plus the single search above
+    assert replay.summary() == {'linkedin-listing 200': 9 + 3}
+
+
+def test_nested_windows_are_merged_and_their_overlap_reported(replay):
+    shards = plan_shards(keywords=['data'], windows=['week', 'month'])
+    stats = ShardStats(shards)
+    job_ids = list(scraper.iter_shard_job_ids(shards, num_jobs=100, rate=1000, burst=10, shard_stats=stats))
+
+    # The week's postings are the first page of the month's
+    assert len(job_ids) == len(set(job_ids)) == 20
+    summary = stats.summary()
+    assert sum(entry['new'] for entry in summary.values()) == 20
+    assert sum(entry['overlap'] for entry in summary.values()) == 10
+
+
+def test_crawl_fans_out_over_shards(replay, tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'frontier.db'))
+    with conn:
+        ensure_frontier_schema(conn)
+    shards = plan_shards(keywords=['data', 'python', 'sql'])
+    stats = ShardStats(shards)
+
+    jobs = list(scraper.iter_crawl_jobs(CrawlFrontier(conn), num_jobs=45, workers=4, rate=1000, burst=10,
+                                        shards=shards, shard_stats=stats))
+    conn.close()
+
+    assert len({job['job_id'] for job in jobs}) == len(jobs) == 45
+    summary = stats.summary()
+    assert sum(entry['new'] for entry in summary.values()) == 45
+    # Every shard contributed: pages were claimed side by side, not one cursor after another
+    assert all(entry['new'] >= 5 for entry in summary.values())
+    assert 'target reached' in {entry['stopped'] for entry in summary.values()}
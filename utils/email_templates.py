@@ -125,15 +125,10 @@ def create_job_email_content(jobs: List[Dict]) -> str:
         else:
             salary_display = "💰 Salary not specified"
         
-        # Format skills display
-        skills = job.get('skills', [])
+        # Format skills display (Job records decode the stored JSON list on access)
+        skills = job.get('skills') or []
         if isinstance(skills, str):
-            # If skills is a JSON string, try to parse it
-            try:
-                import json
-                skills = json.loads(skills)
-            except:
-                skills = [skills] if skills else []
+            skills = [skills]
         
         skills_display = ""
         if skills:
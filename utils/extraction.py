@@ -0,0 +1,296 @@
+"""
+Job field extraction shared by the LinkedIn, RSS and Google scrapers
+
+Salary, years of experience, education, location, remote status,
+employment type and seniority used to be parsed three times with slightly
+different inline regexes. Here each field has one table of precompiled
+rules, tried in order:
+
+- keyword tables (remote, employment type, seniority) compile to a single
+  alternation with one named group per rule, so the text is scanned once
+  and the highest-priority rule that matched anywhere wins
+- keywords are anchored on word boundaries, so "intern" no longer matches
+  "internal" and "lead" no longer matches "leadership"
+- location patterns are case-sensitive (proper nouns), instead of
+  IGNORECASE turning "[A-Z][a-z]+" into "any word"
+
+Every extractor has a batch form taking a list of texts, and
+extract_fields / extract_fields_batch return all text-derived fields of
+a posting at once.
+"""
+
+import re
+
+
+EMPTY_SALARY = {'salary_raw': None, 'salary_min': None, 'salary_max': None, 'salary_avg': None}
+EMPTY_YOE = {'yoe_raw': None, 'yoe_min': None, 'yoe_max': None, 'yoe_avg': None}
+
+# Dollar amount: 120,000 / 120000 / 120,000.00 (cents dropped)
+_AMOUNT = r'([\d,]+)(?:\.\d{2})?'
+_THOUSANDS = r'(\d{1,3}(?:\.\d+)?)'
+
+# (kind, pattern) in priority order; the first kind found anywhere wins.
+# "$150,000+" is a single amount, so salary_max is 150000 as well
+SALARY_RULES = (
+    ('range', re.compile(rf'\${_AMOUNT}\s?[-–]\s?\${_AMOUNT}')),
+    ('range_k', re.compile(rf'\$?{_THOUSANDS}\s*[kK]\s*[-–]\s*\$?{_THOUSANDS}\s*[kK]\b')),
+    ('single', re.compile(rf'\${_AMOUNT}')),
+)
+
+YOE_KEYWORDS = re.compile(
+    r'experience|exp|minimum|at least|required|qualification|background|track record|proven'
+    r'|demonstrated|expertise|proficiency'
+)
+YOE_RANGE = re.compile(r'\b(\d+)\s*(?:-|to)\s*(\d+)\s*(?:years?|yrs?)(?:\s+of\s+experience)?')
+YOE_SINGLE = re.compile(
+    r'(?:experience|exp|minimum|at least|required):?\s*(\d+)\+?\s*(?:years?|yrs?)(?:\s+of\s+experience)?'
+)
+_DIGITS = re.compile(r'\d+')
+
+EDUCATION_PATTERN = re.compile(r"\b(bachelor[’']?s|master[’']?s|ph\.?d|doctorate|b\.?s\.?|m\.?s\.)\b", re.IGNORECASE)
+DEGREE_NAMES = {"bs": "bachelor's", "ms": "master's", "b.s": "bachelor's", "m.s": "master's"}
+
+# Case-sensitive: cities and states are capitalized
+LOCATION_RULES = (
+    ('city_state', re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2})\b')),
+    ('remote', re.compile(r'\b(?:remote|work from home|wfh)\b', re.IGNORECASE)),
+    ('city_region', re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z][a-z]+)\b')),
+)
+
+# (label, keyword alternatives) in priority order
+REMOTE_TITLE_RULES = (('remote', r'remote|work from home|wfh|virtual'),)
+REMOTE_DESCRIPTION_RULES = (
+    ('remote', r'remote work|work remotely|work from home|wfh|virtual position|remote position|remote role'
+               r'|work from anywhere|remote-first|remote friendly'),
+)
+EMPLOYMENT_TYPE_RULES = (
+    ('Full-time', r'full[- ]time'),
+    ('Part-time', r'part[- ]time'),
+    ('Contract', r'contract(?:or)?'),
+    ('Internship', r'intern(?:ship)?'),
+)
+SENIORITY_RULES = (
+    ('Senior', r'senior|sr\.'),
+    ('Junior', r'junior|jr\.'),
+    ('Lead', r'lead|principal'),
+    ('Management', r'manager|director'),
+    ('Intern', r'intern(?:ship)?'),
+)
+
+
+def compile_keyword_rules(rules):
+    """One case-insensitive, word-anchored alternation with a named group per rule"""
+    groups = '|'.join(f'(?P<r{i}>{keywords})' for i, (_, keywords) in enumerate(rules))
+    return re.compile(rf'(?<!\w)(?:{groups})(?!\w)', re.IGNORECASE), [label for label, _ in rules]
+
+
+def match_keyword_rule(compiled, text, default=None):
+    """Label of the highest-priority rule found anywhere in text"""
+    pattern, labels = compiled
+    best = None
+    for match in pattern.finditer(text or ''):
+        index = int(match.lastgroup[1:])
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
+    return labels[best] if best is not None else default
+
+
+_REMOTE_TITLE = compile_keyword_rules(REMOTE_TITLE_RULES)
+_REMOTE_DESCRIPTION = compile_keyword_rules(REMOTE_DESCRIPTION_RULES)
+_EMPLOYMENT_TYPE = compile_keyword_rules(EMPLOYMENT_TYPE_RULES)
+_SENIORITY = compile_keyword_rules(SENIORITY_RULES)
+
+
+def _amount(value):
+    return int(value.replace(',', ''))
+
+
+def parse_salary(text):
+    """Salary fields from free text; salary_raw is the matched text"""
+    if not text:
+        return dict(EMPTY_SALARY)
+    for kind, pattern in SALARY_RULES:
+        match = pattern.search(text)
+        if not match:
+            continue
+        try:
+            if kind == 'range':
+                low, high = _amount(match.group(1)), _amount(match.group(2))
+            elif kind == 'range_k':
+                low, high = int(float(match.group(1)) * 1000), int(float(match.group(2)) * 1000)
+            else:
+                low = high = _amount(match.group(1))
+        except ValueError:
+            # A lone comma or similar matched as the amount
+            continue
+        return {
+            'salary_raw': match.group(0),
+            'salary_min': low,
+            'salary_max': high,
+            'salary_avg': (low + high) / 2 if kind in ('range', 'range_k') else low,
+        }
+    return dict(EMPTY_SALARY)
+
+
+def parse_yoe(text, bullets=()):
+    """Years-of-experience fields
+
+    Args:
+        text: Full (cleaned, lowercase) description
+        bullets: Lowercased <li>/<p> texts, checked first; a bullet counts
+            only if it mentions an experience keyword
+
+    A range ("3-5 years") gives min/max; otherwise every number in the
+    matching bullets, or every "experience: N years" in the text, is
+    averaged into yoe_avg.
+    """
+    numbers = []
+    for bullet in bullets:
+        if not bullet or not YOE_KEYWORDS.search(bullet):
+            continue
+        match = YOE_RANGE.search(bullet)
+        if match:
+            low, high = int(match.group(1)), int(match.group(2))
+            return {'yoe_raw': bullet, 'yoe_min': low, 'yoe_max': high, 'yoe_avg': (low + high) / 2}
+        numbers.extend(int(number) for number in _DIGITS.findall(bullet))
+
+    if not numbers and text:
+        match = YOE_RANGE.search(text)
+        if match:
+            low, high = int(match.group(1)), int(match.group(2))
+            return {'yoe_raw': match.group(0), 'yoe_min': low, 'yoe_max': high, 'yoe_avg': (low + high) / 2}
+        numbers = [int(number) for number in YOE_SINGLE.findall(text)]
+
+    if numbers:
+        return {
+            'yoe_raw': str(numbers[0]) if len(numbers) == 1 else str(numbers),
+            'yoe_min': None,
+            'yoe_max': None,
+            'yoe_avg': sum(numbers) / len(numbers),
+        }
+    return dict(EMPTY_YOE)
+
+
+def find_education(text):
+    """Degrees mentioned in text, normalized, in order of first mention"""
+    if not text:
+        return []
+    degrees = (match.lower().replace("’", "'") for match in EDUCATION_PATTERN.findall(text))
+    return list(dict.fromkeys(DEGREE_NAMES.get(degree, degree) for degree in degrees))
+
+
+def find_location(text):
+    """First "City, ST", remote marker or "City, Region" in text, or None"""
+    if not text:
+        return None
+    for kind, pattern in LOCATION_RULES:
+        match = pattern.search(text)
+        if match:
+            return 'Remote' if kind == 'remote' else f"{match.group(1)}, {match.group(2)}"
+    return None
+
+
+def split_location(location):
+    """location/city/state/country from a "City, State[, Country]" string
+
+    Anything but "United States" is taken as a US city unless it names a
+    country, so "Remote" gives city 'Remote' (remote is its own column).
+    """
+    if not location:
+        return {'location': None, 'city': None, 'state': None, 'country': None}
+    if location == 'United States':
+        return {'location': location, 'city': None, 'state': None, 'country': 'United States'}
+
+    location = location.replace(" Metropolitan Area", "")
+    parts = [part.strip() for part in location.split(",")]
+    return {
+        'location': location,
+        'city': parts[0],
+        'state': parts[1] if len(parts) >= 2 else None,
+        'country': parts[2] if len(parts) >= 3 else 'United States',
+    }
+
+
+def is_remote(title, location, description):
+    """1 if the title, location or description says the job is remote, else 0"""
+    if match_keyword_rule(_REMOTE_TITLE, title):
+        return 1
+    if location and location.lower() == 'remote':
+        return 1
+    if match_keyword_rule(_REMOTE_DESCRIPTION, description):
+        return 1
+    return 0
+
+
+def employment_type(text, default='Full-time'):
+    return match_keyword_rule(_EMPLOYMENT_TYPE, text, default)
+
+
+def seniority_level(text, default='Mid-level'):
+    return match_keyword_rule(_SENIORITY, text, default)
+
+
+def extract_fields(title, description, location=None):
+    """All text-derived job fields for a posting
+
+    Args:
+        title: Job title
+        description: Description text
+        location: Location string if the source gives one; otherwise it is
+            looked for in the title and description
+
+    Returns:
+        Dict with location, city, state, country, remote, employment_type,
+        seniority_level, the salary_* and yoe_* fields and education
+    """
+    description = description or ''
+    if location is None:
+        location = find_location(f"{title} {description}")
+    fields = split_location(location)
+    fields['remote'] = is_remote(title, location, description)
+    fields['employment_type'] = employment_type(description)
+    fields['seniority_level'] = seniority_level(description)
+    fields.update(parse_salary(description))
+    fields.update(parse_yoe(description.lower()))
+    fields['education'] = find_education(description)
+    return fields
+
+
+# Batch forms: one call per list of texts
+
+def parse_salaries(texts):
+    parse = parse_salary
+    return [parse(text) for text in texts]
+
+
+def parse_yoes(texts):
+    parse = parse_yoe
+    return [parse(text) for text in texts]
+
+
+def find_educations(texts):
+    find = find_education
+    return [find(text) for text in texts]
+
+
+def find_locations(texts):
+    find = find_location
+    return [find(text) for text in texts]
+
+
+def employment_types(texts, default='Full-time'):
+    match, rules = match_keyword_rule, _EMPLOYMENT_TYPE
+    return [match(rules, text, default) for text in texts]
+
+
+def seniority_levels(texts, default='Mid-level'):
+    match, rules = match_keyword_rule, _SENIORITY
+    return [match(rules, text, default) for text in texts]
+
+
+def extract_fields_batch(postings):
+    """extract_fields over (title, description) or (title, description, location) tuples"""
+    extract = extract_fields
+    return [extract(*posting) for posting in postings]
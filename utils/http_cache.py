@@ -0,0 +1,278 @@
+"""
+On-disk HTTP response cache for the scrapers
+
+Re-running a scrape, or iterating on an extractor, used to refetch every
+LinkedIn page, RSS feed and Google query. ResponseCache keeps successful
+GET responses on disk so HttpSession (utils/http_client.py) can answer
+them locally:
+
+- bodies are content-addressed: stored once per distinct body under
+  bodies/<sha256[:2]>/<sha256>, compressed with zstandard (zlib when
+  zstandard is not installed)
+- an SQLite index maps each request key (method + URL with sorted query
+  parameters) to its body, headers, validators and expiry
+- each host has its own TTL (TTLS); within it a response is served
+  without touching the network
+- once stale, a response with an ETag or Last-Modified is revalidated
+  with If-None-Match / If-Modified-Since, and a 304 renews it without
+  resending the body
+
+stats() counts hits, misses, revalidations and the body bytes that did
+not cross the network.
+
+    cache = ResponseCache('.http_cache')
+    session = HttpSession(cache=cache)       # or set HTTP_CACHE_DIR for get_session()
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Seconds a response is served without revalidation, per host
+TTLS = {
+    'www.linkedin.com': 12 * 3600,   # job pages rarely change; listings are paged incrementally
+    'www.googleapis.com': 24 * 3600, # Custom Search queries are billed per call
+}
+DEFAULT_TTL = 3600                   # RSS feeds and everything else
+# prune() drops entries not refetched or revalidated for this long
+MAX_AGE = 30 * 24 * 3600
+# Headers describing the stored (decoded) body rather than the original transfer
+DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        url TEXT NOT NULL,
+        status INTEGER NOT NULL,
+        headers TEXT NOT NULL,
+        body_hash TEXT NOT NULL,
+        body_size INTEGER NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        fetched_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+'''
+
+
+def normalize_url(url, params=None):
+    """URL with params merged in and the query sorted, so equivalent requests share a key"""
+    parts = urlsplit(requests.Request('GET', url, params=params).prepare().url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ''))
+
+
+def cache_key(method, url):
+    return hashlib.sha256(f'{method.upper()} {url}'.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Disk-backed response store with per-host TTLs and conditional revalidation"""
+
+    def __init__(self, directory, ttls=None, default_ttl=DEFAULT_TTL, level=3, clock=time.time):
+        self.directory = directory
+        self.ttls = TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.codec = 'zstd' if zstandard is not None else 'zlib'
+        self.level = level
+        os.makedirs(os.path.join(directory, 'bodies'), exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute(SCHEMA)
+        self._lock = threading.Lock()
+        self._counts = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stored': 0,
+                        'bytes_saved': 0, 'bytes_fetched': 0, 'bytes_written': 0}
+
+    # Bodies
+
+    def _body_path(self, body_hash):
+        return os.path.join(self.directory, 'bodies', body_hash[:2], f'{body_hash}.{self.codec}')
+
+    def _compress(self, data):
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return zlib.compress(data, self.level)
+
+    def _decompress(self, data):
+        if self.codec == 'zstd':
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def _write_body(self, body):
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._body_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = self._compress(body)
+            tmp = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._count('bytes_written', len(data))
+        return body_hash
+
+    def _read_body(self, body_hash):
+        try:
+            with open(self._body_path(body_hash), 'rb') as f:
+                return self._decompress(f.read())
+        except (OSError, ValueError, zlib.error):
+            return None
+
+    # Index
+
+    def ttl(self, url):
+        return self.ttls.get(urlsplit(url).netloc.lower(), self.default_ttl)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def lookup(self, method, url):
+        """Index entry for a normalized URL, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, status, headers, body_hash, body_size, etag, last_modified, fetched_at, expires_at '
+                'FROM responses WHERE key = ?', (cache_key(method, url),)
+            ).fetchone()
+        if row is None:
+            return None
+        names = ('url', 'status', 'headers', 'body_hash', 'body_size', 'etag', 'last_modified',
+                 'fetched_at', 'expires_at')
+        entry = dict(zip(names, row))
+        entry['headers'] = json.loads(entry['headers'])
+        return entry
+
+    def is_fresh(self, entry):
+        return entry is not None and entry['expires_at'] > self.clock()
+
+    def store(self, method, url, response):
+        """Keep a 200 response; returns False if it must not be cached"""
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if response.status_code != 200 or 'no-store' in cache_control:
+            return False
+        body = response.content
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in DROPPED_HEADERS}
+        body_hash = self._write_body(body)
+        now = self.clock()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO responses '
+                    '(key, url, status, headers, body_hash, body_size, etag, last_modified, fetched_at, expires_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (cache_key(method, url), url, response.status_code, json.dumps(headers), body_hash, len(body),
+                     response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now + self.ttl(url))
+                )
+            self._counts['stored'] += 1
+        return True
+
+    def renew(self, method, url, entry, response=None):
+        """Extend a revalidated entry's expiry, taking any new validators from the 304"""
+        headers = response.headers if response is not None else {}
+        etag = headers.get('ETag') or entry['etag']
+        last_modified = headers.get('Last-Modified') or entry['last_modified']
+        now = self.clock()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    'UPDATE responses SET etag = ?, last_modified = ?, fetched_at = ?, expires_at = ? WHERE key = ?',
+                    (etag, last_modified, now, now + self.ttl(url), cache_key(method, url))
+                )
+        entry.update(etag=etag, last_modified=last_modified, fetched_at=now, expires_at=now + self.ttl(url))
+
+    def conditional_headers(self, entry):
+        """If-None-Match / If-Modified-Since for a stale entry, empty if it has no validators"""
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def build_response(self, entry, request=None):
+        """requests.Response for a cached entry (from_cache is True), or None if its body is gone"""
+        body = self._read_body(entry['body_hash'])
+        if body is None:
+            return None
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = body
+        response.url = entry['url']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = 'OK'
+        response.request = request
+        response.from_cache = True
+        return response
+
+    # Metrics and maintenance
+
+    def record_hit(self, entry, revalidated=False):
+        with self._lock:
+            self._counts['revalidated' if revalidated else 'hits'] += 1
+            self._counts['bytes_saved'] += entry['body_size']
+
+    def record_miss(self, response):
+        with self._lock:
+            self._counts['misses'] += 1
+            self._counts['bytes_fetched'] += len(response.content)
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+            entries, stored_bytes = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(body_size), 0) FROM responses').fetchone()
+        lookups = counts['hits'] + counts['revalidated'] + counts['misses']
+        counts['entries'] = entries
+        counts['stored_body_bytes'] = stored_bytes
+        counts['hit_rate'] = (counts['hits'] + counts['revalidated']) / lookups if lookups else 0.0
+        return counts
+
+    def report(self):
+        s = self.stats()
+        print(f"🗄️ HTTP cache: {s['hits']} hits, {s['revalidated']} revalidated, {s['misses']} misses "
+              f"({s['hit_rate']:.0%} served from cache), {s['bytes_saved'] / 1024:.0f} KiB not downloaded; "
+              f"{s['entries']} entries")
+
+    def prune(self, max_age=MAX_AGE):
+        """Drop entries last fetched more than max_age seconds ago, and bodies no entry references
+
+        Stale entries younger than that are kept, since they can still be
+        revalidated with a 304.
+
+        Returns:
+            (entries_removed, bodies_removed)
+        """
+        with self._lock:
+            with self._conn:
+                removed = self._conn.execute('DELETE FROM responses WHERE fetched_at < ?',
+                                             (self.clock() - max_age,)).rowcount
+            referenced = {body_hash for (body_hash,) in self._conn.execute('SELECT DISTINCT body_hash FROM responses')}
+        bodies_removed = 0
+        bodies = os.path.join(self.directory, 'bodies')
+        for prefix in os.listdir(bodies):
+            for name in os.listdir(os.path.join(bodies, prefix)):
+                if name.split('.', 1)[0] not in referenced:
+                    os.remove(os.path.join(bodies, prefix, name))
+                    bodies_removed += 1
+        return removed, bodies_removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
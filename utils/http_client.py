@@ -0,0 +1,191 @@
+"""
+Shared HTTP session for every scraper
+
+One requests session holds keep-alive connection pools, so repeated calls
+to the same host skip the TCP and TLS handshakes. It also adds what a bare
+requests.get lacks:
+
+- a default timeout on every request
+- retries with backoff on connection errors and 5xx responses
+- negotiation of every compression urllib3 can decode (gzip/deflate, plus
+  br and zstd when brotli/zstandard are installed)
+- per-host pool sizes, so a concurrent fetcher can keep one connection
+  per worker
+
+connection_stats() reads urllib3's per-pool counters to show how many
+requests reused an existing connection.
+
+Given a ResponseCache (utils/http_cache.py), GETs are answered from disk
+while fresh and revalidated with a conditional request once stale. The
+shared session uses one when HTTP_CACHE_DIR is set.
+
+    from utils.http_client import get_session
+    response = get_session().get(url)
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+from utils.http_cache import ResponseCache, normalize_url
+
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_POOL_SIZE = 10
+# Hosts fetched concurrently get a pool per worker
+HOST_POOL_SIZES = {
+    'www.linkedin.com': 16,
+    'www.googleapis.com': 4,
+}
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+
+class ServerRetry(Retry):
+    """urllib3 Retry that leaves 429 to the caller even when it carries Retry-After
+
+    urllib3 retries any 413/429/503 with a Retry-After header regardless of
+    status_forcelist, which would hide rate limiting from callers that
+    adapt to it.
+    """
+
+    RETRY_AFTER_STATUS_CODES = frozenset([503])
+
+
+def default_retry():
+    """Retry policy: connection errors and 5xx on idempotent requests, honouring Retry-After
+
+    429 is not retried here so callers that pace themselves (get_job_ids,
+    the adaptive fetcher) see it.
+    """
+    return ServerRetry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=('GET', 'HEAD', 'OPTIONS'),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+class HttpSession(requests.Session):
+    """requests.Session with pooled keep-alive adapters, default timeout and retries"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, pool_size=DEFAULT_POOL_SIZE, host_pool_sizes=None,
+                 retry=None, headers=None, cache=None):
+        super().__init__()
+        self.timeout = timeout
+        self.cache = cache
+        self.retry = retry if retry is not None else default_retry()
+        self.headers.update(make_headers(accept_encoding=True))
+        self.headers['User-Agent'] = USER_AGENT
+        if headers:
+            self.headers.update(headers)
+
+        self._adapters = []
+        for prefix in ('https://', 'http://'):
+            self.mount(prefix, self._adapter(pool_size))
+        for host, size in (HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes).items():
+            self.mount_host(host, size)
+
+    def _adapter(self, pool_size):
+        adapter = HTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=pool_size, max_retries=self.retry)
+        self._adapters.append(adapter)
+        return adapter
+
+    def mount_host(self, host, pool_size):
+        """Give one host its own adapter with pool_size keep-alive connections"""
+        for scheme in ('https', 'http'):
+            self.mount(f'{scheme}://{host}/', self._adapter(pool_size))
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        if self.cache is None or method.upper() != 'GET' or kwargs.get('stream'):
+            return super().request(method, url, **kwargs)
+        return self._cached_get(url, kwargs)
+
+    def _cached_get(self, url, kwargs):
+        """GET answered from the cache while fresh, revalidated once stale"""
+        cache = self.cache
+        key_url = normalize_url(url, kwargs.pop('params', None))
+        entry = cache.lookup('GET', key_url)
+        if cache.is_fresh(entry):
+            response = cache.build_response(entry)
+            if response is not None:
+                cache.record_hit(entry)
+                return response
+            entry = None
+
+        conditional = cache.conditional_headers(entry)
+        if conditional:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **conditional}
+        response = super().request('GET', key_url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            cached = cache.build_response(entry, response.request)
+            if cached is not None:
+                cache.renew('GET', key_url, entry, response)
+                cache.record_hit(entry, revalidated=True)
+                return cached
+            # Body lost from disk: fetch it again unconditionally
+            for name in conditional:
+                kwargs['headers'].pop(name)
+            response = super().request('GET', key_url, **kwargs)
+        cache.record_miss(response)
+        cache.store('GET', key_url, response)
+        return response
+
+    def is_fresh(self, url, params=None):
+        """True if a GET of url would be answered from the cache without a request"""
+        return self.cache is not None and self.cache.is_fresh(self.cache.lookup('GET', normalize_url(url, params)))
+
+    def connection_stats(self):
+        """Per-host request and connection counts from the urllib3 pools
+
+        Returns:
+            {host: {'requests', 'connections', 'reused'}}; reused is the
+            number of requests served on an already-open connection
+        """
+        stats = {}
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            # The pool container refuses unlocked iteration; keys() copies under its lock
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = stats.setdefault(pool.host, {'requests': 0, 'connections': 0, 'reused': 0})
+                host['requests'] += pool.num_requests
+                host['connections'] += pool.num_connections
+        for host in stats.values():
+            host['reused'] = max(0, host['requests'] - host['connections'])
+        return stats
+
+    def report(self):
+        for host, s in sorted(self.connection_stats().items()):
+            print(f"🔌 {host}: {s['requests']} requests over {s['connections']} connections "
+                  f"({s['reused']} reused)")
+        if self.cache is not None:
+            self.cache.report()
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """The process-wide HttpSession, created on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            cache_dir = os.getenv('HTTP_CACHE_DIR')
+            _session = HttpSession(cache=ResponseCache(cache_dir) if cache_dir else None)
+        return _session
+
+
+def get(url, **kwargs):
+    """GET through the shared session"""
+    return get_session().get(url, **kwargs)